@@ -1,59 +1,150 @@
 """
 Script to analyze Kaggle datasets and generate a comprehensive report.
 """
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import hashlib
 import os
+import pickle
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+# Size of each streamed CSV block handed to the Arrow reader threads
+CSV_BLOCK_SIZE = 8 << 20
+
+# Per-file analysis results, keyed by path, modification time and size
+ANALYSIS_CACHE_DIR = Path("data/.analysis_cache")
+# Bump whenever analyze_csv_file changes the shape or meaning of its output
+ANALYSIS_CACHE_VERSION = 5
+
+# Column names that suggest a date stored as text
+DATE_COLUMN_PATTERN = re.compile(r'date|time', re.IGNORECASE)
+
+# Sample rows kept per file, restricted to the columns the report prints
+SAMPLE_ROWS = 3
+SAMPLE_COLUMNS = 10
+
+
+def _arrow_dtype_name(arrow_type):
+    """Map an Arrow type to the pandas-style dtype name shown in the report."""
+    try:
+        return np.dtype(arrow_type.to_pandas_dtype()).name
+    except (NotImplementedError, TypeError):
+        return str(arrow_type)
+
+
+def _as_float(value):
+    """Convert an Arrow scalar result to float, using NaN for nulls."""
+    return float('nan') if value is None else float(value)
+
+
+def _new_numeric_stats(n_columns):
+    """Create running-statistics accumulators for n_columns numeric columns."""
+    return {
+        'count': np.zeros(n_columns),
+        'mean': np.zeros(n_columns),
+        'm2': np.zeros(n_columns),
+        'min': np.full(n_columns, np.inf),
+        'max': np.full(n_columns, -np.inf),
+    }
+
+
+def _update_numeric_stats(stats, batch, indices):
+    """Fold the numeric columns of one record batch into the running statistics."""
+    if batch.num_rows == 0 or not indices:
+        return
+    
+    # One column-major float64 block so every reduction runs over all columns at once
+    block = np.empty((batch.num_rows, len(indices)), dtype=np.float64, order='F')
+    for j, i in enumerate(indices):
+        block[:, j] = batch.column(i).to_numpy(zero_copy_only=False)
+    
+    n = (~np.isnan(block)).sum(axis=0)
+    batch_mean = np.divide(np.nansum(block, axis=0), n, out=np.zeros(len(indices)), where=n > 0)
+    batch_m2 = np.nansum((block - batch_mean) ** 2, axis=0)
+    
+    # Chan et al. parallel combination of mean and sum of squared deviations
+    total = stats['count'] + n
+    weight = np.divide(n, total, out=np.zeros(len(indices)), where=total > 0)
+    delta = batch_mean - stats['mean']
+    stats['mean'] += delta * weight
+    stats['m2'] += batch_m2 + delta * delta * stats['count'] * weight
+    stats['count'] = total
+    # fmin/fmax skip NaN, so all-null columns keep their +/-inf sentinels
+    stats['min'] = np.fmin(stats['min'], np.fmin.reduce(block, axis=0))
+    stats['max'] = np.fmax(stats['max'], np.fmax.reduce(block, axis=0))
+
+
+def _finalize_numeric_stats(stats, columns):
+    """Convert running accumulators into count/mean/std/min/max per column."""
+    result = {}
+    nan = float('nan')
+    for j, col in enumerate(columns):
+        count = int(stats['count'][j])
+        result[col] = {
+            'count': float(count),
+            'mean': float(stats['mean'][j]) if count > 0 else nan,
+            'std': float(np.sqrt(stats['m2'][j] / (count - 1))) if count > 1 else nan,
+            'min': float(stats['min'][j]) if count > 0 else nan,
+            'max': float(stats['max'][j]) if count > 0 else nan,
+        }
+    return result
+
+
+def _retain_categoricals(batch, columns, encoded):
+    """Select the summarized text columns, dictionary-encoding those in `encoded`."""
+    return pa.record_batch(
+        [pc.dictionary_encode(batch.column(col)) if col in encoded else batch.column(col)
+         for col in columns],
+        names=columns
+    )
+
+
+def _value_summary(column, n):
+    """Return the distinct non-null count and the n most frequent values of a column."""
+    if pa.types.is_dictionary(column.type) and column.num_chunks > 0:
+        # Chunks share one unified dictionary, so the codes can be bincounted
+        dictionary = column.chunk(0).dictionary
+        codes = np.concatenate([pc.drop_null(chunk.indices).to_numpy() for chunk in column.chunks])
+        counts = np.bincount(codes, minlength=len(dictionary))
+        order = np.argsort(-counts, kind='stable')[:n]
+        order = order[counts[order] > 0]
+        return int(np.count_nonzero(counts)), dictionary.take(pa.array(order)).to_pylist()
+    
+    counts = pc.value_counts(column)
+    counts = counts.filter(counts.field('values').is_valid())
+    order = pc.array_sort_indices(counts.field('counts'), order='descending')
+    return len(counts), counts.field('values').take(order[:n]).to_pylist()
+
+
 def analyze_csv_file(file_path):
     """Analyze a single CSV file and return its metadata."""
     try:
-        df = pd.read_csv(file_path, low_memory=False)
-        
-        info = {
-            'file_name': os.path.basename(file_path),
-            'file_path': file_path,
-            'rows': len(df),
-            'columns': len(df.columns),
-            'column_names': list(df.columns),
-            'dtypes': df.dtypes.to_dict(),
-            'null_counts': df.isnull().sum().to_dict(),
-            'null_percentages': (df.isnull().sum() / len(df) * 100).to_dict(),
-            'memory_usage_mb': df.memory_usage(deep=True).sum() / 1024 / 1024,
-            'sample_data': df.head(3).to_dict('records') if len(df) > 0 else [],
-            'date_columns': [],
-            'numeric_columns': [],
-            'categorical_columns': []
-        }
-        
-        # Identify column types
-        for col in df.columns:
-            dtype = str(df[col].dtype)
-            if 'int' in dtype or 'float' in dtype:
-                info['numeric_columns'].append(col)
-            elif 'object' in dtype or 'category' in dtype:
-                info['categorical_columns'].append(col)
-                # Check if it might be a date
-                if 'date' in col.lower() or 'time' in col.lower():
-                    info['date_columns'].append(col)
-        
-        # Get unique value counts for categorical columns (limited to first 10)
-        info['unique_counts'] = {}
-        for col in info['categorical_columns'][:10]:
-            unique_count = df[col].nunique()
-            info['unique_counts'][col] = {
-                'count': unique_count,
-                'sample_values': df[col].unique()[:5].tolist() if unique_count <= 20 else df[col].value_counts().head(5).index.tolist()
-            }
-        
-        # Get basic stats for numeric columns
-        info['numeric_stats'] = {}
-        if len(info['numeric_columns']) > 0:
-            numeric_df = df[info['numeric_columns']]
-            info['numeric_stats'] = numeric_df.describe().to_dict()
-        
-        return info
+        try:
+            reader = pv.open_csv(
+                file_path,
+                read_options=pv.ReadOptions(block_size=CSV_BLOCK_SIZE, use_threads=True),
+                convert_options=pv.ConvertOptions(strings_can_be_null=True)
+            )
+            return _analyze_batches(file_path, reader.schema, reader)
+        except pa.ArrowInvalid:
+            # The streaming reader fixes column types from the first block, so
+            # a later value that doesn't fit (e.g. 1.5 in an integer column)
+            # fails the read; re-read with whole-file type inference instead
+            df = pd.read_csv(file_path, low_memory=False)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            # pandas text columns convert to large_string; use the reader's type
+            table = table.cast(pa.schema([
+                field.with_type(pa.string()) if pa.types.is_large_string(field.type) else field
+                for field in table.schema
+            ]))
+            return _analyze_batches(file_path, table.schema, table.to_batches())
     except Exception as e:
         return {
             'file_name': os.path.basename(file_path),
@@ -61,16 +152,207 @@ def analyze_csv_file(file_path):
             'error': str(e)
         }
 
+
+def _analyze_batches(file_path, schema, batches):
+    """
+    Collect the metadata for analyze_csv_file in one pass over record batches.
+    
+    Args:
+        file_path: Path of the CSV file being analyzed
+        schema: Arrow schema of the batches
+        batches: Iterable of record batches holding the file's rows
+    
+    Returns:
+        Dictionary of file metadata
+    """
+    column_names = schema.names
+    
+    info = {
+        'file_name': os.path.basename(file_path),
+        'file_path': file_path,
+        'columns': len(column_names),
+        'column_names': column_names,
+        'dtypes': {field.name: _arrow_dtype_name(field.type) for field in schema},
+        'sample_columns': column_names[:SAMPLE_COLUMNS],
+        'sample_data': [],
+    }
+    
+    # Identify column types from the Arrow schema instead of dtype strings
+    types = pa.types
+    info['numeric_columns'] = [
+        field.name for field in schema
+        if types.is_integer(field.type) or types.is_floating(field.type)
+    ]
+    info['categorical_columns'] = [
+        field.name for field in schema
+        if types.is_string(field.type) or types.is_dictionary(field.type) or types.is_null(field.type)
+    ]
+    categorical = set(info['categorical_columns'])
+    info['date_columns'] = [
+        field.name for field in schema
+        if types.is_timestamp(field.type) or types.is_date(field.type)
+        or (field.name in categorical and DATE_COLUMN_PATTERN.search(field.name))
+    ]
+    
+    # Single streaming pass: null counts, sizes and numeric stats are folded
+    # batch by batch; only the summarized categorical columns are retained
+    numeric_indices = [schema.get_field_index(col) for col in info['numeric_columns']]
+    summarized_categoricals = info['categorical_columns'][:10]
+    rows = 0
+    nbytes = 0
+    null_counts = [0] * len(column_names)
+    numeric_stats = _new_numeric_stats(len(numeric_indices))
+    categorical_batches = []
+    encoded_categoricals = None
+    for batch in batches:
+        if not info['sample_data'] and batch.num_rows > 0:
+            # Convert column-wise and zip into row tuples; no per-row dicts
+            sample = batch.slice(0, SAMPLE_ROWS).select(info['sample_columns'])
+            info['sample_data'] = list(zip(*(column.to_pylist() for column in sample.columns)))
+        rows += batch.num_rows
+        nbytes += batch.nbytes
+        for i in range(batch.num_columns):
+            null_counts[i] += batch.column(i).null_count
+        _update_numeric_stats(numeric_stats, batch, numeric_indices)
+        if encoded_categoricals is None and batch.num_rows > 0:
+            # Low-cardinality text columns are kept as dictionaries (the
+            # Arrow equivalent of pandas' category dtype), decided once
+            encoded_categoricals = {
+                col for col in summarized_categoricals
+                if types.is_string(schema.field(col).type)
+                and pc.count_distinct(batch.column(col)).as_py() < 0.5 * batch.num_rows
+            }
+        categorical_batches.append(
+            _retain_categoricals(batch, summarized_categoricals, encoded_categoricals or set())
+        )
+    if categorical_batches:
+        categorical_table = pa.Table.from_batches(categorical_batches).unify_dictionaries()
+    else:
+        categorical_table = pa.schema(
+            [schema.field(col) for col in summarized_categoricals]
+        ).empty_table()
+    
+    info['rows'] = rows
+    info['null_counts'] = dict(zip(column_names, null_counts))
+    info['null_percentages'] = {
+        col: (count / rows * 100) if rows > 0 else 0.0
+        for col, count in zip(column_names, null_counts)
+    }
+    # Sum of Arrow buffer sizes: O(columns) per batch, unlike a deep
+    # memory_usage() that would size every Python string object
+    info['memory_usage_mb'] = nbytes / 1024 / 1024
+    
+    # Get unique value counts for categorical columns (limited to first 10)
+    info['unique_counts'] = {}
+    for col in summarized_categoricals:
+        column = categorical_table.column(col)
+        if pa.types.is_null(column.type):
+            # Header-only or all-empty columns are inferred as the null type
+            column = column.cast(pa.string())
+        # One counting pass yields both the cardinality and the top values
+        unique_count, sample_values = _value_summary(column, 5)
+        info['unique_counts'][col] = {
+            'count': unique_count,
+            'sample_values': sample_values
+        }
+    
+    # Get basic stats for numeric columns
+    info['numeric_stats'] = _finalize_numeric_stats(numeric_stats, info['numeric_columns'])
+    
+    return info
+
+def analyze_csv_file_cached(file_path, cache_dir=ANALYSIS_CACHE_DIR):
+    """Analyze a CSV file, reusing the stored result if the file is unchanged."""
+    stat = os.stat(file_path)
+    key = hashlib.blake2b(
+        f"{ANALYSIS_CACHE_VERSION}:{file_path}:{stat.st_mtime}:{stat.st_size}".encode(), digest_size=16
+    ).hexdigest()
+    cache_path = Path(cache_dir) / f"{key}.pkl"
+    
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            pass  # Corrupt or stale cache entry; re-analyze below
+    
+    info = analyze_csv_file(file_path)
+    if 'error' not in info:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            pickle.dump(info, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return info
+
+def _format_file_report(file_path, info):
+    """Build the detailed report section for one file as a list of lines."""
+    lines = []
+    lines.append(f"\n{'='*80}")
+    lines.append(f"FILE: {info['file_name']}")
+    lines.append(f"Path: {file_path}")
+    lines.append(f"{'='*80}")
+    
+    if 'error' in info:
+        lines.append(f"ERROR: {info['error']}")
+        return lines
+    
+    lines.append(f"\n[ BASIC STATISTICS ]")
+    lines.append(f"  - Total Rows: {info['rows']:,}")
+    lines.append(f"  - Total Columns: {info['columns']}")
+    lines.append(f"  - Memory Usage (Arrow buffers): {info['memory_usage_mb']:.2f} MB")
+    
+    lines.append(f"\n[ COLUMNS ({info['columns']} total) ]")
+    for i, col in enumerate(info['column_names'], 1):
+        dtype = info['dtypes'][col]
+        null_count = info['null_counts'][col]
+        null_pct = info['null_percentages'][col]
+        null_str = f" ({null_count:,} null, {null_pct:.1f}%)" if null_count > 0 else ""
+        lines.append(f"  {i:2d}. {col:<40} {str(dtype):<15}{null_str}")
+    
+    if info['numeric_columns']:
+        lines.append(f"\n[ NUMERIC COLUMNS ({len(info['numeric_columns'])}) ]")
+        for col in info['numeric_columns']:
+            stats = info['numeric_stats'].get(col, {})
+            if stats:
+                lines.append(f"  - {col}:")
+                lines.append(f"    Min: {stats.get('min', 'N/A')}")
+                lines.append(f"    Max: {stats.get('max', 'N/A')}")
+                lines.append(f"    Mean: {stats.get('mean', 'N/A'):.2f}" if 'mean' in stats else f"    Mean: N/A")
+                lines.append(f"    Std: {stats.get('std', 'N/A'):.2f}" if 'std' in stats else f"    Std: N/A")
+    
+    if info['categorical_columns']:
+        lines.append(f"\n[ CATEGORICAL COLUMNS ({len(info['categorical_columns'])}) ]")
+        for col in info['categorical_columns'][:10]:  # Limit to first 10
+            if col in info['unique_counts']:
+                unique_info = info['unique_counts'][col]
+                lines.append(f"  - {col}:")
+                lines.append(f"    Unique Values: {unique_info['count']}")
+                if unique_info['count'] <= 20:
+                    lines.append(f"    Values: {unique_info['sample_values']}")
+                else:
+                    lines.append(f"    Top Values: {unique_info['sample_values']}")
+    
+    if info['date_columns']:
+        lines.append(f"\n[ DATE COLUMNS ]")
+        for col in info['date_columns']:
+            lines.append(f"  - {col}")
+    
+    if info['sample_data']:
+        lines.append(f"\n[ SAMPLE DATA (First {SAMPLE_ROWS} rows) ]")
+        for i, row in enumerate(info['sample_data'], 1):
+            lines.append(f"  Row {i}:")
+            for key, value in zip(info['sample_columns'], row):
+                lines.append(f"    {key}: {value}")
+            if info['columns'] > len(row):
+                lines.append(f"    ... and {info['columns'] - len(row)} more columns")
+    
+    return lines
+
 def generate_report():
     """Generate comprehensive report on all Kaggle datasets."""
     base_path = Path("data/Kaggle Datasets")
     
-    # Find all CSV files
-    csv_files = []
-    for root, dirs, files in os.walk(base_path):
-        for file in files:
-            if file.endswith('.csv'):
-                csv_files.append(os.path.join(root, file))
+    # Find all CSV files (rglob walks with os.scandir, avoiding per-entry stats)
+    csv_files = [str(path) for path in base_path.rglob('*.csv')]
     
     print("=" * 80)
     print("KAGGLE DATASETS COMPREHENSIVE ANALYSIS REPORT")
@@ -79,11 +361,18 @@ def generate_report():
     
     all_analyses = {}
     
-    # Analyze each file
+    # Analyze files in parallel; each analysis is independent of the others
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {executor.submit(analyze_csv_file_cached, path): path for path in csv_files}
+        results = {}
+        for future in as_completed(futures):
+            file_path = futures[future]
+            print(f"Analyzed: {file_path}")
+            results[file_path] = future.result()
+    
+    # Keep the report in sorted path order regardless of completion order
     for file_path in sorted(csv_files):
-        print(f"Analyzing: {file_path}...")
-        analysis = analyze_csv_file(file_path)
-        all_analyses[file_path] = analysis
+        all_analyses[file_path] = results[file_path]
     
     # Generate detailed report
     print("\n" + "=" * 80)
@@ -91,64 +380,8 @@ def generate_report():
     print("=" * 80)
     
     for file_path, info in all_analyses.items():
-        print(f"\n{'='*80}")
-        print(f"FILE: {info['file_name']}")
-        print(f"Path: {file_path}")
-        print(f"{'='*80}")
-        
-        if 'error' in info:
-            print(f"ERROR: {info['error']}")
-            continue
-        
-        print(f"\n[ BASIC STATISTICS ]")
-        print(f"  - Total Rows: {info['rows']:,}")
-        print(f"  - Total Columns: {info['columns']}")
-        print(f"  - Memory Usage: {info['memory_usage_mb']:.2f} MB")
-        
-        print(f"\n[ COLUMNS ({info['columns']} total) ]")
-        for i, col in enumerate(info['column_names'], 1):
-            dtype = info['dtypes'][col]
-            null_count = info['null_counts'][col]
-            null_pct = info['null_percentages'][col]
-            null_str = f" ({null_count:,} null, {null_pct:.1f}%)" if null_count > 0 else ""
-            print(f"  {i:2d}. {col:<40} {str(dtype):<15}{null_str}")
-        
-        if info['numeric_columns']:
-            print(f"\n[ NUMERIC COLUMNS ({len(info['numeric_columns'])}) ]")
-            for col in info['numeric_columns']:
-                stats = info['numeric_stats'].get(col, {})
-                if stats:
-                    print(f"  - {col}:")
-                    print(f"    Min: {stats.get('min', 'N/A')}")
-                    print(f"    Max: {stats.get('max', 'N/A')}")
-                    print(f"    Mean: {stats.get('mean', 'N/A'):.2f}" if 'mean' in stats else f"    Mean: N/A")
-                    print(f"    Std: {stats.get('std', 'N/A'):.2f}" if 'std' in stats else f"    Std: N/A")
-        
-        if info['categorical_columns']:
-            print(f"\n[ CATEGORICAL COLUMNS ({len(info['categorical_columns'])}) ]")
-            for col in info['categorical_columns'][:10]:  # Limit to first 10
-                if col in info['unique_counts']:
-                    unique_info = info['unique_counts'][col]
-                    print(f"  - {col}:")
-                    print(f"    Unique Values: {unique_info['count']}")
-                    if unique_info['count'] <= 20:
-                        print(f"    Values: {unique_info['sample_values']}")
-                    else:
-                        print(f"    Top Values: {unique_info['sample_values']}")
-        
-        if info['date_columns']:
-            print(f"\n[ DATE COLUMNS ]")
-            for col in info['date_columns']:
-                print(f"  - {col}")
-        
-        if info['sample_data']:
-            print(f"\n[ SAMPLE DATA (First 3 rows) ]")
-            for i, row in enumerate(info['sample_data'][:3], 1):
-                print(f"  Row {i}:")
-                for key, value in list(row.items())[:10]:  # Show first 10 columns
-                    print(f"    {key}: {value}")
-                if len(row) > 10:
-                    print(f"    ... and {len(row) - 10} more columns")
+        # One write per file instead of a print() call per line
+        sys.stdout.write('\n'.join(_format_file_report(file_path, info)) + '\n')
     
     # Summary statistics
     print("\n" + "=" * 80)
@@ -163,7 +396,7 @@ def generate_report():
     print(f"  - Total Files: {len(csv_files)}")
     print(f"  - Total Rows: {total_rows:,}")
     print(f"  - Total Columns: {total_columns}")
-    print(f"  - Total Memory: {total_memory:.2f} MB")
+    print(f"  - Total Memory (Arrow buffers): {total_memory:.2f} MB")
     
     # Group by directory
     print(f"\n[ FILES BY DIRECTORY ]")
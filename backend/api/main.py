@@ -1,9 +1,10 @@
 """
 FastAPI main application for NBA Predictor API.
 """
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import Optional
 import sys
 from pathlib import Path
 
@@ -11,8 +12,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from api.models import PredictionRequest, PredictionResponse, HealthResponse
-from src.predict import generate_prediction, generate_prediction_with_value
-from src.database import get_db_connection, init_database
+from src.predict import (
+    generate_prediction, generate_prediction_with_value, load_pipeline, load_onnx_session,
+    load_compiled_model, prediction_cache
+)
+from src.database import get_session, init_database
 
 app = FastAPI(
     title="NBA Prediction API",
@@ -32,8 +36,16 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database and load the model on startup."""
     init_database()
+    
+    # Warm the model cache so the first request doesn't pay for unpickling
+    try:
+        load_pipeline()
+        load_onnx_session()
+        load_compiled_model()
+    except FileNotFoundError as e:
+        print(f"Model not loaded at startup: {e}")
 
 
 @app.get("/", response_model=HealthResponse)
@@ -54,36 +66,70 @@ def health_check():
     )
 
 
-@app.post("/predict", response_model=PredictionResponse)
-async def predict_game(
-    request: PredictionRequest,
-    db: Session = Depends(get_db_connection)
-):
+def _cached_prediction(
+    home_team_name: str,
+    away_team_name: str,
+    game_date: date,
+    home_moneyline: Optional[int],
+    away_moneyline: Optional[int]
+) -> dict:
     """
-    Predict the outcome of an NBA game.
-    
-    Takes home team and away team names and returns win probabilities,
-    confidence level, and value bet recommendation (if odds provided).
+    Prediction for a request, memoized in prediction_cache.
+    Entries expire after PREDICTION_CACHE_TTL_SECONDS and are dropped by
+    reload_model(). Callers must not mutate the returned dict.
     """
+    key = (home_team_name, away_team_name, game_date, home_moneyline, away_moneyline)
+    result = prediction_cache.get(key)
+    if result is not None:
+        return result
+    
+    db = get_session()
     try:
-        # Generate prediction
-        if request.home_moneyline is not None and request.away_moneyline is not None:
+        if home_moneyline is not None and away_moneyline is not None:
             result = generate_prediction_with_value(
-                home_team_name=request.home_team_name,
-                away_team_name=request.away_team_name,
-                home_moneyline=request.home_moneyline,
-                away_moneyline=request.away_moneyline,
-                game_date=request.game_date,
+                home_team_name=home_team_name,
+                away_team_name=away_team_name,
+                home_moneyline=home_moneyline,
+                away_moneyline=away_moneyline,
+                game_date=game_date,
                 db=db
             )
         else:
             result = generate_prediction(
-                home_team_name=request.home_team_name,
-                away_team_name=request.away_team_name,
-                game_date=request.game_date,
+                home_team_name=home_team_name,
+                away_team_name=away_team_name,
+                game_date=game_date,
                 db=db
             )
             result['value_bet_recommendation'] = None
+    finally:
+        db.close()
+    
+    prediction_cache.set(key, result)
+    return result
+
+
+@app.post("/predict", response_model=PredictionResponse)
+def predict_game(request: PredictionRequest):
+    """
+    Predict the outcome of an NBA game.
+    
+    Takes home team and away team names and returns win probabilities,
+    confidence level, and value bet recommendation (if odds provided).
+    A plain def, so FastAPI runs the blocking model call in its threadpool.
+    """
+    try:
+        # Moneylines only change the result when both are provided
+        has_odds = request.home_moneyline is not None and request.away_moneyline is not None
+        
+        # Generate prediction (served from cache for repeated requests)
+        result = _cached_prediction(
+            request.home_team_name,
+            request.away_team_name,
+            request.game_date or date.today(),
+            request.home_moneyline if has_odds else None,
+            request.away_moneyline if has_odds else None
+        )
         
         return PredictionResponse(**result)
         
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from typing import List
 import model
 
 app = FastAPI(title="PredictiveEdge Basketball API")
@@ -22,19 +23,31 @@ class InputData(BaseModel):
     reboundsPerGame: float
     assistsPerGame: float
 
+    def to_features(self):
+        """Return the feature list in the order the model expects."""
+        return [
+            self.teamPointsPerGame,
+            self.opponentPointsPerGame,
+            self.fieldGoalPercentage,
+            self.threePointPercentage,
+            self.reboundsPerGame,
+            self.assistsPerGame
+        ]
+
+class BatchInput(BaseModel):
+    rows: List[InputData]
+
 @app.get("/")
 def home():
     return {"message": "PredictiveEdge Basketball API is running successfully 🏀"}
 
 @app.post("/predict")
 def predict(data: InputData):
-    features = [
-        data.teamPointsPerGame,
-        data.opponentPointsPerGame,
-        data.fieldGoalPercentage,
-        data.threePointPercentage,
-        data.reboundsPerGame,
-        data.assistsPerGame
-    ]
-    prediction = model.predict_outcome(features)
+    prediction = model.predict_outcome(data.to_features())
     return {"prediction": str(prediction)}
+
+@app.post("/predict_batch")
+def predict_batch(body: BatchInput):
+    # Score every row with one matrix multiply instead of one call per row
+    predictions = model.predict_outcomes([row.to_features() for row in body.rows])
+    return {"predictions": [str(p) for p in predictions]}
@@ -2,6 +2,7 @@
 Example usage script for NBA Predictor.
 Demonstrates how to use the various components.
 """
+import logging
 from src.database import get_session, init_database
 from src.data_ingestion import DataIngestor
 from src.feature_engineering import calculate_elo_ratings, create_feature_set
@@ -142,5 +143,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Show ingestion progress (logged by src.data_ingestion) on the console
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
 
@@ -4,6 +4,7 @@ The Odds API provides historical data since mid-2020.
 """
 from src.data_ingestion import DataIngestor
 from datetime import datetime, date
+import logging
 import sys
 
 
@@ -52,5 +53,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Show ingestion progress (logged by src.data_ingestion) on the console
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
 
@@ -1,11 +1,12 @@
 # model.py — Basketball prediction model
 # Replace this with your real trained model
 from sklearn.linear_model import LogisticRegression
+from pathlib import Path
+import joblib
 import numpy as np
 
-# Initialize and train a sample model with basketball-like data
-# Features: [team_ppg, opponent_ppg, fg%, 3pt%, rebounds, assists]
-model = LogisticRegression()
+# Fitted model persisted by train_model.py (or on first import)
+MODEL_PATH = Path(__file__).parent / "model.joblib"
 
 # Sample training data (6 features per sample)
 # Higher team PPG, FG%, 3PT%, rebounds, assists = more likely to win
@@ -27,7 +28,29 @@ training_data = [
 
 labels = [1, 1, 1, 1, 1, 0, 0, 0, 0, 0]
 
-model.fit(training_data, labels)
+
+def train_model():
+    """Train the sample model with basketball-like data."""
+    # Features: [team_ppg, opponent_ppg, fg%, 3pt%, rebounds, assists]
+    model = LogisticRegression()
+    model.fit(training_data, labels)
+    return model
+
+
+# Load the persisted model (memory-mapped, so workers share its pages);
+# only fit when no artifact exists yet
+try:
+    model = joblib.load(MODEL_PATH, mmap_mode='r')
+except FileNotFoundError:
+    model = train_model()
+    try:
+        joblib.dump(model, MODEL_PATH)
+    except OSError:
+        pass  # Read-only deployment; keep the in-memory model
+
+# Extract the fitted weights once; scoring is then a single dot product
+_W = model.coef_[0].astype(np.float32)
+_B = float(model.intercept_[0])
 
 def predict_outcome(features):
     """
@@ -39,5 +62,18 @@ def predict_outcome(features):
     Returns:
         1 for Win, 0 for Loss
     """
-    prediction = model.predict([features])[0]
-    return prediction
+    return int(np.dot(_W, np.asarray(features, dtype=np.float32)) + _B > 0.0)
+
+
+def predict_outcomes(feature_rows):
+    """
+    Predict outcomes for many games with a single matrix multiply.
+    
+    Args:
+        feature_rows: Sequence of 6-feature rows, each ordered as in predict_outcome
+    
+    Returns:
+        List with 1 for Win or 0 for Loss per row
+    """
+    X = np.asarray(feature_rows, dtype=np.float32).reshape(-1, _W.shape[0])
+    return ((X @ _W + _B) > 0.0).astype(int).tolist()
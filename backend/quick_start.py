@@ -2,6 +2,7 @@
 Quick start script to set up and run the NBA Predictor system.
 This script automates the initial setup process.
 """
+import importlib.util
 import os
 import sys
 from pathlib import Path
@@ -13,12 +14,11 @@ def check_dependencies():
         'fastapi', 'uvicorn', 'sqlalchemy', 'requests'
     ]
     
-    missing = []
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing.append(package)
+    # find_spec only locates each package; it does not run its (slow) imports
+    missing = [
+        package for package in required_packages
+        if importlib.util.find_spec(package) is None
+    ]
     
     if missing:
         print(f"Missing packages: {', '.join(missing)}")
@@ -3,7 +3,7 @@ Daily update script for NBA Predictor.
 Should be run via cron job or scheduled task.
 """
 from src.data_ingestion import DataIngestor
-from src.feature_engineering import calculate_elo_ratings
+from src.feature_engineering import calculate_elo_ratings, materialize_team_daily_features
 from src.database import get_session
 from datetime import datetime
 import logging
@@ -22,25 +22,30 @@ logger = logging.getLogger(__name__)
 
 
 def run_daily_update():
-    """Run daily data update and ELO recalculation."""
+    """Run daily data update, ELO recalculation and feature materialization."""
     logger.info("=" * 60)
     logger.info("Starting daily update process")
     logger.info("=" * 60)
     
     try:
         # Step 1: Update data
-        logger.info("[Step 1/2] Updating daily data...")
+        logger.info("[Step 1/3] Updating daily data...")
         ingestor = DataIngestor()
         ingestor.update_daily_data()
         ingestor.close()
         logger.info("Daily data update complete.")
         
         # Step 2: Recalculate ELO ratings
-        logger.info("[Step 2/2] Recalculating ELO ratings...")
+        logger.info("[Step 2/3] Recalculating ELO ratings...")
         db = get_session()
         try:
             calculate_elo_ratings(db)
             logger.info("ELO ratings updated.")
+            
+            # Step 3: Refresh materialized prediction features
+            logger.info("[Step 3/3] Materializing team daily features...")
+            materialize_team_daily_features(db)
+            logger.info("Team daily features updated.")
         finally:
             db.close()
         
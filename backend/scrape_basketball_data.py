@@ -4,48 +4,382 @@ Uses basketball-reference-scraper to fetch data from various sources.
 Stores data in the 'more' folder for later use.
 """
 import os
+import sys
 import pandas as pd
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
 from basketball_reference_scraper.seasons import get_schedule
 from basketball_reference_scraper.box_scores import get_box_scores
 from basketball_reference_scraper.teams import get_team_stats
+from basketball_reference_scraper import request_utils
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests_cache import CachedSession, NEVER_EXPIRE
+import pyarrow as pa
+import pyarrow.parquet as pq
+import orjson
+import threading
 import time
-import json
 
 # Setup paths
 PROJECT_ROOT = Path(__file__).parent.parent
 MORE_DATA_DIR = PROJECT_ROOT / "more"
-MORE_DATA_DIR.mkdir(exist_ok=True)
 
 # Create subdirectories for organization
 SCHEDULES_DIR = MORE_DATA_DIR / "schedules"
 BOX_SCORES_DIR = MORE_DATA_DIR / "box_scores"
 TEAM_STATS_DIR = MORE_DATA_DIR / "team_stats"
 PLAYER_STATS_DIR = MORE_DATA_DIR / "player_stats"
+HTTP_CACHE_PATH = MORE_DATA_DIR / "http_cache"
+HTTP_CACHE_EXPIRE_AFTER = timedelta(days=30)
+SAVED_OUTPUT_MAX_AGE = timedelta(days=30)
 RAW_DATA_DIR = MORE_DATA_DIR / "raw"
+METADATA_PATH = RAW_DATA_DIR / "metadata.jsonl"
 
-for dir_path in [SCHEDULES_DIR, BOX_SCORES_DIR, TEAM_STATS_DIR, PLAYER_STATS_DIR, RAW_DATA_DIR]:
-    dir_path.mkdir(exist_ok=True)
+OUTPUT_DIRS = (SCHEDULES_DIR, BOX_SCORES_DIR, TEAM_STATS_DIR, PLAYER_STATS_DIR, RAW_DATA_DIR)
+
+# Outputs are written as Parquet; CSVs from earlier scraper versions are
+# still counted and reused
+SAVED_OUTPUT_SUFFIXES = ('.parquet', '.csv')
+
+# Throttled/failed responses are retried on the adaptive limiter's next slot
+REQUEST_RETRIES = 3
+RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
+
+# Scraper whose cached, rate-limited session serves the library's requests
+_active_scraper = None
+
+
+def _scraper_get_wrapper(url):
+    """
+    Replacement for the library's get_wrapper.
+    
+    The library's version sleeps 3 seconds between all calls, cache hits
+    included; this one goes through the active scraper's session, which
+    serves cache hits immediately and paces only real requests.
+    """
+    if _active_scraper is None:
+        return _library_get_wrapper(url)
+    return _active_scraper._cached_get(url)
+
+
+# The library drives one shared browser, which can't serve threads concurrently
+_selenium_lock = threading.Lock()
+
+
+def _scraper_get_selenium_wrapper(url, xpath):
+    """
+    Replacement for the library's get_selenium_wrapper.
+    
+    Page loads are serialized on the shared browser and paced by the active
+    scraper's rate limiter, instead of the library's unsynchronized
+    last_request global and fixed 3 second sleep.
+    """
+    if _active_scraper is None:
+        return _library_get_selenium_wrapper(url, xpath)
+    
+    from selenium.webdriver.common.by import By
+    
+    limiter = _active_scraper.rate_limiter
+    with _selenium_lock:
+        limiter.acquire()
+        try:
+            request_utils.driver.get(url)
+            element = request_utils.driver.find_element(By.XPATH, xpath)
+            table = f'<table>{element.get_attribute("innerHTML")}</table>'
+        except Exception:
+            limiter.observe(None)
+            print('Error obtaining data table.')
+            return None
+    limiter.observe(200)
+    return table
+
+
+def _route_library_requests():
+    """
+    Rebind the library's request wrappers in its loaded modules to ours.
+    
+    Modules such as seasons and box_scores import get_wrapper by name, so
+    patching request_utils alone would not reach them.
+    """
+    replacements = {
+        'get_wrapper': (_library_get_wrapper, _scraper_get_wrapper),
+        'get_selenium_wrapper': (_library_get_selenium_wrapper, _scraper_get_selenium_wrapper),
+    }
+    for name, module in list(sys.modules.items()):
+        if name.partition('.')[0] != 'basketball_reference_scraper':
+            continue
+        for attr, (original, replacement) in replacements.items():
+            if original is not None and getattr(module, attr, None) is original:
+                setattr(module, attr, replacement)
+
+
+_library_get_wrapper = request_utils.get_wrapper
+_library_get_selenium_wrapper = getattr(request_utils, 'get_selenium_wrapper', None)
+_route_library_requests()
+
+
+def _ensure_dirs():
+    """Create the output directories (idempotent)."""
+    for dir_path in OUTPUT_DIRS:
+        dir_path.mkdir(parents=True, exist_ok=True)
+
+
+def _as_frame(stats) -> pd.DataFrame:
+    """Normalize a scraper result (DataFrame, Series or dict) to a DataFrame."""
+    if isinstance(stats, pd.DataFrame):
+        return stats
+    if isinstance(stats, pd.Series):
+        return stats.to_frame().T
+    return pd.DataFrame([stats])
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, preserve_index: bool = False):
+    """Write a DataFrame to a zstd-compressed Parquet file."""
+    table = pa.Table.from_pandas(df, preserve_index=preserve_index)
+    pq.write_table(table, path, compression='zstd')
+
+
+def _load_saved(path: Path, permanent: bool = False, csv_index: bool = False):
+    """
+    Load a previously saved scrape result if it exists and is still fresh.
+    
+    Falls back to the CSV of the same name written by earlier scraper
+    versions when there is no Parquet file.
+    
+    Args:
+        path: Parquet file written by an earlier run
+        permanent: Whether the data can no longer change (never stale)
+        csv_index: Whether a fallback CSV was saved with its index column
+    
+    Returns:
+        DataFrame, or None if the file is missing or stale
+    """
+    for saved_path in (path, path.with_suffix('.csv')):
+        try:
+            mtime = saved_path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        
+        if not permanent and time.time() - mtime > SAVED_OUTPUT_MAX_AGE.total_seconds():
+            return None
+        if saved_path.suffix == '.parquet':
+            return pd.read_parquet(saved_path)
+        return pd.read_csv(saved_path, index_col=0 if csv_index else None)
+    return None
+
+
+def _count_files(directory: Path, suffixes: tuple = SAVED_OUTPUT_SUFFIXES) -> int:
+    """
+    Count saved outputs using a single directory scan.
+    
+    A result saved both as CSV and as Parquet is counted once.
+    """
+    with os.scandir(directory) as entries:
+        return len({
+            os.path.splitext(entry.name)[0] for entry in entries
+            if entry.name.endswith(suffixes)
+        })
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe limiter that spaces requests `interval` seconds apart.
+    
+    The interval adapts to the server: it halves (down to `min_interval`)
+    after successful responses and doubles (up to `max_interval`) after
+    429/5xx responses, honouring any Retry-After header.
+    """
+    
+    def __init__(self, interval: float, min_interval: float = None, max_interval: float = 30.0):
+        self.interval = interval
+        self.min_interval = interval / 2 if min_interval is None else min_interval
+        self.max_interval = max_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def acquire(self):
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+    
+    def observe(self, status_code: int = None, retry_after: str = None):
+        """
+        Adjust the interval from a response status (None for a failed request).
+        
+        Args:
+            status_code: HTTP status of the response, or None if it raised
+            retry_after: Value of the Retry-After header, if any
+        """
+        with self._lock:
+            if status_code is not None and status_code < 400:
+                self.interval = max(self.min_interval, self.interval / 2)
+                return
+            
+            if status_code is None or status_code == 429 or status_code >= 500:
+                self.interval = min(self.max_interval, max(self.interval, 0.1) * 2)
+                pause = self.interval
+                if retry_after and retry_after.isdigit():
+                    pause = max(pause, float(retry_after))
+                self._next_slot = max(self._next_slot, time.monotonic() + pause)
+
+
+class RequestCoalescer:
+    """
+    Share one in-flight fetch between concurrent callers asking for the same URL.
+    
+    Every box score lookup first loads the day's scoreboard page, so games
+    played on the same date would otherwise race to download it in parallel.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+    
+    def fetch(self, url, fetch_fn):
+        """
+        Return fetch_fn(url), reusing the result of an identical in-flight call.
+        
+        Args:
+            url: Request URL used as the coalescing key
+            fetch_fn: Callable performing the actual request
+        """
+        with self._lock:
+            future = self._inflight.get(url)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[url] = future
+        
+        if not is_owner:
+            return future.result()
+        
+        try:
+            response = fetch_fn(url)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[url]
 
 
 class BasketballDataScraper:
     """Scraper for basketball-reference data."""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 4, request_interval: float = 0.5):
+        """
+        Args:
+            max_workers: Number of concurrent requests for bulk scrapes
+            request_interval: Initial seconds between requests across all workers
+        """
         self.base_dir = MORE_DATA_DIR
+        _ensure_dirs()
+        self.max_workers = max_workers
+        self.rate_limiter = AdaptiveRateLimiter(request_interval)
+        self._request_options = threading.local()
+        self._coalescer = RequestCoalescer()
+        self.session = self._create_session()
         print(f"Data will be saved to: {self.base_dir}")
     
-    def scrape_season_schedule(self, season: int, save_csv: bool = True):
+    def _create_session(self):
+        """
+        Create a cached, pooled keep-alive session and route the scraper library through it.
+        
+        Returns:
+            requests_cache.CachedSession shared by all basketball-reference calls
+        """
+        # Only dropped connections are retried here, immediately; throttling
+        # responses are left to _limited_get so the adaptive limiter sees them
+        # and its interval is the only delay applied
+        retry = Retry(total=REQUEST_RETRIES, backoff_factor=0)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+        
+        session = CachedSession(
+            str(HTTP_CACHE_PATH),
+            backend='sqlite',
+            expire_after=HTTP_CACHE_EXPIRE_AFTER,
+            allowable_codes=(200,)
+        )
+        session.headers.update({'Connection': 'keep-alive'})
+        session.mount('https://', adapter)
+        
+        # Library requests (rerouted once at import) now go through this session
+        global _active_scraper
+        _active_scraper = self
+        return session
+    
+    def _cached_get(self, url, **kwargs):
+        """GET through the shared session, applying this thread's cache options."""
+        options = self._request_options
+        if getattr(options, 'refresh', False):
+            kwargs['force_refresh'] = True
+        if getattr(options, 'expire_after', None) is not None:
+            kwargs['expire_after'] = options.expire_after
+        return self._coalescer.fetch(url, lambda u: self._limited_get(u, **kwargs))
+    
+    def _limited_get(self, url, **kwargs):
+        """
+        Issue a GET, waiting on the adaptive limiter unless it is served from cache.
+        
+        429/5xx responses and failed requests widen the limiter's interval
+        (honouring Retry-After) and are retried on its next slot, up to
+        REQUEST_RETRIES times.
+        """
+        cached = not kwargs.get('force_refresh') and self.session.cache.contains(url=url)
+        if cached:
+            return self.session.get(url, **kwargs)
+        
+        for attempt in range(REQUEST_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, **kwargs)
+            except Exception:
+                self.rate_limiter.observe(None)
+                if attempt == REQUEST_RETRIES:
+                    raise
+                continue
+            
+            if getattr(response, 'from_cache', False):
+                return response
+            self.rate_limiter.observe(response.status_code, response.headers.get('Retry-After'))
+            if response.status_code not in RETRY_STATUS_CODES or attempt == REQUEST_RETRIES:
+                return response
+    
+    def _set_request_options(self, refresh: bool = False, expire_after=None):
+        """Set cache options for requests issued by the current thread."""
+        self._request_options.refresh = refresh
+        self._request_options.expire_after = expire_after
+    
+    def scrape_season_schedule(self, season: int, save_csv: bool = True, refresh: bool = False):
         """
         Scrape season schedule for a given year.
         
         Args:
             season: Year of the season (e.g., 2024 for 2023-2024 season)
-            save_csv: Whether to save as CSV
+            save_csv: Whether to save to disk (Parquet)
+            refresh: Ignore saved files and the HTTP cache and re-download the pages
         """
         print(f"Scraping schedule for {season} season...")
         try:
+            # Completed seasons never change, so their pages can be cached forever
+            completed = season < datetime.now().year
+            out_path = SCHEDULES_DIR / f"schedule_{season}.parquet"
+            if not refresh:
+                saved = _load_saved(out_path, permanent=completed)
+                if saved is not None:
+                    print(f"✓ Loaded saved schedule for {season}")
+                    return saved
+            
+            self._set_request_options(refresh, NEVER_EXPIRE if completed else None)
             df = get_schedule(season)
             
             if df is None or df.empty:
@@ -53,9 +387,8 @@ class BasketballDataScraper:
                 return None
             
             if save_csv:
-                csv_path = SCHEDULES_DIR / f"schedule_{season}.csv"
-                df.to_csv(csv_path, index=False)
-                print(f"✓ Saved schedule to {csv_path}")
+                _write_parquet(df, out_path)
+                print(f"✓ Saved schedule to {out_path}")
             
             return df
             
@@ -67,25 +400,32 @@ class BasketballDataScraper:
         """Scrape schedules for multiple seasons."""
         print(f"Scraping schedules from {start_season} to {end_season}...")
         all_schedules = []
+        seasons = list(range(start_season, end_season + 1))
         
-        for season in range(start_season, end_season + 1):
-            df = self.scrape_season_schedule(season)
-            if df is not None:
-                df['season'] = season
-                all_schedules.append(df)
-            time.sleep(1)  # Rate limiting
+        # Fetch concurrently; the shared rate limiter keeps requests polite
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            schedules = list(executor.map(self.scrape_season_schedule, seasons))
         
-        # Combine all schedules
+        for season, df in zip(seasons, schedules):
+            if df is not None and not df.empty:
+                all_schedules.append((season, df))
+        
+        # Combine all schedules; the season column comes from the concat keys
         if all_schedules:
-            combined = pd.concat(all_schedules, ignore_index=True)
-            combined_path = SCHEDULES_DIR / f"all_schedules_{start_season}_{end_season}.csv"
-            combined.to_csv(combined_path, index=False)
+            combined = pd.concat(
+                [df for _, df in all_schedules],
+                keys=[season for season, _ in all_schedules],
+                names=['season']
+            ).reset_index(level=0).reset_index(drop=True)
+            combined_path = SCHEDULES_DIR / f"all_schedules_{start_season}_{end_season}.parquet"
+            _write_parquet(combined, combined_path)
             print(f"✓ Saved combined schedules to {combined_path}")
             return combined
         
         return None
     
-    def scrape_box_score(self, date: str, team1: str, team2: str, save_csv: bool = True):
+    def scrape_box_score(self, date: str, team1: str, team2: str, save_csv: bool = True,
+                         refresh: bool = False):
         """
         Scrape box score for a specific game.
         
@@ -93,10 +433,21 @@ class BasketballDataScraper:
             date: Date in format 'YYYY-MM-DD'
             team1: First team abbreviation (e.g., 'LAL')
             team2: Second team abbreviation (e.g., 'GSW')
-            save_csv: Whether to save as CSV
+            save_csv: Whether to save to disk (Parquet)
+            refresh: Ignore saved files and the HTTP cache and re-download the page
         """
         print(f"Scraping box score: {team1} vs {team2} on {date}...")
         try:
+            # Box scores of past games are final
+            final = pd.to_datetime(date) < pd.Timestamp.now().normalize()
+            out_path = BOX_SCORES_DIR / f"box_score_{date}_{team1}_{team2}.parquet"
+            if not refresh:
+                saved = _load_saved(out_path, permanent=final, csv_index=True)
+                if saved is not None:
+                    print(f"✓ Loaded saved box score for {team1} vs {team2} on {date}")
+                    return saved
+            
+            self._set_request_options(refresh, NEVER_EXPIRE if final else None)
             df = get_box_scores(date, team1, team2)
             
             if df is None or df.empty:
@@ -104,10 +455,8 @@ class BasketballDataScraper:
                 return None
             
             if save_csv:
-                filename = f"box_score_{date}_{team1}_{team2}.csv"
-                csv_path = BOX_SCORES_DIR / filename
-                df.to_csv(csv_path, index=True)
-                print(f"✓ Saved box score to {csv_path}")
+                _write_parquet(df, out_path, preserve_index=True)
+                print(f"✓ Saved box score to {out_path}")
             
             return df
             
@@ -115,7 +464,8 @@ class BasketballDataScraper:
             print(f"Error scraping box score: {e}")
             return None
     
-    def scrape_team_stats(self, season: int, team_abbr: str, save_csv: bool = True):
+    def scrape_team_stats(self, season: int, team_abbr: str, save_csv: bool = True,
+                          refresh: bool = False):
         """
         Scrape team statistics for a season.
         Note: This uses the teams module - adjust based on library version.
@@ -123,31 +473,31 @@ class BasketballDataScraper:
         Args:
             season: Year of the season
             team_abbr: Team abbreviation (e.g., 'LAL')
-            save_csv: Whether to save as CSV
+            save_csv: Whether to save to disk (Parquet)
+            refresh: Ignore saved files and the HTTP cache and re-download the stats
         """
         print(f"Scraping team stats for {team_abbr} in {season}...")
         try:
+            out_path = TEAM_STATS_DIR / f"team_stats_{team_abbr}_{season}.parquet"
+            if not refresh:
+                saved = _load_saved(out_path, permanent=season < datetime.now().year)
+                if saved is not None:
+                    print(f"✓ Loaded saved team stats for {team_abbr} in {season}")
+                    return saved
+            
             # Get team stats
+            self._set_request_options(refresh)
             stats = get_team_stats(team_abbr, season)
             
             if stats is None:
                 print(f"No stats found for {team_abbr}")
                 return None
             
+            stats = _as_frame(stats)
+            
             if save_csv:
-                filename = f"team_stats_{team_abbr}_{season}.csv"
-                csv_path = TEAM_STATS_DIR / filename
-                if isinstance(stats, pd.DataFrame):
-                    stats.to_csv(csv_path, index=False)
-                elif isinstance(stats, pd.Series):
-                    # Convert Series to DataFrame
-                    df = stats.to_frame().T
-                    df.to_csv(csv_path, index=False)
-                else:
-                    # If it's a dict or other format, convert to DataFrame
-                    df = pd.DataFrame([stats])
-                    df.to_csv(csv_path, index=False)
-                print(f"✓ Saved team stats to {csv_path}")
+                _write_parquet(stats, out_path)
+                print(f"✓ Saved team stats to {out_path}")
             
             return stats
             
@@ -169,18 +519,24 @@ class BasketballDataScraper:
         ]
         
         all_stats = []
-        for team in team_abbreviations:
-            stats = self.scrape_team_stats(season, team, save_csv=True)
-            if stats is not None:
-                stats['team'] = team
-                stats['season'] = season
-                all_stats.append(stats)
-            time.sleep(0.5)  # Rate limiting
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(
+                lambda team: self.scrape_team_stats(season, team, save_csv=True),
+                team_abbreviations
+            ))
+        
+        for team, stats in zip(team_abbreviations, results):
+            if stats is not None and not stats.empty:
+                all_stats.append((team, stats))
         
         if all_stats:
-            combined = pd.concat(all_stats, ignore_index=True)
-            combined_path = TEAM_STATS_DIR / f"all_teams_stats_{season}.csv"
-            combined.to_csv(combined_path, index=False)
+            combined = pd.concat(
+                [stats for _, stats in all_stats],
+                keys=[team for team, _ in all_stats],
+                names=['team']
+            ).reset_index(level=0).reset_index(drop=True).assign(season=season)
+            combined_path = TEAM_STATS_DIR / f"all_teams_stats_{season}.parquet"
+            _write_parquet(combined, combined_path)
             print(f"✓ Saved combined team stats to {combined_path}")
             return combined
         
@@ -194,7 +550,7 @@ class BasketballDataScraper:
         Args:
             player_name: Full player name (e.g., 'LeBron James')
             season: Optional season year
-            save_csv: Whether to save as CSV
+            save_csv: Whether to save to disk (Parquet)
         """
         print(f"Scraping stats for {player_name}...")
         print("Note: Player stats scraping may require additional setup")
@@ -221,68 +577,63 @@ class BasketballDataScraper:
             print("No schedule data available")
             return
         
-        games_scraped = 0
-        for idx, row in schedule_df.iterrows():
-            if max_games and games_scraped >= max_games:
-                break
-            
-            try:
-                date_str = row.get('DATE', '')
-                if not date_str:
-                    continue
-                
-                # Parse date
-                try:
-                    date_obj = pd.to_datetime(date_str)
-                    date_formatted = date_obj.strftime('%Y-%m-%d')
-                except:
-                    continue
-                
-                visitor = str(row.get('VISITOR', '')).strip()
-                home = str(row.get('HOME', '')).strip()
-                
-                if not visitor or not home:
-                    continue
-                
-                # Scrape box score
-                self.scrape_box_score(date_formatted, visitor, home)
-                games_scraped += 1
-                
-                # Rate limiting
-                time.sleep(2)
-                
-            except Exception as e:
-                print(f"Error processing game {idx}: {e}")
-                continue
+        # Normalize dates and team names once for the whole schedule
+        games_df = pd.DataFrame({
+            'date': pd.to_datetime(schedule_df['DATE'], errors='coerce').dt.strftime('%Y-%m-%d'),
+            'visitor': schedule_df['VISITOR'].astype(str).str.strip(),
+            'home': schedule_df['HOME'].astype(str).str.strip(),
+        })
+        games_df = games_df[games_df['date'].notna() & (games_df['visitor'] != '') & (games_df['home'] != '')]
+        if max_games:
+            games_df = games_df.head(max_games)
+        
+        games = list(games_df.itertuples(index=False, name=None))
+        
+        # Keep same-day games together so they share one scoreboard fetch
+        games.sort(key=lambda game: game[0])
+        
+        # Scrape box scores (rate limited inside scrape_box_score)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(lambda game: self.scrape_box_score(*game), games))
+        games_scraped = len(games)
         
         print(f"✓ Scraped {games_scraped} games from {season} season")
     
     def save_metadata(self, data_type: str, info: dict):
-        """Save metadata about scraped data."""
-        metadata_path = RAW_DATA_DIR / "metadata.json"
+        """Append a metadata record about scraped data (JSON Lines)."""
+        record = {'data_type': data_type, **info, 'scraped_at': datetime.now().isoformat()}
         
-        if metadata_path.exists():
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-        else:
-            metadata = {}
+        # Appending one line avoids re-reading and rewriting the whole history
+        with open(METADATA_PATH, 'ab') as f:
+            f.write(orjson.dumps(record) + b'\n')
+    
+    def load_metadata(self) -> dict:
+        """
+        Load all metadata records grouped by data type.
         
-        if data_type not in metadata:
-            metadata[data_type] = []
+        Returns:
+            Dictionary mapping data type to a list of records
+        """
+        metadata = {}
+        if not METADATA_PATH.exists():
+            return metadata
         
-        info['scraped_at'] = datetime.now().isoformat()
-        metadata[data_type].append(info)
+        with open(METADATA_PATH, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                metadata.setdefault(record.pop('data_type'), []).append(record)
         
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        return metadata
     
     def get_summary(self):
         """Get summary of scraped data."""
         summary = {
-            'schedules': len(list(SCHEDULES_DIR.glob('*.csv'))),
-            'box_scores': len(list(BOX_SCORES_DIR.glob('*.csv'))),
-            'team_stats': len(list(TEAM_STATS_DIR.glob('*.csv'))),
-            'player_stats': len(list(PLAYER_STATS_DIR.glob('*.csv'))),
+            'schedules': _count_files(SCHEDULES_DIR),
+            'box_scores': _count_files(BOX_SCORES_DIR),
+            'team_stats': _count_files(TEAM_STATS_DIR),
+            'player_stats': _count_files(PLAYER_STATS_DIR),
         }
         
         print("\n" + "=" * 60)
@@ -4,7 +4,6 @@ Use these as templates for your own scraping needs.
 """
 from scrape_basketball_data import BasketballDataScraper
 from datetime import datetime, timedelta
-import time
 import pandas as pd
 
 
@@ -41,7 +40,6 @@ def example_3_scrape_specific_games():
     
     for date, team1, team2 in games:
         scraper.scrape_box_score(date, team1, team2)
-        time.sleep(2)  # Rate limiting
 
 
 def example_4_scrape_playoff_games():
@@ -53,25 +51,20 @@ def example_4_scrape_playoff_games():
     schedule_df = scraper.scrape_season_schedule(season)
     
     if schedule_df is not None:
-        # Filter for playoff games (usually in April-June)
-        playoff_games = schedule_df[
-            (schedule_df['DATE'].str.contains('Apr|May|Jun', case=False, na=False))
-        ]
+        # Parse dates once and filter for playoff games (usually in April-June)
+        dates = pd.to_datetime(schedule_df['DATE'], errors='coerce')
+        playoff_games = schedule_df[dates.dt.month.between(4, 6)].assign(
+            date_formatted=dates.dt.strftime('%Y-%m-%d'),
+            visitor=schedule_df['VISITOR'].astype(str).str.strip(),
+            home=schedule_df['HOME'].astype(str).str.strip()
+        )
         
         print(f"Found {len(playoff_games)} playoff games")
         
         # Scrape box scores
-        for idx, row in playoff_games.head(10).iterrows():  # Limit to 10 games
+        for game in playoff_games.head(10).itertuples(index=False):  # Limit to 10 games
             try:
-                date_str = row.get('DATE', '')
-                date_obj = pd.to_datetime(date_str)
-                date_formatted = date_obj.strftime('%Y-%m-%d')
-                
-                visitor = str(row.get('VISITOR', '')).strip()
-                home = str(row.get('HOME', '')).strip()
-                
-                scraper.scrape_box_score(date_formatted, visitor, home)
-                time.sleep(2)
+                scraper.scrape_box_score(game.date_formatted, game.visitor, game.home)
             except Exception as e:
                 print(f"Error: {e}")
 
@@ -85,7 +78,6 @@ def example_5_scrape_team_comparison():
     
     for team in teams:
         scraper.scrape_team_stats(season, team)
-        time.sleep(1)
 
 
 def example_6_batch_scrape_recent_games():
@@ -101,33 +93,19 @@ def example_6_batch_scrape_recent_games():
         today = datetime.now()
         thirty_days_ago = today - timedelta(days=30)
         
-        recent_games = []
-        for idx, row in schedule_df.iterrows():
-            try:
-                date_str = row.get('DATE', '')
-                if not date_str:
-                    continue
-                
-                date_obj = pd.to_datetime(date_str)
-                if date_obj >= thirty_days_ago:
-                    recent_games.append(row)
-            except:
-                continue
+        dates = pd.to_datetime(schedule_df['DATE'], errors='coerce')
+        recent_games = schedule_df[dates >= thirty_days_ago].assign(
+            date_formatted=dates.dt.strftime('%Y-%m-%d'),
+            visitor=schedule_df['VISITOR'].astype(str).str.strip(),
+            home=schedule_df['HOME'].astype(str).str.strip()
+        )
         
         print(f"Found {len(recent_games)} games in last 30 days")
         
         # Scrape box scores
-        for row in recent_games[:20]:  # Limit to 20 games
+        for game in recent_games.head(20).itertuples(index=False):  # Limit to 20 games
             try:
-                date_str = row.get('DATE', '')
-                date_obj = pd.to_datetime(date_str)
-                date_formatted = date_obj.strftime('%Y-%m-%d')
-                
-                visitor = str(row.get('VISITOR', '')).strip()
-                home = str(row.get('HOME', '')).strip()
-                
-                scraper.scrape_box_score(date_formatted, visitor, home)
-                time.sleep(2)
+                scraper.scrape_box_score(game.date_formatted, game.visitor, game.home)
             except Exception as e:
                 print(f"Error: {e}")
 
@@ -2,7 +2,6 @@
 Quick script to scrape team stats for multiple teams and seasons.
 """
 from scrape_basketball_data import BasketballDataScraper
-import time
 
 def scrape_team_stats_batch():
     """Scrape team stats for multiple teams."""
@@ -28,11 +27,9 @@ def scrape_team_stats_batch():
                 successful += 1
             else:
                 failed += 1
-            time.sleep(2)  # Rate limiting
         except Exception as e:
             print(f"  Error: {e}")
             failed += 1
-            time.sleep(1)
     
     print()
     print("=" * 60)
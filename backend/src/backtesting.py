@@ -4,14 +4,20 @@ Simulates betting strategy to evaluate profitability.
 """
 import pandas as pd
 import numpy as np
-import joblib
+from functools import lru_cache
 from pathlib import Path
-from src.config import MODEL_ARTIFACTS_DIR, VALUE_EDGE_THRESHOLD, TEST_SEASON
+from sqlalchemy import select
+from src.config import MODEL_ARTIFACTS_DIR, VALUE_EDGE_THRESHOLD, TEST_SEASON, ensure_directories
 from src.database import get_session, Game, Odds
 from src.feature_engineering import create_feature_set
-from src.training import FEATURE_COLUMNS, split_data_temporally, scale_data
+from src.predict import load_pipeline
+from src.training import FEATURE_COLUMNS
 
+# Maximum number of game IDs bound into a single odds IN (...) query
+ODDS_QUERY_CHUNK_SIZE = 500
 
+
+@lru_cache(maxsize=4096)
 def moneyline_to_implied_prob(moneyline: int) -> float:
     """
     Convert American moneyline odds to implied probability.
@@ -28,6 +34,7 @@ def moneyline_to_implied_prob(moneyline: int) -> float:
         return abs(moneyline) / (abs(moneyline) + 100)
 
 
+@lru_cache(maxsize=4096)
 def moneyline_to_payout(moneyline: int, bet_amount: float = 100.0) -> float:
     """
     Calculate payout for a winning bet.
@@ -45,9 +52,37 @@ def moneyline_to_payout(moneyline: int, bet_amount: float = 100.0) -> float:
         return bet_amount * (1 + 100 / abs(moneyline))
 
 
+def moneylines_to_implied_probs(moneylines: np.ndarray) -> np.ndarray:
+    """
+    Vectorized moneyline_to_implied_prob.
+    
+    Args:
+        moneylines: Array of American odds
+    
+    Returns:
+        Array of implied probabilities
+    """
+    ml = np.asarray(moneylines, dtype=np.float64)
+    return np.where(ml > 0, 100 / (ml + 100), np.abs(ml) / (np.abs(ml) + 100))
+
+
+def moneylines_to_payouts(moneylines: np.ndarray, bet_amount: float = 100.0) -> np.ndarray:
+    """
+    Vectorized moneyline_to_payout.
+    
+    Args:
+        moneylines: Array of American odds
+        bet_amount: Amount bet per game (default $100)
+    
+    Returns:
+        Array of total payouts (including original bet)
+    """
+    ml = np.asarray(moneylines, dtype=np.float64)
+    return bet_amount * (1 + np.where(ml > 0, ml / 100, 100 / np.abs(ml)))
+
+
 def run_profitability_simulation(
     model,
-    scaler,
     features_df: pd.DataFrame,
     test_season: int = TEST_SEASON,
     edge_threshold: float = VALUE_EDGE_THRESHOLD,
@@ -57,8 +92,7 @@ def run_profitability_simulation(
     Run profitability simulation on test set.
     
     Args:
-        model: Trained model
-        scaler: Fitted StandardScaler
+        model: Trained prediction pipeline (scaling included)
         features_df: Full feature dataframe
         test_season: Season to test on
         edge_threshold: Minimum edge required to place bet (default 3%)
@@ -79,95 +113,68 @@ def run_profitability_simulation(
         return None
     
     # Get test features and targets
-    X_test = test_df[FEATURE_COLUMNS].values
+    # Column-major so each feature is contiguous for the per-column scaling
+    X_test = np.asfortranarray(test_df[FEATURE_COLUMNS].to_numpy(dtype=np.float32))
     y_test = test_df['target_did_win'].values
-    X_test_scaled = scaler.transform(X_test)
     
     # Get model probabilities
-    model_proba = model.predict_proba(X_test_scaled)
+    model_proba = model.predict_proba(X_test)
     model_win_proba = model_proba[:, 1]  # Probability of team winning
     
-    # Get odds data
+    # Get odds data, bypassing ORM object construction. The IN-list is chunked
+    # to stay under SQLite's bound-parameter limit.
     db = get_session()
     try:
-        # Get games with odds
-        game_ids = test_df['game_id'].unique()
-        odds_query = db.query(Odds).filter(Odds.game_id.in_(game_ids)).all()
-        
-        # Create odds lookup
-        odds_dict = {}
-        for odds in odds_query:
-            if odds.game_id not in odds_dict:
-                odds_dict[odds.game_id] = []
-            odds_dict[odds.game_id].append(odds)
-        
+        game_ids = test_df['game_id'].unique().tolist()
+        odds_chunks = []
+        for start in range(0, len(game_ids), ODDS_QUERY_CHUNK_SIZE):
+            odds_query = select(
+                Odds.game_id.label('game_id'),
+                Odds.home_team_moneyline.label('home_ml'),
+                Odds.away_team_moneyline.label('away_ml')
+            ).where(Odds.game_id.in_(game_ids[start:start + ODDS_QUERY_CHUNK_SIZE]))
+            odds_chunks.append(pd.read_sql(odds_query, db.get_bind()))
+        odds_df = pd.concat(odds_chunks, ignore_index=True)
     finally:
         db.close()
     
-    # Simulate betting
-    total_bets = 0
-    total_won = 0
-    total_profit = 0.0
-    bets_placed = []
-    
-    for idx, row in test_df.iterrows():
-        game_id = row['game_id']
-        is_home = row['is_home']
-        team_id = row['team_id']
-        opponent_id = row['opponent_id']
-        actual_win = row['target_did_win']
-        model_prob = model_win_proba[test_df.index.get_loc(idx)]
-        
-        # Get odds for this game
-        if game_id not in odds_dict or len(odds_dict[game_id]) == 0:
-            continue  # Skip if no odds available
-        
-        # Use first available odds (could be enhanced to use best odds)
-        odds = odds_dict[game_id][0]
-        
-        # Determine which team we're betting on
-        if is_home:
-            moneyline = odds.home_team_moneyline
-        else:
-            moneyline = odds.away_team_moneyline
-        
-        if moneyline is None:
-            continue
-        
-        # Calculate implied probability
-        implied_prob = moneyline_to_implied_prob(moneyline)
-        
-        # Check for value bet
-        edge = model_prob - implied_prob
-        
-        if edge > edge_threshold:
-            # Place bet
-            total_bets += 1
-            
-            # Calculate profit/loss
-            if actual_win == 1:
-                payout = moneyline_to_payout(moneyline, bet_amount)
-                profit = payout - bet_amount
-                total_profit += profit
-                total_won += 1
-                result = "WIN"
-            else:
-                profit = -bet_amount
-                total_profit += profit
-                result = "LOSS"
-            
-            bets_placed.append({
-                'game_id': game_id,
-                'team_id': team_id,
-                'opponent_id': opponent_id,
-                'is_home': is_home,
-                'model_prob': model_prob,
-                'implied_prob': implied_prob,
-                'edge': edge,
-                'moneyline': moneyline,
-                'result': result,
-                'profit': profit
-            })
+    # One odds row per game (first available; could be enhanced to use best odds)
+    odds_df = odds_df.drop_duplicates('game_id', keep='first')
+    
+    # Simulate betting on just the columns the bet log needs, not the full feature set
+    bet_columns = ['game_id', 'team_id', 'opponent_id', 'is_home', 'target_did_win']
+    merged = test_df[bet_columns].assign(model_prob=model_win_proba).merge(
+        odds_df, on='game_id', how='left'
+    )
+    
+    # Pick the moneyline for the team we're betting on; skip games without odds
+    is_home = merged['is_home'].to_numpy(dtype=bool)
+    moneyline = np.where(is_home, merged['home_ml'], merged['away_ml']).astype(np.float64)
+    has_odds = ~np.isnan(moneyline)
+    
+    implied_prob = np.full(len(merged), np.nan)
+    implied_prob[has_odds] = moneylines_to_implied_probs(moneyline[has_odds])
+    edge = merged['model_prob'].to_numpy() - implied_prob
+    
+    # Place bets where the edge clears the threshold
+    bet_mask = has_odds & (edge > edge_threshold)
+    bets = merged.loc[bet_mask, ['game_id', 'team_id', 'opponent_id', 'is_home', 'model_prob']]
+    bet_ml = moneyline[bet_mask]
+    won = merged['target_did_win'].to_numpy()[bet_mask] == 1
+    profit = np.where(won, moneylines_to_payouts(bet_ml, bet_amount) - bet_amount, -bet_amount)
+    
+    bets_df = bets.assign(
+        implied_prob=implied_prob[bet_mask],
+        edge=edge[bet_mask],
+        moneyline=bet_ml.astype(np.int64),
+        result=np.where(won, "WIN", "LOSS"),
+        profit=profit
+    )
+    bets_placed = bets_df.to_dict('records')
+    
+    total_bets = len(bets_df)
+    total_won = int(won.sum())
+    total_profit = float(profit.sum())
     
     # Calculate metrics
     win_rate = (total_won / total_bets * 100) if total_bets > 0 else 0
@@ -192,7 +199,7 @@ def run_profitability_simulation(
     
     # Save detailed results
     if bets_placed:
-        bets_df = pd.DataFrame(bets_placed)
+        ensure_directories()
         results_path = MODEL_ARTIFACTS_DIR / "backtest_results.csv"
         bets_df.to_csv(results_path, index=False)
         print(f"\nDetailed results saved to {results_path}")
@@ -212,19 +219,15 @@ def run_backtest():
     """
     Complete backtesting pipeline.
     """
-    print("Loading model and scaler...")
-    
-    # Load model and scaler
-    model_path = MODEL_ARTIFACTS_DIR / "best_model.joblib"
-    scaler_path = MODEL_ARTIFACTS_DIR / "data_scaler.joblib"
+    print("Loading model...")
     
-    if not model_path.exists() or not scaler_path.exists():
-        print("Error: Model or scaler not found. Please run training first.")
+    # Load the prediction pipeline (scaler and model saved together)
+    try:
+        model = load_pipeline()
+    except FileNotFoundError:
+        print("Error: Model not found. Please run training first.")
         return
     
-    model = joblib.load(model_path)
-    scaler = joblib.load(scaler_path)
-    
     # Create feature set
     print("Creating feature set...")
     db = get_session()
@@ -236,7 +239,7 @@ def run_backtest():
         db.close()
     
     # Run simulation
-    results = run_profitability_simulation(model, scaler, features_df)
+    results = run_profitability_simulation(model, features_df)
     
     return results
 
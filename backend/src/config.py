@@ -15,13 +15,15 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/nba_data.db")
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
+SCHEDULE_CACHE_DIR = DATA_DIR / "cache"
 MODEL_ARTIFACTS_DIR = PROJECT_ROOT / "model_artifacts"
 NOTEBOOKS_DIR = PROJECT_ROOT / "notebooks"
 
-# Create directories if they don't exist
-DATA_DIR.mkdir(exist_ok=True)
-MODEL_ARTIFACTS_DIR.mkdir(exist_ok=True)
-NOTEBOOKS_DIR.mkdir(exist_ok=True)
+
+def ensure_directories():
+    """Create the project output directories if they don't exist."""
+    for dir_path in (DATA_DIR, MODEL_ARTIFACTS_DIR, NOTEBOOKS_DIR):
+        dir_path.mkdir(exist_ok=True)
 
 # ELO Configuration
 ELO_INITIAL = 1500
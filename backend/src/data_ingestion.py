@@ -2,39 +2,449 @@
 Data ingestion module for NBA Predictor.
 Handles fetching data from basketball-reference and odds APIs.
 """
+import asyncio
+import httpx
+import orjson
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
+from functools import lru_cache
 from basketball_reference_scraper import teams, seasons, schedule, box_scores
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from src.database import (
     get_session, Team, Game, TeamBoxScore, Odds, init_database
 )
-from src.config import ODDS_API_KEY, ODDS_API_BASE_URL
+from src.config import ODDS_API_KEY, ODDS_API_BASE_URL, SCHEDULE_CACHE_DIR
+from src.feature_engineering import clear_feature_caches, materialize_team_daily_features
+import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 
+logger = logging.getLogger(__name__)
+
+# Whether a real Odds API key is set (checked once, not on every fetch)
+ODDS_API_CONFIGURED = bool(ODDS_API_KEY) and ODDS_API_KEY != "YOUR_API_KEY_HERE"
+
+# Number of new games inserted per transaction during historical ingestion
+GAME_INSERT_BATCH_SIZE = 500
+
+# Concurrent box score downloads and the minimum spacing between their requests
+BOX_SCORE_WORKERS = 4
+BOX_SCORE_REQUEST_INTERVAL = 0.5
+
+# Box score rows buffered across games before each bulk insert
+BOX_SCORE_INSERT_BATCH_SIZE = 1000
+
+# Common mappings for The Odds API team names to our abbreviations
+ODDS_API_TEAM_ABBREVIATIONS = {
+    # Full names
+    "Los Angeles Lakers": "LAL",
+    "LA Lakers": "LAL",
+    "Golden State Warriors": "GSW",
+    "Boston Celtics": "BOS",
+    "Miami Heat": "MIA",
+    "Chicago Bulls": "CHI",
+    "New York Knicks": "NYK",
+    "Philadelphia 76ers": "PHI",
+    "Brooklyn Nets": "BKN",
+    "Milwaukee Bucks": "MIL",
+    "Toronto Raptors": "TOR",
+    "Indiana Pacers": "IND",
+    "Cleveland Cavaliers": "CLE",
+    "Detroit Pistons": "DET",
+    "Orlando Magic": "ORL",
+    "Charlotte Hornets": "CHA",
+    "Washington Wizards": "WAS",
+    "Atlanta Hawks": "ATL",
+    "Dallas Mavericks": "DAL",
+    "Houston Rockets": "HOU",
+    "San Antonio Spurs": "SAS",
+    "Memphis Grizzlies": "MEM",
+    "New Orleans Pelicans": "NOP",
+    "Oklahoma City Thunder": "OKC",
+    "Denver Nuggets": "DEN",
+    "Utah Jazz": "UTA",
+    "Portland Trail Blazers": "POR",
+    "Minnesota Timberwolves": "MIN",
+    "Sacramento Kings": "SAC",
+    "Phoenix Suns": "PHX",
+    "LA Clippers": "LAC",
+    "Los Angeles Clippers": "LAC",
+    # Variations
+    "Lakers": "LAL",
+    "Warriors": "GSW",
+    "Celtics": "BOS",
+    "Heat": "MIA",
+    "Bulls": "CHI",
+    "Knicks": "NYK",
+    "76ers": "PHI",
+    "Nets": "BKN",
+    "Bucks": "MIL",
+    "Raptors": "TOR",
+}
+
+# Box score stat columns mapped to TeamBoxScore attributes
+BOX_SCORE_INT_FIELDS = {
+    'FG': 'fg', 'FGA': 'fga', '3P': 'fg3', '3PA': 'fg3a', 'FT': 'ft', 'FTA': 'fta',
+    'ORB': 'orb', 'DRB': 'drb', 'TRB': 'trb', 'AST': 'ast', 'STL': 'stl', 'BLK': 'blk',
+    'TOV': 'tov', 'PF': 'pf', 'PTS': 'pts', '+/-': 'plus_minus',
+}
+BOX_SCORE_FLOAT_FIELDS = {'FG%': 'fg_pct', '3P%': 'fg3_pct', 'FT%': 'ft_pct'}
+BOX_SCORE_STAT_COLUMNS = list(BOX_SCORE_INT_FIELDS) + list(BOX_SCORE_FLOAT_FIELDS)
+
+# Column types for the historical odds CSV (see data/historical_odds.csv.example)
+HISTORICAL_ODDS_DTYPES = {
+    'game_id': str,
+    'bookmaker': str,
+    'home_spread': 'float64',
+    'home_spread_odds': 'float64',
+    'away_spread': 'float64',
+    'away_spread_odds': 'float64',
+    'home_moneyline': 'float64',
+    'away_moneyline': 'float64',
+    'over_under': 'float64',
+    'over_odds': 'float64',
+    'under_odds': 'float64',
+}
+
+# Historical odds CSV columns mapped to odds table columns
+HISTORICAL_ODDS_COLUMNS = {
+    'game_id': 'game_id',
+    'bookmaker': 'bookmaker',
+    'home_spread': 'home_team_spread',
+    'home_spread_odds': 'home_team_spread_odds',
+    'away_spread': 'away_team_spread',
+    'away_spread_odds': 'away_team_spread_odds',
+    'home_moneyline': 'home_team_moneyline',
+    'away_moneyline': 'away_team_moneyline',
+    'over_under': 'over_under_total',
+    'over_odds': 'over_odds',
+    'under_odds': 'under_odds',
+}
+ODDS_INT_COLUMNS = {
+    'home_team_spread_odds', 'away_team_spread_odds', 'home_team_moneyline',
+    'away_team_moneyline', 'over_odds', 'under_odds',
+}
+
+# Bound-parameter limit of older SQLite builds; sizes multi-row INSERT chunks
+SQLITE_MAX_VARIABLES = 999
+
+# Rows upserted per transaction when loading the historical odds CSV
+ODDS_COMMIT_BATCH_SIZE = 5000
+
+# Odds columns filled from The Odds API markets
+ODDS_MARKET_FIELDS = (
+    'home_team_moneyline', 'away_team_moneyline', 'home_team_spread',
+    'home_team_spread_odds', 'away_team_spread', 'away_team_spread_odds',
+    'over_under_total', 'over_odds', 'under_odds',
+)
+TOTALS_ODDS_FIELDS = {'over': 'over_odds', 'under': 'under_odds'}
+
+# Unique key of an odds line; upserts update the remaining columns
+ODDS_CONFLICT_COLUMNS = ('game_id', 'bookmaker')
+
+
+def _normalize_schedule(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parse a basketball-reference schedule into clean, typed columns.
+    
+    Dates are parsed and team abbreviations stripped once per column; rows
+    without a date or teams are dropped. Scores become Python ints or None.
+    
+    Args:
+        df: Raw schedule DataFrame
+        
+    Returns:
+        DataFrame with DATE, VISITOR, HOME, VISITOR_PTS and HOME_PTS columns
+    """
+    normalized = pd.DataFrame({
+        'DATE': pd.to_datetime(df['DATE'], errors='coerce'),
+        'VISITOR': df['VISITOR'].astype(str).str.strip(),
+        'HOME': df['HOME'].astype(str).str.strip(),
+    })
+    for column in ('VISITOR_PTS', 'HOME_PTS'):
+        if column in df:
+            points = pd.to_numeric(df[column], errors='coerce').astype('Int64')
+            normalized[column] = points.astype(object).where(points.notna(), None)
+        else:
+            normalized[column] = None
+    
+    valid = normalized['DATE'].notna() & (normalized['VISITOR'] != '') & (normalized['HOME'] != '')
+    return normalized[valid]
+
+
+def _parse_h2h(outcomes, name_side: Dict[str, str]) -> Dict:
+    """
+    Parse moneyline (h2h) outcomes into Odds column values.
+    
+    Args:
+        outcomes: Market outcomes from The Odds API
+        name_side: Team name -> 'home'/'away' lookup for the game
+        
+    Returns:
+        Dict of Odds column values
+    """
+    values = {}
+    for outcome in outcomes:
+        side = name_side.get(outcome.get('name'))
+        if side:
+            values[f'{side}_team_moneyline'] = int(outcome.get('price', 0))
+    return values
+
+
+def _parse_spreads(outcomes, name_side: Dict[str, str]) -> Dict:
+    """
+    Parse point spread outcomes into Odds column values.
+    
+    Args:
+        outcomes: Market outcomes from The Odds API
+        name_side: Team name -> 'home'/'away' lookup for the game
+        
+    Returns:
+        Dict of Odds column values
+    """
+    values = {}
+    for outcome in outcomes:
+        side = name_side.get(outcome.get('name'))
+        if side:
+            values[f'{side}_team_spread'] = float(outcome.get('point', 0))
+            values[f'{side}_team_spread_odds'] = int(outcome.get('price', 0))
+    return values
+
+
+def _parse_totals(outcomes, name_side: Dict[str, str]) -> Dict:
+    """
+    Parse over/under outcomes into Odds column values.
+    
+    The total is taken from the Over line, falling back to the Under line.
+    
+    Args:
+        outcomes: Market outcomes from The Odds API
+        name_side: Unused; kept for a uniform parser signature
+        
+    Returns:
+        Dict of Odds column values
+    """
+    values = {}
+    for outcome in outcomes:
+        name = outcome.get('name', '').lower()
+        field = TOTALS_ODDS_FIELDS.get(name)
+        if field:
+            values[field] = int(outcome.get('price', 0))
+            if name == 'over' or 'over_under_total' not in values:
+                values['over_under_total'] = float(outcome.get('point', 0))
+    return values
+
+
+# Market key -> parser for The Odds API bookmaker markets
+ODDS_MARKET_PARSERS = {
+    'h2h': _parse_h2h,
+    'spreads': _parse_spreads,
+    'totals': _parse_totals,
+}
+
+
+@lru_cache(maxsize=None)
+def _season_bounds(season: int) -> tuple:
+    """
+    Earliest and latest dates a season's games can fall on.
+    
+    The window is deliberately wide (August to October) so that shifted
+    seasons such as the 2020 bubble playoffs and the late 2020-21 start
+    are kept, while rows outside the season are dropped.
+    
+    Args:
+        season: Season end year (e.g., 2024 for 2023-2024)
+        
+    Returns:
+        (start, end) Timestamps, inclusive
+    """
+    return pd.Timestamp(season - 1, 8, 1), pd.Timestamp(season, 10, 31)
+
+
+def _cached_schedule(season: int) -> pd.DataFrame:
+    """
+    Fetch a season schedule, caching completed seasons on disk as Parquet.
+    
+    Completed seasons never change, so they are downloaded once; the current
+    season is always fetched fresh.
+    
+    Args:
+        season: Season end year (e.g., 2024 for 2023-2024)
+        
+    Returns:
+        Schedule DataFrame (None or empty if unavailable)
+    """
+    completed = season < datetime.now().year
+    cache_path = SCHEDULE_CACHE_DIR / f"schedule_{season}.parquet"
+    if completed and cache_path.exists():
+        return pd.read_parquet(cache_path)
+    
+    df = schedule(season)
+    if completed and df is not None and not df.empty:
+        try:
+            SCHEDULE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_path, index=False)
+        except Exception as e:
+            logger.warning("Could not cache schedule for season %s: %s", season, e)
+    return df
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces requests `interval` seconds apart."""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def acquire(self):
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+async def _fetch_odds_history_async(dates: List, concurrency: int = 5) -> Dict:
+    """
+    Fetch The Odds API odds-history payloads for several dates concurrently.
+    
+    Args:
+        dates: Dates to fetch
+        concurrency: Maximum number of requests in flight at once
+        
+    Returns:
+        Dictionary mapping each date to its list of games (empty on failure)
+    """
+    url = f"{ODDS_API_BASE_URL}/sports/basketball_nba/odds-history"
+    semaphore = asyncio.Semaphore(concurrency)
+    quota = {'remaining': None}  # Latest x-requests-remaining reported by the API
+    
+    async def fetch_one(day, client: httpx.AsyncClient):
+        params = {
+            "apiKey": ODDS_API_KEY,
+            "regions": "us",
+            "markets": "h2h,spreads,totals",
+            "oddsFormat": "american",
+            "dateFormat": "iso",
+            "date": day.isoformat()
+        }
+        async with semaphore:
+            for attempt in range(3):
+                # Stop spending requests once the API quota is used up
+                if quota['remaining'] is not None and quota['remaining'] <= 0:
+                    logger.warning("Odds API quota exhausted. Skipping %s", day)
+                    return day, []
+                
+                try:
+                    response = await client.get(url, params=params)
+                    
+                    remaining = response.headers.get('x-requests-remaining')
+                    if remaining is not None:
+                        try:
+                            quota['remaining'] = float(remaining)
+                        except ValueError:
+                            pass
+                    
+                    # Check rate limits
+                    if response.status_code == 429:
+                        logger.warning("Rate limit reached for %s. Waiting 60 seconds...", day)
+                        await asyncio.sleep(60)
+                        continue
+                    
+                    response.raise_for_status()
+                    return day, orjson.loads(response.content)
+                except httpx.HTTPError as e:
+                    logger.error("Error fetching odds for %s: %s", day, e)
+                    await asyncio.sleep(5)  # Wait before retrying
+                except (orjson.JSONDecodeError, ValueError) as e:
+                    # A malformed body won't parse on a retry either
+                    logger.error("Invalid odds payload for %s: %s", day, e)
+                    return day, []
+        return day, []
+    
+    async with httpx.AsyncClient(timeout=30) as client:
+        results = await asyncio.gather(
+            *(fetch_one(day, client) for day in dates), return_exceptions=True
+        )
+    
+    # One date failing unexpectedly must not discard the others' payloads
+    payloads = {}
+    for day, result in zip(dates, results):
+        if isinstance(result, Exception):
+            logger.error("Error fetching odds for %s: %s", day, result)
+            payloads[day] = []
+        else:
+            payloads[day] = result[1]
+    return payloads
+
 
 class DataIngestor:
     """Handles all data ingestion tasks."""
     
     def __init__(self):
         self.session = get_session()
-        init_database()  # Ensure tables exist
+        init_database()  # Ensure tables exist (no-op after the first call)
+        self._team_cache: Dict[str, Team] = {}
+        self._name_to_team: Dict[str, Team] = {}
+        self._box_score_limiter = RateLimiter(BOX_SCORE_REQUEST_INTERVAL)
+        self._load_team_cache()
+        self._http = self._create_http_session()
+    
+    def _create_http_session(self) -> requests.Session:
+        """Create a keep-alive session that retries rate-limited and failed requests."""
+        retry = Retry(
+            total=5,
+            backoff_factor=2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False  # Let raise_for_status() report the final status
+        )
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+        return session
+    
+    def clear_session(self):
+        """Close pooled HTTP connections and start a fresh session."""
+        self._http.close()
+        self._http = self._create_http_session()
+    
+    def _load_team_cache(self):
+        """Load all teams once, keyed by abbreviation."""
+        self._team_cache = {team.abbreviation: team for team in self.session.query(Team).all()}
     
     def _get_or_create_team(self, team_name: str, abbreviation: str) -> Team:
         """Get existing team or create new one."""
-        team = self.session.query(Team).filter_by(abbreviation=abbreviation).first()
+        team = self._team_cache.get(abbreviation)
         if not team:
             team = Team(team_name=team_name, abbreviation=abbreviation)
             self.session.add(team)
             self.session.commit()
             self.session.refresh(team)
+            self._team_cache[abbreviation] = team
         return team
     
-    def _create_game_id(self, date: datetime, home_abbr: str, away_abbr: str) -> str:
+    def _save_games(self, games_batch: List[Game]):
+        """Bulk insert a batch of new games in one transaction and clear the batch."""
+        if not games_batch:
+            return
+        self.session.bulk_save_objects(games_batch)
+        self.session.commit()
+        clear_feature_caches()
+        games_batch.clear()
+    
+    def _create_game_id(self, game_date: datetime.date, home_abbr: str, away_abbr: str) -> str:
         """Create unique game ID."""
-        return f"{date.strftime('%Y-%m-%d')}-{home_abbr}-{away_abbr}"
+        return f"{game_date.isoformat()}-{home_abbr}-{away_abbr}"
     
     def fetch_historical_games_and_stats(self, start_season: int = 2010, end_season: int = None):
         """
@@ -47,37 +457,41 @@ class DataIngestor:
         if end_season is None:
             end_season = datetime.now().year
         
-        print(f"Fetching historical data from {start_season} to {end_season}...")
+        logger.info("Fetching historical data from %s to %s...", start_season, end_season)
         
         for season in range(start_season, end_season + 1):
-            print(f"Processing season {season}...")
+            logger.info("Processing season %s...", season)
             try:
                 # Get schedule for the season
-                df = schedule(season)
+                df = _cached_schedule(season)
                 
                 if df is None or df.empty:
-                    print(f"No data found for season {season}")
+                    logger.info("No data found for season %s", season)
                     continue
                 
+                # Drop rows dated outside the season before iterating
+                season_start, season_end = _season_bounds(season)
+                games = _normalize_schedule(df)
+                games = games[games['DATE'].between(season_start, season_end)]
+                
+                # Load existing game IDs once instead of querying per game.
+                # Game IDs start with the date, so filter by date rather than
+                # season: games from the odds feed use a different season number
+                existing_ids = {
+                    game_id for (game_id,) in
+                    self.session.query(Game.game_id).filter(
+                        Game.date.between(season_start.date(), season_end.date())
+                    ).all()
+                }
+                
                 # Process each game
-                for idx, row in df.iterrows():
+                games_batch = []
+                completed_games = []
+                for row in games.itertuples(index=False):
                     try:
-                        date_str = row.get('DATE', '')
-                        if not date_str:
-                            continue
-                        
-                        # Parse date
-                        try:
-                            game_date = pd.to_datetime(date_str).date()
-                        except:
-                            continue
-                        
-                        # Get team abbreviations
-                        visitor = str(row.get('VISITOR', '')).strip()
-                        home = str(row.get('HOME', '')).strip()
-                        
-                        if not visitor or not home:
-                            continue
+                        game_date = row.DATE.date()
+                        visitor = row.VISITOR
+                        home = row.HOME
                         
                         # Get or create teams
                         visitor_team = self._get_or_create_team(visitor, visitor)
@@ -85,26 +499,22 @@ class DataIngestor:
                         
                         # Create game ID
                         game_id = self._create_game_id(
-                            datetime.combine(game_date, datetime.min.time()),
+                            game_date,
                             home_team.abbreviation,
                             visitor_team.abbreviation
                         )
                         
-                        # Check if game already exists
-                        existing_game = self.session.query(Game).filter_by(game_id=game_id).first()
-                        if existing_game:
+                        # Skip games that already exist
+                        if game_id in existing_ids:
                             continue
+                        existing_ids.add(game_id)
                         
-                        # Get scores if available
-                        visitor_score = None
-                        home_score = None
-                        if 'VISITOR_PTS' in row and pd.notna(row['VISITOR_PTS']):
-                            visitor_score = int(row['VISITOR_PTS'])
-                        if 'HOME_PTS' in row and pd.notna(row['HOME_PTS']):
-                            home_score = int(row['HOME_PTS'])
+                        # Scores are None for games not yet played
+                        visitor_score = row.VISITOR_PTS
+                        home_score = row.HOME_PTS
                         
                         # Create game
-                        game = Game(
+                        games_batch.append(Game(
                             game_id=game_id,
                             date=game_date,
                             home_team_id=home_team.team_id,
@@ -113,92 +523,132 @@ class DataIngestor:
                             away_score=visitor_score,
                             season=season,
                             game_type="regular"  # Could be enhanced to detect playoffs
-                        )
-                        self.session.add(game)
-                        self.session.commit()
+                        ))
                         
-                        # Fetch box scores if game is completed
                         if visitor_score is not None and home_score is not None:
-                            try:
-                                self._fetch_and_store_box_scores(game_id, game_date, visitor_team, home_team)
-                            except Exception as e:
-                                print(f"Error fetching box scores for {game_id}: {e}")
-                        
-                        # Rate limiting
-                        time.sleep(0.5)
+                            completed_games.append((game_id, game_date, visitor_team, home_team))
                         
                     except Exception as e:
-                        print(f"Error processing game {idx} in season {season}: {e}")
+                        # Discard any failed team insert so later rows can still commit
+                        self.session.rollback()
+                        logger.error(
+                            "Error processing game %s@%s on %s in season %s: %s",
+                            row.VISITOR, row.HOME, row.DATE, season, e
+                        )
                         continue
+                    
+                    # Flush outside the per-row handler so insert failures abort the season
+                    if len(games_batch) >= GAME_INSERT_BATCH_SIZE:
+                        self._save_games(games_batch)
+                
+                self._save_games(games_batch)
                 
-                print(f"Completed season {season}")
+                # Fetch box scores for completed games once their games are stored
+                self._fetch_box_scores_concurrently(completed_games)
+                
+                logger.info("Completed season %s", season)
                 time.sleep(1)  # Rate limiting between seasons
                 
             except Exception as e:
-                print(f"Error processing season {season}: {e}")
+                # Discard the failed batch so later seasons can still commit
+                self.session.rollback()
+                logger.error("Error processing season %s: %s", season, e)
                 continue
         
-        print("Historical data ingestion complete!")
-    
-    def _fetch_and_store_box_scores(self, game_id: str, game_date, visitor_team: Team, home_team: Team):
-        """Fetch and store box scores for a completed game."""
+        # Rebuild materialized prediction features from the new box scores
         try:
-            # Fetch box scores
-            box_score_df = box_scores(game_date, visitor_team.abbreviation, home_team.abbreviation)
-            
-            if box_score_df is None or box_score_df.empty:
-                return
-            
-            # Process visitor team box score
-            if visitor_team.abbreviation in box_score_df.index:
-                visitor_stats = box_score_df.loc[visitor_team.abbreviation]
-                self._create_box_score(game_id, visitor_team.team_id, False, visitor_stats)
-            
-            # Process home team box score
-            if home_team.abbreviation in box_score_df.index:
-                home_stats = box_score_df.loc[home_team.abbreviation]
-                self._create_box_score(game_id, home_team.team_id, True, home_stats)
-            
-            self.session.commit()
-            
+            materialize_team_daily_features(self.session)
         except Exception as e:
-            print(f"Error in _fetch_and_store_box_scores: {e}")
-            raise
-    
-    def _create_box_score(self, game_id: str, team_id: int, is_home: bool, stats: pd.Series):
-        """Create a TeamBoxScore record from stats series."""
-        # Check if box score already exists
-        existing = self.session.query(TeamBoxScore).filter_by(
-            game_id=game_id, team_id=team_id
-        ).first()
-        if existing:
+            self.session.rollback()
+            logger.error("Error materializing team daily features: %s", e)
+        
+        logger.info("Historical data ingestion complete!")
+    
+    def _fetch_box_scores_concurrently(self, completed_games: List[tuple]):
+        """
+        Download box scores on worker threads and bulk-insert them on this thread.
+        
+        Args:
+            completed_games: (game_id, game_date, visitor_team, home_team) tuples
+        """
+        if not completed_games:
+            return
+        
+        with ThreadPoolExecutor(max_workers=BOX_SCORE_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    self._download_box_scores, game_date,
+                    visitor_team.abbreviation, home_team.abbreviation
+                ): (game_id, visitor_team, home_team)
+                for game_id, game_date, visitor_team, home_team in completed_games
+            }
+            rows = []
+            for future in as_completed(futures):
+                game_id, visitor_team, home_team = futures[future]
+                try:
+                    rows.extend(self._box_score_rows(game_id, future.result(), visitor_team, home_team))
+                except Exception as e:
+                    logger.error("Error fetching box scores for %s: %s", game_id, e)
+                    continue
+                
+                if len(rows) >= BOX_SCORE_INSERT_BATCH_SIZE:
+                    self._insert_box_scores(rows)
+                    rows = []
+        
+        self._insert_box_scores(rows)
+    
+    def _download_box_scores(self, game_date, visitor_abbr: str, home_abbr: str) -> Optional[pd.DataFrame]:
+        """Fetch a game's box scores, sharing the request rate limit across threads."""
+        self._box_score_limiter.acquire()
+        return box_scores(game_date, visitor_abbr, home_abbr)
+    
+    def _box_score_rows(self, game_id: str, box_score_df: Optional[pd.DataFrame], visitor_team: Team, home_team: Team) -> List[Dict]:
+        """Build team_box_scores rows for the visitor and home teams of a fetched box score."""
+        if box_score_df is None or box_score_df.empty:
+            return []
+        
+        rows = []
+        for team, is_home in ((visitor_team, False), (home_team, True)):
+            if team.abbreviation in box_score_df.index:
+                stats = box_score_df.loc[team.abbreviation]
+                rows.append(self._box_score_row(game_id, team.team_id, is_home, stats))
+        return rows
+    
+    def _box_score_row(self, game_id: str, team_id: int, is_home: bool, stats: pd.Series) -> Dict:
+        """Build a team_box_scores row dict from a stats series."""
+        # Coerce all stat columns in one pass; missing or unparseable values become 0
+        values = pd.to_numeric(stats.reindex(BOX_SCORE_STAT_COLUMNS), errors='coerce').fillna(0)
+        int_values = values.iloc[:len(BOX_SCORE_INT_FIELDS)].to_numpy(dtype='int64').tolist()
+        float_values = values.iloc[len(BOX_SCORE_INT_FIELDS):].to_numpy(dtype='float64').tolist()
+        
+        return {
+            'game_id': game_id,
+            'team_id': team_id,
+            'is_home': is_home,
+            **dict(zip(BOX_SCORE_INT_FIELDS.values(), int_values)),
+            **dict(zip(BOX_SCORE_FLOAT_FIELDS.values(), float_values)),
+        }
+    
+    def _insert_box_scores(self, rows: List[Dict]):
+        """
+        Insert box score rows with one Core executemany, skipping rows already stored.
+        
+        Args:
+            rows: team_box_scores row dicts
+        """
+        if not rows:
             return
         
-        box_score = TeamBoxScore(
-            game_id=game_id,
-            team_id=team_id,
-            is_home=is_home,
-            fg=int(stats.get('FG', 0)) if pd.notna(stats.get('FG')) else 0,
-            fga=int(stats.get('FGA', 0)) if pd.notna(stats.get('FGA')) else 0,
-            fg_pct=float(stats.get('FG%', 0)) if pd.notna(stats.get('FG%')) else 0.0,
-            fg3=int(stats.get('3P', 0)) if pd.notna(stats.get('3P')) else 0,
-            fg3a=int(stats.get('3PA', 0)) if pd.notna(stats.get('3PA')) else 0,
-            fg3_pct=float(stats.get('3P%', 0)) if pd.notna(stats.get('3P%')) else 0.0,
-            ft=int(stats.get('FT', 0)) if pd.notna(stats.get('FT')) else 0,
-            fta=int(stats.get('FTA', 0)) if pd.notna(stats.get('FTA')) else 0,
-            ft_pct=float(stats.get('FT%', 0)) if pd.notna(stats.get('FT%')) else 0.0,
-            orb=int(stats.get('ORB', 0)) if pd.notna(stats.get('ORB')) else 0,
-            drb=int(stats.get('DRB', 0)) if pd.notna(stats.get('DRB')) else 0,
-            trb=int(stats.get('TRB', 0)) if pd.notna(stats.get('TRB')) else 0,
-            ast=int(stats.get('AST', 0)) if pd.notna(stats.get('AST')) else 0,
-            stl=int(stats.get('STL', 0)) if pd.notna(stats.get('STL')) else 0,
-            blk=int(stats.get('BLK', 0)) if pd.notna(stats.get('BLK')) else 0,
-            tov=int(stats.get('TOV', 0)) if pd.notna(stats.get('TOV')) else 0,
-            pf=int(stats.get('PF', 0)) if pd.notna(stats.get('PF')) else 0,
-            pts=int(stats.get('PTS', 0)) if pd.notna(stats.get('PTS')) else 0,
-            plus_minus=int(stats.get('+/-', 0)) if pd.notna(stats.get('+/-')) else 0,
+        stmt = sqlite_insert(TeamBoxScore).on_conflict_do_nothing(
+            index_elements=['game_id', 'team_id']
         )
-        self.session.add(box_score)
+        try:
+            self.session.execute(stmt, rows)
+            self.session.commit()
+            clear_feature_caches()
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Error inserting %s box scores: %s", len(rows), e)
     
     def fetch_historical_odds(self, csv_path: str = "data/historical_odds.csv"):
         """
@@ -208,47 +658,36 @@ class DataIngestor:
             csv_path: Path to CSV file with historical odds data
         """
         try:
-            df = pd.read_csv(csv_path)
-            print(f"Loading odds from {csv_path}...")
+            df = pd.read_csv(csv_path, engine='pyarrow', dtype=HISTORICAL_ODDS_DTYPES)
+            logger.info("Loading odds from %s...", csv_path)
             
-            for idx, row in df.iterrows():
-                try:
-                    game_id = row.get('game_id')
-                    if not game_id:
-                        continue
-                    
-                    # Check if game exists
-                    game = self.session.query(Game).filter_by(game_id=game_id).first()
-                    if not game:
-                        continue
-                    
-                    # Create odds record
-                    odds = Odds(
-                        game_id=game_id,
-                        bookmaker=row.get('bookmaker', 'unknown'),
-                        home_team_spread=float(row.get('home_spread')) if pd.notna(row.get('home_spread')) else None,
-                        home_team_spread_odds=int(row.get('home_spread_odds')) if pd.notna(row.get('home_spread_odds')) else None,
-                        away_team_spread=float(row.get('away_spread')) if pd.notna(row.get('away_spread')) else None,
-                        away_team_spread_odds=int(row.get('away_spread_odds')) if pd.notna(row.get('away_spread_odds')) else None,
-                        home_team_moneyline=int(row.get('home_moneyline')) if pd.notna(row.get('home_moneyline')) else None,
-                        away_team_moneyline=int(row.get('away_moneyline')) if pd.notna(row.get('away_moneyline')) else None,
-                        over_under_total=float(row.get('over_under')) if pd.notna(row.get('over_under')) else None,
-                        over_odds=int(row.get('over_odds')) if pd.notna(row.get('over_odds')) else None,
-                        under_odds=int(row.get('under_odds')) if pd.notna(row.get('under_odds')) else None,
-                    )
-                    self.session.add(odds)
-                    
-                except Exception as e:
-                    print(f"Error processing odds row {idx}: {e}")
-                    continue
+            df['bookmaker'] = df['bookmaker'].fillna('unknown') if 'bookmaker' in df else 'unknown'
             
-            self.session.commit()
-            print("Historical odds loaded successfully!")
+            # Keep only odds for games we know about, matched in memory
+            connection = self.session.connection()
+            known_games = pd.read_sql(select(Game.game_id), connection)
+            df = df.dropna(subset=['game_id']).merge(known_games, on='game_id', how='inner')
+            
+            odds_df = df[[c for c in HISTORICAL_ODDS_COLUMNS if c in df]].rename(
+                columns=HISTORICAL_ODDS_COLUMNS
+            )
+            for column in odds_df.columns:
+                if column in ODDS_INT_COLUMNS:
+                    odds_df[column] = odds_df[column].astype('Int64')
+            
+            # Multi-row upserts, so re-loading the file refreshes existing lines;
+            # committing per batch keeps each transaction and the WAL file bounded
+            for start in range(0, len(odds_df), ODDS_COMMIT_BATCH_SIZE):
+                batch = odds_df.iloc[start:start + ODDS_COMMIT_BATCH_SIZE]
+                self._upsert_odds(batch.astype(object).where(batch.notna(), None).to_dict('records'))
+                self.session.commit()
+            logger.info("Upserted %s odds rows", len(odds_df))
+            logger.info("Historical odds loaded successfully!")
             
         except FileNotFoundError:
-            print(f"Historical odds file not found at {csv_path}. Skipping...")
+            logger.warning("Historical odds file not found at %s. Skipping...", csv_path)
         except Exception as e:
-            print(f"Error loading historical odds: {e}")
+            logger.error("Error loading historical odds: %s", e)
     
     def fetch_upcoming_games(self, days_ahead: int = 7) -> List[Dict]:
         """
@@ -262,32 +701,23 @@ class DataIngestor:
         """
         current_season = datetime.now().year
         try:
-            df = schedule(current_season)
-            upcoming_games = []
+            games = _normalize_schedule(schedule(current_season))
             
             today = datetime.now().date()
             end_date = today + timedelta(days=days_ahead)
             
-            for idx, row in df.iterrows():
-                try:
-                    date_str = row.get('DATE', '')
-                    if not date_str:
-                        continue
-                    
-                    game_date = pd.to_datetime(date_str).date()
-                    if today <= game_date <= end_date:
-                        upcoming_games.append({
-                            'date': game_date,
-                            'visitor': row.get('VISITOR', ''),
-                            'home': row.get('HOME', '')
-                        })
-                except:
-                    continue
+            # Select the window with one vectorized mask instead of scanning every row
+            in_window = games['DATE'].dt.normalize().between(pd.Timestamp(today), pd.Timestamp(end_date))
+            upcoming = games.loc[in_window]
             
-            return upcoming_games
+            return pd.DataFrame({
+                'date': upcoming['DATE'].dt.date,
+                'visitor': upcoming['VISITOR'],
+                'home': upcoming['HOME'],
+            }).to_dict('records')
             
         except Exception as e:
-            print(f"Error fetching upcoming games: {e}")
+            logger.error("Error fetching upcoming games: %s", e)
             return []
     
     def _map_odds_api_team_to_db_team(self, odds_api_team_name: str) -> Optional[Team]:
@@ -295,84 +725,40 @@ class DataIngestor:
         Map The Odds API team name to our database team.
         The Odds API uses full team names like "Los Angeles Lakers" or "LA Lakers".
         """
-        # Common mappings for The Odds API team names to our abbreviations
-        team_mappings = {
-            # Full names
-            "Los Angeles Lakers": "LAL",
-            "LA Lakers": "LAL",
-            "Golden State Warriors": "GSW",
-            "Boston Celtics": "BOS",
-            "Miami Heat": "MIA",
-            "Chicago Bulls": "CHI",
-            "New York Knicks": "NYK",
-            "Philadelphia 76ers": "PHI",
-            "Brooklyn Nets": "BKN",
-            "Milwaukee Bucks": "MIL",
-            "Toronto Raptors": "TOR",
-            "Indiana Pacers": "IND",
-            "Cleveland Cavaliers": "CLE",
-            "Detroit Pistons": "DET",
-            "Orlando Magic": "ORL",
-            "Charlotte Hornets": "CHA",
-            "Washington Wizards": "WAS",
-            "Atlanta Hawks": "ATL",
-            "Dallas Mavericks": "DAL",
-            "Houston Rockets": "HOU",
-            "San Antonio Spurs": "SAS",
-            "Memphis Grizzlies": "MEM",
-            "New Orleans Pelicans": "NOP",
-            "Oklahoma City Thunder": "OKC",
-            "Denver Nuggets": "DEN",
-            "Utah Jazz": "UTA",
-            "Portland Trail Blazers": "POR",
-            "Minnesota Timberwolves": "MIN",
-            "Sacramento Kings": "SAC",
-            "Phoenix Suns": "PHX",
-            "LA Clippers": "LAC",
-            "Los Angeles Clippers": "LAC",
-            # Variations
-            "Lakers": "LAL",
-            "Warriors": "GSW",
-            "Celtics": "BOS",
-            "Heat": "MIA",
-            "Bulls": "CHI",
-            "Knicks": "NYK",
-            "76ers": "PHI",
-            "Nets": "BKN",
-            "Bucks": "MIL",
-            "Raptors": "TOR",
-        }
-        
-        # Try direct mapping first
-        if odds_api_team_name in team_mappings:
-            abbr = team_mappings[odds_api_team_name]
-            return self.session.query(Team).filter_by(abbreviation=abbr).first()
+        team = self._name_to_team.get(odds_api_team_name)
+        if team:
+            return team
+        key = odds_api_team_name.lower()
         
-        # Try case-insensitive search in database
-        team = self.session.query(Team).filter(
-            Team.team_name.ilike(f"%{odds_api_team_name}%")
-        ).first()
-        
-        if not team:
-            # Try abbreviation match
-            team = self.session.query(Team).filter(
-                Team.abbreviation.ilike(f"%{odds_api_team_name}%")
-            ).first()
+        # Direct mapping first, then case-insensitive substring match on name/abbreviation
+        abbr = ODDS_API_TEAM_ABBREVIATIONS.get(odds_api_team_name)
+        if abbr:
+            team = self._team_cache.get(abbr)
+        else:
+            team = next(
+                (t for t in self._team_cache.values() if key in t.team_name.lower()),
+                None
+            ) or next(
+                (t for t in self._team_cache.values() if key in t.abbreviation.lower()),
+                None
+            )
         
+        if team:
+            self._name_to_team[odds_api_team_name] = team
         return team
     
-    def _parse_odds_api_response(self, game_data: dict, game_date: datetime.date) -> List[Odds]:
+    def _parse_odds_api_response(self, game_data: dict, game_date: datetime.date) -> List[Dict]:
         """
-        Parse The Odds API response and create Odds records.
+        Parse The Odds API response into odds rows, creating the game if needed.
         
         Args:
             game_data: Single game data from The Odds API
             game_date: Date of the game
             
         Returns:
-            List of Odds objects
+            List of odds row dicts, one per bookmaker, ready for _upsert_odds
         """
-        odds_records = []
+        odds_rows = []
         
         try:
             # Extract game information
@@ -384,12 +770,12 @@ class DataIngestor:
             away_team = self._map_odds_api_team_to_db_team(away_team_name)
             
             if not home_team or not away_team:
-                print(f"Could not map teams: {home_team_name} vs {away_team_name}")
-                return odds_records
+                logger.warning("Could not map teams: %s vs %s", home_team_name, away_team_name)
+                return odds_rows
             
             # Create game ID
             game_id = self._create_game_id(
-                datetime.combine(game_date, datetime.min.time()),
+                game_date,
                 home_team.abbreviation,
                 away_team.abbreviation
             )
@@ -409,106 +795,60 @@ class DataIngestor:
             
             # Process bookmakers
             bookmakers = game_data.get('bookmakers', [])
+            fetched_at = datetime.now().date()
+            name_side = {home_team_name: 'home', away_team_name: 'away'}
             
             for bookmaker_data in bookmakers:
                 bookmaker_name = bookmaker_data.get('title', 'unknown')
                 
-                # Extract markets
-                markets = bookmaker_data.get('markets', [])
+                # Dispatch each market to its parser
+                values = dict.fromkeys(ODDS_MARKET_FIELDS)
+                for market in bookmaker_data.get('markets', []):
+                    parser = ODDS_MARKET_PARSERS.get(market.get('key'))
+                    if parser:
+                        values.update(parser(market.get('outcomes', ()), name_side))
                 
-                # Initialize odds values
-                home_moneyline = None
-                away_moneyline = None
-                home_spread = None
-                home_spread_odds = None
-                away_spread = None
-                away_spread_odds = None
-                over_under = None
-                over_odds = None
-                under_odds = None
-                
-                for market in markets:
-                    market_key = market.get('key', '')
-                    
-                    if market_key == 'h2h':  # Moneyline
-                        outcomes = market.get('outcomes', [])
-                        for outcome in outcomes:
-                            if outcome.get('name') == home_team_name:
-                                home_moneyline = int(outcome.get('price', 0))
-                            elif outcome.get('name') == away_team_name:
-                                away_moneyline = int(outcome.get('price', 0))
-                    
-                    elif market_key == 'spreads':  # Point spreads
-                        outcomes = market.get('outcomes', [])
-                        for outcome in outcomes:
-                            name = outcome.get('name', '')
-                            point = outcome.get('point', 0)
-                            price = int(outcome.get('price', 0))
-                            
-                            if name == home_team_name:
-                                home_spread = float(point)
-                                home_spread_odds = price
-                            elif name == away_team_name:
-                                away_spread = float(point)
-                                away_spread_odds = price
-                    
-                    elif market_key == 'totals':  # Over/Under
-                        outcomes = market.get('outcomes', [])
-                        for outcome in outcomes:
-                            name = outcome.get('name', '').lower()
-                            point = outcome.get('point', 0)
-                            price = int(outcome.get('price', 0))
-                            
-                            if 'over' in name:
-                                over_under = float(point)
-                                over_odds = price
-                            elif 'under' in name:
-                                if over_under is None:
-                                    over_under = float(point)
-                                under_odds = price
-                
-                # Check if odds already exist for this game and bookmaker
-                existing = self.session.query(Odds).filter_by(
-                    game_id=game_id,
-                    bookmaker=bookmaker_name
-                ).first()
-                
-                if existing:
-                    # Update existing odds
-                    existing.home_team_moneyline = home_moneyline
-                    existing.away_team_moneyline = away_moneyline
-                    existing.home_team_spread = home_spread
-                    existing.home_team_spread_odds = home_spread_odds
-                    existing.away_team_spread = away_spread
-                    existing.away_team_spread_odds = away_spread_odds
-                    existing.over_under_total = over_under
-                    existing.over_odds = over_odds
-                    existing.under_odds = under_odds
-                    existing.fetched_at = datetime.now().date()
-                else:
-                    # Create new odds record
-                    odds = Odds(
-                        game_id=game_id,
-                        bookmaker=bookmaker_name,
-                        home_team_moneyline=home_moneyline,
-                        away_team_moneyline=away_moneyline,
-                        home_team_spread=home_spread,
-                        home_team_spread_odds=home_spread_odds,
-                        away_team_spread=away_spread,
-                        away_team_spread_odds=away_spread_odds,
-                        over_under_total=over_under,
-                        over_odds=over_odds,
-                        under_odds=under_odds
-                    )
-                    odds_records.append(odds)
-                    self.session.add(odds)
+                odds_rows.append({
+                    'game_id': game_id,
+                    'bookmaker': bookmaker_name,
+                    **values,
+                    'fetched_at': fetched_at,
+                })
         
         except Exception as e:
-            print(f"Error parsing odds data: {e}")
+            logger.error("Error parsing odds data: %s", e)
         
-        return odds_records
+        return odds_rows
     
-    def fetch_historical_odds_from_api(self, start_date: datetime.date, end_date: datetime.date):
+    def _upsert_odds(self, rows: List[Dict]):
+        """
+        Insert odds rows, updating lines already stored for the same game and bookmaker.
+        
+        Rows are written with multi-row INSERT ... ON CONFLICT DO UPDATE statements
+        inside the session's transaction; the caller commits.
+        
+        Args:
+            rows: Odds row dicts sharing the same keys
+        """
+        if not rows:
+            return
+        
+        update_columns = [c for c in rows[0] if c not in ODDS_CONFLICT_COLUMNS]
+        chunk_size = max(1, SQLITE_MAX_VARIABLES // len(rows[0]))
+        for start in range(0, len(rows), chunk_size):
+            stmt = sqlite_insert(Odds).values(rows[start:start + chunk_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(ODDS_CONFLICT_COLUMNS),
+                set_={c: stmt.excluded[c] for c in update_columns}
+            )
+            self.session.execute(stmt)
+    
+    def fetch_historical_odds_from_api(
+        self,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        concurrency: int = 5
+    ):
         """
         Fetch historical odds from The Odds API.
         The Odds API provides historical data since mid-2020.
@@ -516,69 +856,44 @@ class DataIngestor:
         Args:
             start_date: Start date for historical odds
             end_date: End date for historical odds
+            concurrency: Maximum number of dates fetched in parallel
         """
-        if not ODDS_API_KEY or ODDS_API_KEY == "YOUR_API_KEY_HERE":
-            print("ODDS_API_KEY not configured. Skipping historical odds fetch.")
+        if not ODDS_API_CONFIGURED:
+            logger.warning("ODDS_API_KEY not configured. Skipping historical odds fetch.")
             return
         
-        print(f"Fetching historical odds from {start_date} to {end_date}...")
+        logger.info("Fetching historical odds from %s to %s...", start_date, end_date)
         
-        current_date = start_date
+        # Fetch all dates concurrently (bounded to stay within API rate limits),
+        # then parse sequentially since the database session is not thread-safe
+        dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        payloads = asyncio.run(_fetch_odds_history_async(dates, concurrency))
         total_odds_fetched = 0
         
-        while current_date <= end_date:
+        for current_date in dates:
+            data = payloads[current_date]
+            if not data:
+                logger.info("No odds data for %s", current_date)
+                continue
+            
             try:
-                # The Odds API historical endpoint
-                url = f"{ODDS_API_BASE_URL}/sports/basketball_nba/odds-history"
-                params = {
-                    "apiKey": ODDS_API_KEY,
-                    "regions": "us",
-                    "markets": "h2h,spreads,totals",
-                    "oddsFormat": "american",
-                    "dateFormat": "iso",
-                    "date": current_date.isoformat()
-                }
-                
-                response = requests.get(url, params=params, timeout=30)
-                
-                # Check rate limits
-                if response.status_code == 429:
-                    print(f"Rate limit reached. Waiting 60 seconds...")
-                    time.sleep(60)
-                    continue
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                if not data:
-                    print(f"No odds data for {current_date}")
-                    current_date += timedelta(days=1)
-                    time.sleep(1)  # Rate limiting
-                    continue
-                
-                # Process each game
+                # Parse each game, then upsert the whole day in one go
+                odds_rows = []
                 for game_data in data:
-                    odds_records = self._parse_odds_api_response(game_data, current_date)
-                    total_odds_fetched += len(odds_records)
+                    odds_rows.extend(self._parse_odds_api_response(game_data, current_date))
                 
+                self._upsert_odds(odds_rows)
                 self.session.commit()
-                print(f"Fetched odds for {current_date}: {len(data)} games")
-                
-                # Rate limiting - The Odds API free plan allows 500 requests/month
-                time.sleep(2)  # Be conservative with API calls
-                
-                current_date += timedelta(days=1)
+                total_odds_fetched += len(odds_rows)
+                logger.info("Fetched odds for %s: %s games", current_date, len(data))
                 
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching odds for {current_date}: {e}")
-                time.sleep(5)  # Wait before retrying
-                continue
             except Exception as e:
-                print(f"Unexpected error for {current_date}: {e}")
-                current_date += timedelta(days=1)
+                # Discard the failed day so later dates can still commit
+                self.session.rollback()
+                logger.error("Unexpected error for %s: %s", current_date, e)
                 continue
         
-        print(f"Historical odds fetch complete! Total odds records: {total_odds_fetched}")
+        logger.info("Historical odds fetch complete! Total odds records: %s", total_odds_fetched)
     
     def fetch_live_odds(self, game_date: Optional[datetime] = None):
         """
@@ -587,14 +902,15 @@ class DataIngestor:
         Args:
             game_date: Date to fetch odds for (defaults to today)
         """
-        if not ODDS_API_KEY or ODDS_API_KEY == "YOUR_API_KEY_HERE":
-            print("ODDS_API_KEY not configured. Skipping live odds fetch.")
+        if not ODDS_API_CONFIGURED:
+            logger.warning("ODDS_API_KEY not configured. Skipping live odds fetch.")
             return
         
+        # Take "today" once so the endpoint choice can't straddle midnight
+        today = datetime.now().date()
         if game_date is None:
-            game_date = datetime.now()
-        
-        if isinstance(game_date, datetime):
+            game_date = today
+        elif isinstance(game_date, datetime):
             game_date = game_date.date()
         
         try:
@@ -609,35 +925,35 @@ class DataIngestor:
             }
             
             # If specific date requested, use odds-history endpoint
-            if game_date != datetime.now().date():
+            if game_date != today:
                 url = f"{ODDS_API_BASE_URL}/sports/basketball_nba/odds-history"
                 params["date"] = game_date.isoformat()
             
-            response = requests.get(url, params=params, timeout=30)
+            response = self._http.get(url, params=params, timeout=30)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             if not data:
-                print(f"No odds data available for {game_date}")
+                logger.info("No odds data available for %s", game_date)
                 return
             
-            total_odds = 0
+            odds_rows = []
             for game_data in data:
-                odds_records = self._parse_odds_api_response(game_data, game_date)
-                total_odds += len(odds_records)
+                odds_rows.extend(self._parse_odds_api_response(game_data, game_date))
             
+            self._upsert_odds(odds_rows)
             self.session.commit()
-            print(f"Fetched {total_odds} odds records for {game_date}")
+            logger.info("Fetched %s odds records for %s", len(odds_rows), game_date)
                     
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching live odds: {e}")
+            logger.error("Error fetching live odds: %s", e)
             if hasattr(e.response, 'status_code'):
                 if e.response.status_code == 429:
-                    print("Rate limit exceeded. Please wait before making more requests.")
+                    logger.warning("Rate limit exceeded. Please wait before making more requests.")
                 elif e.response.status_code == 401:
-                    print("Invalid API key. Please check your ODDS_API_KEY.")
+                    logger.warning("Invalid API key. Please check your ODDS_API_KEY.")
         except Exception as e:
-            print(f"Error processing live odds: {e}")
+            logger.error("Error processing live odds: %s", e)
     
     def update_daily_data(self):
         """
@@ -648,17 +964,17 @@ class DataIngestor:
         yesterday = datetime.now() - timedelta(days=1)
         today = datetime.now()
         
-        print(f"Updating data for {yesterday.date()}...")
+        logger.info("Updating data for %s...", yesterday.date())
         
         # Fetch yesterday's games (if any are missing)
         # This would involve checking which games from yesterday are in the DB
         # and fetching box scores for any that are missing
         
         # Fetch today's odds from The Odds API
-        print("Fetching today's odds from The Odds API...")
+        logger.info("Fetching today's odds from The Odds API...")
         self.fetch_live_odds(today)
         
-        print("Daily update complete!")
+        logger.info("Daily update complete!")
     
     def close(self):
         """Close database session."""
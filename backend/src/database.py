@@ -2,12 +2,14 @@
 Database module for NBA Predictor.
 Handles SQLite database connection and schema definition.
 """
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, Date, ForeignKey, Text
+from sqlalchemy import create_engine, event, inspect, text, Column, Integer, String, Float, Boolean, Date, ForeignKey, Index, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.sql import func
 from src.config import DATABASE_URL
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
 
 Base = declarative_base()
@@ -20,14 +22,19 @@ class Team(Base):
     team_name = Column(String(100), nullable=False, unique=True)
     abbreviation = Column(String(10), nullable=False, unique=True)
     
-    # Relationships
-    home_games = relationship("Game", foreign_keys="Game.home_team_id", back_populates="home_team")
-    away_games = relationship("Game", foreign_keys="Game.away_team_id", back_populates="away_team")
-    box_scores = relationship("TeamBoxScore", back_populates="team")
+    # Relationships (collections must be loaded explicitly; lazy loads raise)
+    home_games = relationship("Game", foreign_keys="Game.home_team_id", back_populates="home_team", lazy="raise")
+    away_games = relationship("Game", foreign_keys="Game.away_team_id", back_populates="away_team", lazy="raise")
+    box_scores = relationship("TeamBoxScore", back_populates="team", lazy="raise")
 
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        # Head-to-head and per-team game lookups in either home/away orientation
+        Index("ix_games_home_away_date", "home_team_id", "away_team_id", "date"),
+        Index("ix_games_away_home_date", "away_team_id", "home_team_id", "date"),
+    )
     
     game_id = Column(String(50), primary_key=True)  # e.g., "2024-01-15-LAL-BOS"
     date = Column(Date, nullable=False, index=True)
@@ -42,15 +49,21 @@ class Game(Base):
     home_team_pregame_elo = Column(Float, nullable=True)
     away_team_pregame_elo = Column(Float, nullable=True)
     
-    # Relationships
+    # Relationships (collections must be loaded explicitly; lazy loads raise)
     home_team = relationship("Team", foreign_keys=[home_team_id], back_populates="home_games")
     away_team = relationship("Team", foreign_keys=[away_team_id], back_populates="away_games")
-    box_scores = relationship("TeamBoxScore", back_populates="game")
-    odds = relationship("Odds", back_populates="game")
+    box_scores = relationship("TeamBoxScore", back_populates="game", lazy="raise")
+    odds = relationship("Odds", back_populates="game", lazy="raise")
 
 
 class TeamBoxScore(Base):
     __tablename__ = "team_box_scores"
+    __table_args__ = (
+        # One box score per team per game; serves the ingestion existence checks
+        Index("ix_box_scores_game_team", "game_id", "team_id", unique=True),
+        # Per-team history lookups (rolling averages, rest days) joined to games
+        Index("ix_box_scores_team_game", "team_id", "game_id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     game_id = Column(String(50), ForeignKey("games.game_id"), nullable=False, index=True)
@@ -82,13 +95,17 @@ class TeamBoxScore(Base):
     pts = Column(Integer, default=0)  # Points
     plus_minus = Column(Integer, default=0)  # Plus/minus
     
-    # Relationships
-    game = relationship("Game", back_populates="box_scores")
+    # Relationships (games of loaded box scores are fetched in one IN query)
+    game = relationship("Game", back_populates="box_scores", lazy="selectin")
     team = relationship("Team", back_populates="box_scores")
 
 
 class Odds(Base):
     __tablename__ = "odds"
+    __table_args__ = (
+        # One line per game and bookmaker; also the conflict target for odds upserts
+        Index("ix_odds_game_bookmaker", "game_id", "bookmaker", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     game_id = Column(String(50), ForeignKey("games.game_id"), nullable=False, index=True)
@@ -116,8 +133,44 @@ class Odds(Base):
     game = relationship("Game", back_populates="odds")
 
 
+# Materialized prediction features: a row holds a team's rolling averages over
+# its games before `date` and applies to games from `date` until its next row
+class TeamDailyFeatures(Base):
+    __tablename__ = "team_daily_features"
+    
+    team_id = Column(Integer, ForeignKey("teams.team_id"), primary_key=True)
+    date = Column(Date, primary_key=True)  # Day after the team's last completed game
+    last_game_date = Column(Date, nullable=False)
+    
+    # Rolling averages over the last ROLLING_WINDOW games
+    avg_pts_scored = Column(Float, nullable=False)
+    avg_pts_allowed = Column(Float, nullable=False)
+    avg_fg_pct = Column(Float, nullable=False)
+    avg_tov = Column(Float, nullable=False)
+    avg_plus_minus = Column(Float, nullable=False)
+    avg_rebounds = Column(Float, nullable=False)
+    avg_assists = Column(Float, nullable=False)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configure each new SQLite connection for write-heavy ingestion and concurrent reads."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+@lru_cache(maxsize=None)
 def get_engine():
-    """Create and return SQLAlchemy engine."""
+    """
+    Return the shared SQLAlchemy engine, creating it on first use.
+    
+    One engine per process keeps its connection pool (and the per-connection
+    pragma setup) warm across sessions instead of rebuilding it every call.
+    """
     # Ensure data directory exists
     db_path = DATABASE_URL.replace("sqlite:///", "")
     if db_path.startswith("./"):
@@ -135,20 +188,105 @@ def get_engine():
     db_url = f"sqlite:///{absolute_db_path}"
     
     engine = create_engine(db_url, echo=False)
+    event.listen(engine, "connect", _set_sqlite_pragmas)
     return engine
 
 
+@lru_cache(maxsize=None)
+def _session_factory():
+    """Return the sessionmaker bound to the shared engine."""
+    return sessionmaker(bind=get_engine())
+
+
 def get_session():
     """Create and return a database session."""
+    return _session_factory()()
+
+
+# Unique indexes declared after their tables were first created, with the
+# duplicate each group keeps when deduplicating ("MIN" or "MAX" id): odds keep
+# the latest line, box scores the first one stored
+LATE_UNIQUE_INDEXES = (
+    (Odds.__table__, "ix_odds_game_bookmaker", "MAX"),
+    (TeamBoxScore.__table__, "ix_box_scores_game_team", "MIN"),
+)
+
+
+def _index_columns(table, index_name: str) -> str:
+    """Comma-separated column names of one of a table's declared indexes."""
+    index = next(i for i in table.indexes if i.name == index_name)
+    return ", ".join(column.name for column in index.columns)
+
+
+def _ensure_unique_index(engine, table, index_name: str):
+    """
+    Add a unique index to a table created before the index was declared.
+    
+    Raises:
+        RuntimeError: If existing rows duplicate the indexed columns; they
+            are never deleted implicitly (see dedupe_late_unique_indexes)
+    """
+    with engine.begin() as connection:
+        if inspect(connection).has_index(table.name, index_name):
+            return
+        columns = _index_columns(table, index_name)
+        duplicates = connection.execute(text(
+            f"SELECT (SELECT COUNT(*) FROM {table.name}) - "
+            f"(SELECT COUNT(*) FROM (SELECT 1 FROM {table.name} GROUP BY {columns}))"
+        )).scalar()
+        if duplicates:
+            raise RuntimeError(
+                f"Cannot add unique index {index_name}: {duplicates} rows of "
+                f"{table.name} duplicate ({columns}). Back up the database and "
+                f"run `python -m src.database --dedupe` to remove them."
+            )
+        next(i for i in table.indexes if i.name == index_name).create(connection)
+
+
+def dedupe_late_unique_indexes() -> dict:
+    """
+    Delete rows that duplicate the columns of LATE_UNIQUE_INDEXES.
+    
+    A one-off migration for databases created before those indexes existed;
+    run explicitly, never at startup.
+    
+    Returns:
+        Dictionary of table name -> number of rows deleted
+    """
     engine = get_engine()
-    Session = sessionmaker(bind=engine)
-    return Session()
+    removed = {}
+    with engine.begin() as connection:
+        for table, index_name, keep in LATE_UNIQUE_INDEXES:
+            if not inspect(connection).has_table(table.name):
+                continue
+            columns = _index_columns(table, index_name)
+            result = connection.execute(text(
+                f"DELETE FROM {table.name} WHERE id NOT IN "
+                f"(SELECT {keep}(id) FROM {table.name} GROUP BY {columns})"
+            ))
+            removed[table.name] = result.rowcount
+    return removed
+
+
+_database_initialized = False
 
 
 def init_database():
-    """Initialize the database by creating all tables."""
+    """Initialize the database by creating all tables (once per process)."""
+    global _database_initialized
+    if _database_initialized:
+        return
+    
     engine = get_engine()
     Base.metadata.create_all(engine)
+    for table, index_name, _ in LATE_UNIQUE_INDEXES:
+        _ensure_unique_index(engine, table, index_name)
+    
+    # create_all skips existing tables, so add indexes declared after they were created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    _database_initialized = True
     print("Database initialized successfully.")
 
 
@@ -162,5 +300,9 @@ def get_db_connection():
 
 
 if __name__ == "__main__":
+    # `--dedupe` removes rows that block the late unique indexes, reporting counts
+    if "--dedupe" in sys.argv[1:]:
+        for table_name, count in dedupe_late_unique_indexes().items():
+            print(f"Removed {count} duplicate rows from {table_name}")
     init_database()
 
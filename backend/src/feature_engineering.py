@@ -2,188 +2,463 @@
 Feature engineering module for NBA Predictor.
 Handles ELO calculation and feature set creation.
 """
+import math
+import threading
+import time
 import pandas as pd
 import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from src.database import get_session, Game, Team, TeamBoxScore
+from sqlalchemy import and_, case, delete, func, insert, select, update
+from src.database import get_session, Game, Team, TeamBoxScore, TeamDailyFeatures
 from src.config import (
     ELO_INITIAL, ELO_K_FACTOR, ELO_HOME_ADVANTAGE, ROLLING_WINDOW
 )
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Rolling-average features, in feature column order
+ROLLING_AVERAGE_KEYS = (
+    'avg_pts_scored', 'avg_pts_allowed', 'avg_fg_pct', 'avg_tov',
+    'avg_plus_minus', 'avg_rebounds', 'avg_assists'
+)
+
+# Rolling box score stats: feature suffix -> TeamBoxScore column
+ROLLING_STAT_COLUMNS = {
+    'avg_pts_scored': 'pts',
+    'avg_fg_pct': 'fg_pct',
+    'avg_tov': 'tov',
+    'avg_plus_minus': 'plus_minus',
+    'avg_rebounds': 'trb',
+    'avg_assists': 'ast',
+}
+
+# Dates become day numbers shifted to be non-negative, so (group, day) pairs
+# pack into one sortable int64 key: group * DAY_KEY_SPAN + day
+DAY_KEY_OFFSET = 1 << 19
+DAY_KEY_SPAN = 1 << 20
+
+# Low-cardinality integer columns of the feature set, stored as int16
+FEATURE_SET_INT16_COLUMNS = ('team_id', 'opponent_id', 'season')
+
+# 10 ** (x / 400) == exp(x * ELO_EXP_SCALE); exp is cheaper than generic pow
+ELO_EXP_SCALE = math.log(10) / 400.0
+
+# Nullable game columns, read as float64 so NULLs become NaN even when a
+# column holds only NULLs
+GAME_FLOAT_COLUMNS = ('home_score', 'away_score', 'home_team_pregame_elo', 'away_team_pregame_elo')
+
+# Per-team prediction features are cached in-process for this long
+FEATURE_CACHE_TTL_SECONDS = 3600
+FEATURE_CACHE_MAXSIZE = 1024
+
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire `ttl` seconds after being set."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+    
+    def get(self, key, default=None):
+        """Return the cached value for `key`, or `default` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+    
+    def set(self, key, value):
+        """Cache `value`, evicting the oldest entry when full."""
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+    
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+# (team_id, date, window) -> rolling averages, and team_id -> current ELO
+rolling_averages_cache = TTLCache(FEATURE_CACHE_MAXSIZE, FEATURE_CACHE_TTL_SECONDS)
+current_elo_cache = TTLCache(FEATURE_CACHE_MAXSIZE, FEATURE_CACHE_TTL_SECONDS)
+
+
+def clear_feature_caches():
+    """Invalidate cached prediction features after games, scores or ELOs change."""
+    rolling_averages_cache.clear()
+    current_elo_cache.clear()
 
 
 def calculate_elo_ratings(db: Session):
     """
     Calculate ELO ratings for all teams chronologically.
     Updates games table with pre-game ELO ratings.
+    
+    Games are read as columns in one query, the ELO recurrence runs over
+    plain arrays, and only the pre-game ratings that changed are written
+    back with a single bulk UPDATE keyed on game_id.
     """
     print("Calculating ELO ratings...")
     
-    # Initialize ELO dictionary
-    elo_ratings: Dict[int, float] = {}
+    # Get all games ordered by date
+    games = pd.read_sql(
+        select(
+            Game.game_id, Game.home_team_id, Game.away_team_id,
+            Game.home_score, Game.away_score,
+            Game.home_team_pregame_elo, Game.away_team_pregame_elo
+        ).order_by(Game.date, Game.game_id),
+        db.connection(),
+        dtype=dict.fromkeys(GAME_FLOAT_COLUMNS, 'float64')
+    )
     
-    # Get all teams and initialize ELO
-    teams = db.query(Team).all()
-    for team in teams:
-        elo_ratings[team.team_id] = ELO_INITIAL
+    if games.empty:
+        print("Updated ELO ratings for 0 games.")
+        return
     
-    # Get all games ordered by date
-    games = db.query(Game).order_by(Game.date, Game.game_id).all()
+    home_ids = games['home_team_id'].to_numpy()
+    away_ids = games['away_team_id'].to_numpy()
+    home_scores = games['home_score'].to_numpy(dtype=np.float64)
+    away_scores = games['away_score'].to_numpy(dtype=np.float64)
     
-    updated_count = 0
-    for game in games:
-        home_team_id = game.home_team_id
-        away_team_id = game.away_team_id
-        
-        # Get current ELO ratings
+    # Actual result: 1 if home wins, 0 if away wins, 0.5 for a tie (rare in NBA)
+    completed = ~(np.isnan(home_scores) | np.isnan(away_scores))
+    actual_home_scores = np.select(
+        [home_scores > away_scores, home_scores < away_scores], [1.0, 0.0], 0.5
+    )
+    
+    # Every team starts at the initial rating, indexed by team_id
+    elo_ratings = np.full(int(max(home_ids.max(), away_ids.max())) + 1, float(ELO_INITIAL)).tolist()
+    home_pregame = []
+    away_pregame = []
+    
+    # The recurrence is sequential; iterate plain Python lists for speed
+    for home_team_id, away_team_id, is_completed, actual_home_score in zip(
+        home_ids.tolist(), away_ids.tolist(), completed.tolist(), actual_home_scores.tolist()
+    ):
+        # Get current ELO ratings and store them as pre-game ELOs
         home_elo = elo_ratings[home_team_id]
         away_elo = elo_ratings[away_team_id]
-        
-        # Store pre-game ELOs
-        game.home_team_pregame_elo = home_elo
-        game.away_team_pregame_elo = away_elo
-        
-        # Calculate expected win probability
-        # Add home advantage to home team ELO
-        home_elo_with_advantage = home_elo + ELO_HOME_ADVANTAGE
-        
-        # Expected win probability for home team
-        expected_home_win = 1 / (1 + 10 ** ((away_elo - home_elo_with_advantage) / 400))
-        expected_away_win = 1 - expected_home_win
+        home_pregame.append(home_elo)
+        away_pregame.append(away_elo)
         
         # Update ELO if game result is available
-        if game.home_score is not None and game.away_score is not None:
-            # Actual result: 1 if home wins, 0 if away wins
-            if game.home_score > game.away_score:
-                actual_home_score = 1.0
-                actual_away_score = 0.0
-            elif game.home_score < game.away_score:
-                actual_home_score = 0.0
-                actual_away_score = 1.0
-            else:
-                # Tie (rare in NBA)
-                actual_home_score = 0.5
-                actual_away_score = 0.5
+        if is_completed:
+            # Expected win probability for home team, with home advantage
+            expected_home_win = 1.0 / (1.0 + math.exp((away_elo - (home_elo + ELO_HOME_ADVANTAGE)) * ELO_EXP_SCALE))
+            expected_away_win = 1 - expected_home_win
             
-            # Update ELO ratings
-            home_elo_change = ELO_K_FACTOR * (actual_home_score - expected_home_win)
-            away_elo_change = ELO_K_FACTOR * (actual_away_score - expected_away_win)
-            
-            elo_ratings[home_team_id] = home_elo + home_elo_change
-            elo_ratings[away_team_id] = away_elo + away_elo_change
-        
-        updated_count += 1
+            elo_ratings[home_team_id] = home_elo + ELO_K_FACTOR * (actual_home_score - expected_home_win)
+            elo_ratings[away_team_id] = away_elo + ELO_K_FACTOR * ((1 - actual_home_score) - expected_away_win)
     
-    # Commit all ELO updates
-    db.commit()
-    print(f"Updated ELO ratings for {updated_count} games.")
+    # Skip rows whose stored ELOs already match, so reruns only touch new games
+    changed = (
+        (games['home_team_pregame_elo'].to_numpy(dtype=np.float64) != np.asarray(home_pregame))
+        | (games['away_team_pregame_elo'].to_numpy(dtype=np.float64) != np.asarray(away_pregame))
+    )
+    changed_idx = np.flatnonzero(changed).tolist()
+    
+    # Write changed pre-game ELOs in one executemany UPDATE by primary key
+    if changed_idx:
+        game_ids = games['game_id'].tolist()
+        db.execute(update(Game), [
+            {
+                'game_id': game_ids[i],
+                'home_team_pregame_elo': home_pregame[i],
+                'away_team_pregame_elo': away_pregame[i],
+            }
+            for i in changed_idx
+        ])
+        db.commit()
+        clear_feature_caches()
+    
+    print(f"Updated ELO ratings for {len(games)} games.")
 
 
-def get_rolling_averages(
+def get_rolling_averages_batch(
     db: Session,
-    team_id: int,
+    team_ids: Iterable[int],
     game_date: datetime.date,
     window: int = ROLLING_WINDOW
-) -> Dict[str, float]:
+) -> Dict[int, Dict[str, float]]:
     """
-    Calculate rolling averages for a team up to (but not including) a specific game date.
+    Rolling averages for several teams before a date, in one query.
+    
+    Each team's last `window` completed box scores are ranked with a
+    ROW_NUMBER window and averaged per team in SQLite. Results are cached
+    per (team, date, window) in rolling_averages_cache, and only uncached
+    teams are queried.
     
     Returns:
-        Dictionary with rolling average statistics
+        Dictionary of team_id -> ROLLING_AVERAGE_KEYS statistics (0.0 without history)
     """
-    # Get team's box scores before the game date
-    box_scores = db.query(TeamBoxScore).join(Game).filter(
-        TeamBoxScore.team_id == team_id,
+    averages = {}
+    missing = []
+    for team_id in set(team_ids):
+        cached = rolling_averages_cache.get((team_id, game_date, window))
+        if cached is None:
+            missing.append(team_id)
+        else:
+            averages[team_id] = cached
+    if not missing:
+        return averages
+    
+    ranked = select(
+        TeamBoxScore.team_id, TeamBoxScore.pts, TeamBoxScore.fg_pct, TeamBoxScore.tov,
+        TeamBoxScore.plus_minus, TeamBoxScore.trb, TeamBoxScore.ast,
+        # Points allowed are the opponent's score
+        func.coalesce(
+            case((TeamBoxScore.is_home, Game.away_score), else_=Game.home_score), 0
+        ).label('pts_allowed'),
+        func.row_number().over(
+            partition_by=TeamBoxScore.team_id, order_by=Game.date.desc()
+        ).label('recency')
+    ).join(Game).where(
+        TeamBoxScore.team_id.in_(missing),
         Game.date < game_date,
         Game.home_score.isnot(None)  # Only completed games
-    ).order_by(Game.date.desc()).limit(window).all()
-    
-    if not box_scores:
-        # Return default values if no history
-        return {
-            'avg_pts_scored': 0.0,
-            'avg_pts_allowed': 0.0,
-            'avg_fg_pct': 0.0,
-            'avg_tov': 0.0,
-            'avg_plus_minus': 0.0,
-            'avg_rebounds': 0.0,
-            'avg_assists': 0.0
-        }
-    
-    # Calculate averages
-    total_pts = sum(bs.pts for bs in box_scores)
-    total_fg_pct = sum(bs.fg_pct for bs in box_scores)
-    total_tov = sum(bs.tov for bs in box_scores)
-    total_plus_minus = sum(bs.plus_minus for bs in box_scores)
-    total_rebounds = sum(bs.trb for bs in box_scores)
-    total_assists = sum(bs.ast for bs in box_scores)
-    
-    n = len(box_scores)
-    
-    # Calculate points allowed (need to get opponent scores)
-    total_pts_allowed = 0
-    for bs in box_scores:
-        game = bs.game
-        if bs.is_home:
-            total_pts_allowed += game.away_score or 0
-        else:
-            total_pts_allowed += game.home_score or 0
+    ).subquery()
+    
+    rows = db.execute(
+        select(
+            ranked.c.team_id,
+            func.avg(ranked.c.pts),
+            func.avg(ranked.c.pts_allowed),
+            func.avg(ranked.c.fg_pct),
+            func.avg(ranked.c.tov),
+            func.avg(ranked.c.plus_minus),
+            func.avg(ranked.c.trb),
+            func.avg(ranked.c.ast)
+        ).where(ranked.c.recency <= window).group_by(ranked.c.team_id)
+    ).all()
+    
+    # Teams without history get the default zeros
+    fresh = {team_id: dict.fromkeys(ROLLING_AVERAGE_KEYS, 0.0) for team_id in missing}
+    for team_id, *values in rows:
+        fresh[team_id] = {key: float(value) for key, value in zip(ROLLING_AVERAGE_KEYS, values)}
+    for team_id, stats in fresh.items():
+        rolling_averages_cache.set((team_id, game_date, window), stats)
+    averages.update(fresh)
+    return averages
+
+
+def get_h2h_win_pcts_batch(
+    db: Session,
+    matchups: Iterable[Tuple[int, int]],
+    game_date: datetime.date
+) -> Dict[Tuple[int, int], float]:
+    """
+    Head-to-head win percentages for several (team, opponent) pairs, in one query.
+    
+    Returns:
+        Dictionary of (team_id, opponent_id) -> win percentage (0.5 if no history)
+    """
+    matchups = list(matchups)
+    team_ids = {team_id for matchup in matchups for team_id in matchup}
+    
+    # Meetings and wins per (home, away) orientation among the requested teams
+    rows = db.execute(
+        select(
+            Game.home_team_id,
+            Game.away_team_id,
+            func.count(),
+            func.sum(case((Game.home_score > Game.away_score, 1), else_=0)),
+            func.sum(case((Game.away_score > Game.home_score, 1), else_=0))
+        ).where(
+            Game.home_team_id.in_(team_ids),
+            Game.away_team_id.in_(team_ids),
+            Game.date < game_date,
+            Game.home_score.isnot(None)
+        ).group_by(Game.home_team_id, Game.away_team_id)
+    ).all()
+    meetings = {(home, away): (count, home_wins, away_wins) for home, away, count, home_wins, away_wins in rows}
+    
+    win_pcts = {}
+    for team_id, opponent_id in matchups:
+        as_home = meetings.get((team_id, opponent_id), (0, 0, 0))
+        as_away = meetings.get((opponent_id, team_id), (0, 0, 0))
+        games = as_home[0] + as_away[0]
+        wins = as_home[1] + as_away[2]
+        win_pcts[(team_id, opponent_id)] = wins / games if games > 0 else 0.5
+    return win_pcts
+
+
+def get_days_rest_batch(db: Session, team_ids: Iterable[int], game_date: datetime.date) -> Dict[int, int]:
+    """
+    Days since each team's last completed game, in one query.
+    
+    Returns:
+        Dictionary of team_id -> days of rest (3 if no history)
+    """
+    team_ids = list(set(team_ids))
+    last_dates = dict(db.execute(
+        select(TeamBoxScore.team_id, func.max(Game.date)).join(Game).where(
+            TeamBoxScore.team_id.in_(team_ids),
+            Game.date < game_date,
+            Game.home_score.isnot(None)
+        ).group_by(TeamBoxScore.team_id)
+    ).all())
     
     return {
-        'avg_pts_scored': total_pts / n if n > 0 else 0.0,
-        'avg_pts_allowed': total_pts_allowed / n if n > 0 else 0.0,
-        'avg_fg_pct': total_fg_pct / n if n > 0 else 0.0,
-        'avg_tov': total_tov / n if n > 0 else 0.0,
-        'avg_plus_minus': total_plus_minus / n if n > 0 else 0.0,
-        'avg_rebounds': total_rebounds / n if n > 0 else 0.0,
-        'avg_assists': total_assists / n if n > 0 else 0.0
+        team_id: max(0, (game_date - last_dates[team_id]).days) if team_id in last_dates else 3
+        for team_id in team_ids
     }
 
 
-def get_h2h_win_pct(db: Session, team_id: int, opponent_id: int, game_date: datetime.date) -> float:
+def _day_numbers(dates: pd.Series) -> np.ndarray:
+    """Convert a date column to non-negative int64 day numbers."""
+    days = pd.to_datetime(dates).to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return days + DAY_KEY_OFFSET
+
+
+def _prior_positions(sorted_keys: np.ndarray, groups: np.ndarray, days: np.ndarray):
     """
-    Calculate head-to-head win percentage for team_id vs opponent_id before game_date.
+    Locate each query's strictly-earlier rows in (group, day)-sorted data.
+    
+    Args:
+        sorted_keys: Sorted group * DAY_KEY_SPAN + day keys of the data rows
+        groups: Query group ids
+        days: Query day numbers
+    
+    Returns:
+        (start, end) arrays: the query's group occupies rows from `start`,
+        and rows [start, end) are the ones dated before the query day
     """
-    # Get all previous games between these teams
-    games = db.query(Game).filter(
-        ((Game.home_team_id == team_id) & (Game.away_team_id == opponent_id)) |
-        ((Game.home_team_id == opponent_id) & (Game.away_team_id == team_id)),
-        Game.date < game_date,
-        Game.home_score.isnot(None)
-    ).all()
+    group_keys = groups.astype(np.int64) * DAY_KEY_SPAN
+    start = np.searchsorted(sorted_keys, group_keys, side='left')
+    end = np.searchsorted(sorted_keys, group_keys + days, side='left')
+    return start, end
+
+
+def _rolling_team_features(box_scores: pd.DataFrame, team_ids: np.ndarray, days: np.ndarray, window: int) -> pd.DataFrame:
+    """
+    Average each team's last `window` box scores before the given days.
     
-    if not games:
-        return 0.5  # Default to 50% if no history
+    Answers every (team, day) query at once using prefix sums over box
+    scores sorted by team and date.
     
-    wins = 0
-    for game in games:
-        if game.home_score is None or game.away_score is None:
-            continue
-        
-        if (game.home_team_id == team_id and game.home_score > game.away_score) or \
-           (game.away_team_id == team_id and game.away_score > game.home_score):
-            wins += 1
+    Args:
+        box_scores: Completed-game box scores with team_id, day, pts_allowed
+            and the ROLLING_STAT_COLUMNS stats
+        team_ids: Query team ids
+        days: Query day numbers
+        window: Number of prior games to average
     
-    return wins / len(games) if len(games) > 0 else 0.5
+    Returns:
+        DataFrame of avg_* features, one row per query (0.0 without history)
+    """
+    box_scores = box_scores.sort_values(['team_id', 'day'], kind='stable')
+    keys = box_scores['team_id'].to_numpy(dtype=np.int64) * DAY_KEY_SPAN + box_scores['day'].to_numpy()
+    start, end = _prior_positions(keys, team_ids, days)
+    first = np.maximum(start, end - window)
+    counts = end - first
+    
+    features = {}
+    stat_columns = dict(ROLLING_STAT_COLUMNS, avg_pts_allowed='pts_allowed')
+    for feature, column in stat_columns.items():
+        prefix = np.concatenate(([0.0], np.cumsum(box_scores[column].to_numpy(dtype=np.float64))))
+        totals = prefix[end] - prefix[first]
+        features[feature] = np.divide(totals, counts, out=np.zeros(len(counts)), where=counts > 0)
+    
+    return pd.DataFrame(features)[list(ROLLING_AVERAGE_KEYS)]
 
 
-def get_days_rest(db: Session, team_id: int, game_date: datetime.date) -> int:
+def _days_rest(box_scores: pd.DataFrame, team_ids: np.ndarray, days: np.ndarray) -> np.ndarray:
     """
-    Calculate days since last game for a team.
+    Days since each team's previous completed game.
+    
+    Returns:
+        int64 array, 3 where a team has no earlier game
     """
-    last_game = db.query(Game).join(TeamBoxScore).filter(
-        TeamBoxScore.team_id == team_id,
-        Game.date < game_date,
-        Game.home_score.isnot(None)
-    ).order_by(Game.date.desc()).first()
+    keys = np.sort(box_scores['team_id'].to_numpy(dtype=np.int64) * DAY_KEY_SPAN + box_scores['day'].to_numpy())
+    start, end = _prior_positions(keys, team_ids, days)
+    has_history = end > start
+    last_days = keys[np.maximum(end - 1, 0)] % DAY_KEY_SPAN
+    return np.where(has_history, np.maximum(days - last_days, 0), 3)
+
+
+def _h2h_win_pcts(games: pd.DataFrame, home_ids: np.ndarray, away_ids: np.ndarray, days: np.ndarray):
+    """
+    Head-to-head win percentages before each game.
+    
+    Args:
+        games: Completed games with home_team_id, away_team_id, home_score,
+            away_score and day
+        home_ids: Query home team ids
+        away_ids: Query away team ids
+        days: Query day numbers
+    
+    Returns:
+        (home, away) win percentage arrays, 0.5 where the teams haven't met
+    """
+    pair_span = int(max(games['home_team_id'].max(), games['away_team_id'].max(),
+                        home_ids.max(), away_ids.max())) + 1
+    
+    # Canonical matchup key: (lower team id, higher team id)
+    game_home = games['home_team_id'].to_numpy(dtype=np.int64)
+    game_away = games['away_team_id'].to_numpy(dtype=np.int64)
+    low = np.minimum(game_home, game_away)
+    pair = low * pair_span + np.maximum(game_home, game_away)
+    
+    home_scores = games['home_score'].to_numpy(dtype=np.float64)
+    away_scores = games['away_score'].to_numpy(dtype=np.float64)
+    low_won = np.where(game_home == low, home_scores > away_scores, away_scores > home_scores)
+    high_won = np.where(game_home == low, away_scores > home_scores, home_scores > away_scores)
     
-    if not last_game:
-        return 3  # Default to 3 days if no history
+    order = np.lexsort((games['day'].to_numpy(), pair))
+    keys = pair[order] * DAY_KEY_SPAN + games['day'].to_numpy()[order]
+    low_wins = np.concatenate(([0], np.cumsum(low_won[order])))
+    high_wins = np.concatenate(([0], np.cumsum(high_won[order])))
     
-    days_rest = (game_date - last_game.date).days
-    return max(0, days_rest)  # Ensure non-negative
+    query_low = np.minimum(home_ids, away_ids)
+    query_pair = query_low * pair_span + np.maximum(home_ids, away_ids)
+    start, end = _prior_positions(keys, query_pair, days)
+    meetings = end - start
+    home_is_low = home_ids == query_low
+    low_total = low_wins[end] - low_wins[start]
+    high_total = high_wins[end] - high_wins[start]
+    
+    def win_pct(wins):
+        return np.divide(wins, meetings, out=np.full(len(meetings), 0.5), where=meetings > 0)
+    
+    home_pct = win_pct(np.where(home_is_low, low_total, high_total))
+    away_pct = win_pct(np.where(home_is_low, high_total, low_total))
+    return home_pct, away_pct
+
+
+def _load_box_scores(connection) -> pd.DataFrame:
+    """
+    Load completed-game box scores for the vectorized feature helpers.
+    
+    Returns:
+        DataFrame with team_id, is_home, the ROLLING_STAT_COLUMNS stats
+        (missing as 0), pts_allowed, date and day number
+    """
+    box_scores = pd.read_sql(
+        select(
+            TeamBoxScore.team_id, TeamBoxScore.is_home,
+            *(getattr(TeamBoxScore, column) for column in ROLLING_STAT_COLUMNS.values()),
+            Game.date, Game.home_score, Game.away_score
+        ).join(Game).where(Game.home_score.isnot(None)),
+        connection,
+        dtype=dict.fromkeys((*ROLLING_STAT_COLUMNS.values(), 'home_score', 'away_score'), 'float64')
+    )
+    box_scores[list(ROLLING_STAT_COLUMNS.values())] = box_scores[list(ROLLING_STAT_COLUMNS.values())].fillna(0)
+    # Points allowed are the opponent's score
+    box_scores['pts_allowed'] = np.where(
+        box_scores['is_home'].astype(bool), box_scores['away_score'], box_scores['home_score']
+    )
+    box_scores['pts_allowed'] = box_scores['pts_allowed'].fillna(0)
+    box_scores['day'] = _day_numbers(box_scores['date'])
+    return box_scores
 
 
 def create_feature_set(db: Session, season_filter: Optional[int] = None) -> pd.DataFrame:
@@ -191,6 +466,10 @@ def create_feature_set(db: Session, season_filter: Optional[int] = None) -> pd.D
     Create the complete feature set for training.
     One row = one team's perspective of one game.
     
+    Completed games and their box scores are loaded in two queries; rolling
+    form, head-to-head and rest features are then computed for every game
+    at once rather than with per-game queries.
+    
     Args:
         db: Database session
         season_filter: Optional season to filter by (None = all seasons)
@@ -199,127 +478,193 @@ def create_feature_set(db: Session, season_filter: Optional[int] = None) -> pd.D
         DataFrame with features and targets
     """
     print("Creating feature set...")
+    connection = db.connection()
     
-    # Get all completed games
-    query = db.query(Game).filter(Game.home_score.isnot(None))
+    # Get all completed games (history for H2H spans every season)
+    all_games = pd.read_sql(
+        select(
+            Game.game_id, Game.date, Game.season, Game.home_team_id, Game.away_team_id,
+            Game.home_score, Game.away_score,
+            Game.home_team_pregame_elo, Game.away_team_pregame_elo
+        ).where(Game.home_score.isnot(None)).order_by(Game.date),
+        connection,
+        dtype=dict.fromkeys(GAME_FLOAT_COLUMNS, 'float64')
+    )
+    
+    games = all_games[all_games['away_score'].notna()]
     if season_filter:
-        query = query.filter(Game.season == season_filter)
+        games = games[games['season'] == season_filter]
     
-    games = query.order_by(Game.date).all()
+    if games.empty:
+        print("Created feature set with 0 rows.")
+        return pd.DataFrame()
     
-    rows = []
+    box_scores = _load_box_scores(connection)
+    all_games = all_games.assign(day=_day_numbers(all_games['date']))
     
-    for game in games:
-        if game.home_score is None or game.away_score is None:
-            continue
-        
-        # Determine winner
-        home_won = 1 if game.home_score > game.away_score else 0
-        win_margin = game.home_score - game.away_score
-        
-        # Get ELO ratings (should be pre-calculated)
-        home_elo = game.home_team_pregame_elo or ELO_INITIAL
-        away_elo = game.away_team_pregame_elo or ELO_INITIAL
-        
-        # Get rolling averages
-        home_rolling = get_rolling_averages(db, game.home_team_id, game.date)
-        away_rolling = get_rolling_averages(db, game.away_team_id, game.date)
-        
-        # Get H2H
-        h2h_home = get_h2h_win_pct(db, game.home_team_id, game.away_team_id, game.date)
-        h2h_away = get_h2h_win_pct(db, game.away_team_id, game.home_team_id, game.date)
-        
-        # Get rest days
-        home_rest = get_days_rest(db, game.home_team_id, game.date)
-        away_rest = get_days_rest(db, game.away_team_id, game.date)
-        
-        # Create row from home team perspective
-        home_row = {
-            'game_id': game.game_id,
-            'team_id': game.home_team_id,
-            'opponent_id': game.away_team_id,
-            'is_home': 1,
-            'target_did_win': home_won,
-            'target_win_margin': win_margin,
-            # ELO features
-            'team_elo': home_elo,
-            'opponent_elo': away_elo,
-            'elo_diff': home_elo - away_elo,
-            # Team form (rolling averages)
-            'avg_pts_scored_l10': home_rolling['avg_pts_scored'],
-            'avg_pts_allowed_l10': home_rolling['avg_pts_allowed'],
-            'avg_fg_pct_l10': home_rolling['avg_fg_pct'],
-            'avg_tov_l10': home_rolling['avg_tov'],
-            'avg_plus_minus_l10': home_rolling['avg_plus_minus'],
-            'avg_rebounds_l10': home_rolling['avg_rebounds'],
-            'avg_assists_l10': home_rolling['avg_assists'],
-            # Opponent form
-            'opp_avg_pts_scored_l10': away_rolling['avg_pts_scored'],
-            'opp_avg_pts_allowed_l10': away_rolling['avg_pts_allowed'],
-            'opp_avg_fg_pct_l10': away_rolling['avg_fg_pct'],
-            'opp_avg_tov_l10': away_rolling['avg_tov'],
-            'opp_avg_plus_minus_l10': away_rolling['avg_plus_minus'],
-            # H2H
-            'h2h_win_pct': h2h_home,
-            # Rest
-            'days_since_last_game': home_rest,
-            'opponent_days_since_last_game': away_rest,
-            'rest_advantage': home_rest - away_rest,
-            # Season
-            'season': game.season,
-            'date': game.date
-        }
-        rows.append(home_row)
-        
-        # Create row from away team perspective
-        away_row = {
-            'game_id': game.game_id,
-            'team_id': game.away_team_id,
-            'opponent_id': game.home_team_id,
-            'is_home': 0,
-            'target_did_win': 1 - home_won,
-            'target_win_margin': -win_margin,
-            # ELO features
-            'team_elo': away_elo,
-            'opponent_elo': home_elo,
-            'elo_diff': away_elo - home_elo,
-            # Team form
-            'avg_pts_scored_l10': away_rolling['avg_pts_scored'],
-            'avg_pts_allowed_l10': away_rolling['avg_pts_allowed'],
-            'avg_fg_pct_l10': away_rolling['avg_fg_pct'],
-            'avg_tov_l10': away_rolling['avg_tov'],
-            'avg_plus_minus_l10': away_rolling['avg_plus_minus'],
-            'avg_rebounds_l10': away_rolling['avg_rebounds'],
-            'avg_assists_l10': away_rolling['avg_assists'],
-            # Opponent form
-            'opp_avg_pts_scored_l10': home_rolling['avg_pts_scored'],
-            'opp_avg_pts_allowed_l10': home_rolling['avg_pts_allowed'],
-            'opp_avg_fg_pct_l10': home_rolling['avg_fg_pct'],
-            'opp_avg_tov_l10': home_rolling['avg_tov'],
-            'opp_avg_plus_minus_l10': home_rolling['avg_plus_minus'],
-            # H2H
-            'h2h_win_pct': h2h_away,
-            # Rest
-            'days_since_last_game': away_rest,
-            'opponent_days_since_last_game': home_rest,
-            'rest_advantage': away_rest - home_rest,
-            # Season
-            'season': game.season,
-            'date': game.date
-        }
-        rows.append(away_row)
-    
-    df = pd.DataFrame(rows)
+    home_ids = games['home_team_id'].to_numpy(dtype=np.int64)
+    away_ids = games['away_team_id'].to_numpy(dtype=np.int64)
+    days = _day_numbers(games['date'])
+    
+    # Home and away sides are queried together so box scores are sorted once
+    # per feature family; the first len(games) results are the home side
+    n_games = len(games)
+    team_ids = np.concatenate((home_ids, away_ids))
+    team_days = np.concatenate((days, days))
+    
+    rolling = _rolling_team_features(box_scores, team_ids, team_days, ROLLING_WINDOW)
+    home_rolling = rolling.iloc[:n_games].reset_index(drop=True)
+    away_rolling = rolling.iloc[n_games:].reset_index(drop=True)
+    h2h_home, h2h_away = _h2h_win_pcts(all_games, home_ids, away_ids, days)
+    rest = _days_rest(box_scores, team_ids, team_days)
+    home_rest, away_rest = rest[:n_games], rest[n_games:]
+    
+    # Determine winner; ELO ratings should be pre-calculated
+    home_won = (games['home_score'] > games['away_score']).astype(np.int64).to_numpy()
+    win_margin = (games['home_score'] - games['away_score']).astype(np.int64).to_numpy()
+    home_elo = games['home_team_pregame_elo'].fillna(0).replace(0, ELO_INITIAL).to_numpy(dtype=np.float64)
+    away_elo = games['away_team_pregame_elo'].fillna(0).replace(0, ELO_INITIAL).to_numpy(dtype=np.float64)
+    
+    opponent_form = ('avg_pts_scored', 'avg_pts_allowed', 'avg_fg_pct', 'avg_tov', 'avg_plus_minus')
+    
+    # Each column as (home perspective, away perspective) arrays
+    columns = {
+        'game_id': (games['game_id'].to_numpy(),) * 2,
+        'team_id': (home_ids, away_ids),
+        'opponent_id': (away_ids, home_ids),
+        'is_home': (np.ones(len(games), dtype=np.int64), np.zeros(len(games), dtype=np.int64)),
+        'target_did_win': (home_won, 1 - home_won),
+        'target_win_margin': (win_margin, -win_margin),
+        # ELO features
+        'team_elo': (home_elo, away_elo),
+        'opponent_elo': (away_elo, home_elo),
+        'elo_diff': (home_elo - away_elo, away_elo - home_elo),
+    }
+    # Team form (rolling averages)
+    for feature in home_rolling.columns:
+        columns[f'{feature}_l10'] = (home_rolling[feature].to_numpy(), away_rolling[feature].to_numpy())
+    # Opponent form
+    for feature in opponent_form:
+        columns[f'opp_{feature}_l10'] = (away_rolling[feature].to_numpy(), home_rolling[feature].to_numpy())
+    # H2H
+    columns['h2h_win_pct'] = (h2h_home, h2h_away)
+    # Rest
+    columns['days_since_last_game'] = (home_rest, away_rest)
+    columns['opponent_days_since_last_game'] = (away_rest, home_rest)
+    columns['rest_advantage'] = (home_rest - away_rest, away_rest - home_rest)
+    # Season
+    columns['season'] = (games['season'].to_numpy(),) * 2
+    columns['date'] = (games['date'].to_numpy(),) * 2
+    
+    # Interleave into preallocated buffers so each game's home row is
+    # followed by its away row; floats are stored as float32 and IDs as int16
+    data = {}
+    for name, (home_values, away_values) in columns.items():
+        dtype = np.result_type(home_values, away_values)
+        if dtype.kind == 'f':
+            dtype = np.float32
+        elif name in FEATURE_SET_INT16_COLUMNS:
+            dtype = np.int16
+        values = np.empty(2 * len(games), dtype=dtype)
+        values[0::2] = home_values
+        values[1::2] = away_values
+        data[name] = values
+    df = pd.DataFrame(data)
     print(f"Created feature set with {len(df)} rows.")
     return df
 
 
+def materialize_team_daily_features(db: Session) -> int:
+    """
+    Rebuild the team_daily_features table from completed box scores.
+    
+    Writes one row per team per day after each of its games, holding the
+    rolling averages that apply from that day on, so predictions look
+    features up instead of recomputing them. Existing rows are replaced in
+    the same transaction, so snapshots of deleted or re-dated games do not
+    survive. Run after ingestion.
+    
+    Args:
+        db: Database session
+    
+    Returns:
+        Number of rows written
+    """
+    print("Materializing team daily features...")
+    box_scores = _load_box_scores(db.connection())
+    db.execute(delete(TeamDailyFeatures))
+    if box_scores.empty:
+        db.commit()
+        print("Materialized 0 team daily features.")
+        return 0
+    
+    # Each distinct (team, game day) starts a new snapshot the following day
+    snapshots = box_scores[['team_id', 'day']].drop_duplicates()
+    team_ids = snapshots['team_id'].to_numpy(dtype=np.int64)
+    game_days = snapshots['day'].to_numpy(dtype=np.int64)
+    rolling = _rolling_team_features(box_scores, team_ids, game_days + 1, ROLLING_WINDOW)
+    
+    def to_dates(days):
+        return (days - DAY_KEY_OFFSET).astype('datetime64[D]').tolist()
+    
+    rows = pd.DataFrame({
+        'team_id': team_ids.tolist(),
+        'date': to_dates(game_days + 1),
+        'last_game_date': to_dates(game_days),
+    })
+    rows[list(ROLLING_AVERAGE_KEYS)] = rolling.to_numpy()
+    rows = rows.to_dict('records')
+    
+    db.execute(insert(TeamDailyFeatures), rows)
+    db.commit()
+    print(f"Materialized {len(rows)} team daily features.")
+    return len(rows)
+
+
+def get_team_daily_features_batch(
+    db: Session,
+    team_ids: Iterable[int],
+    game_date: datetime.date
+) -> Tuple[Dict[int, Dict[str, float]], Dict[int, int]]:
+    """
+    Look up materialized rolling averages and rest days for several teams.
+    
+    Each team's latest completed game before game_date is found and joined
+    to the snapshot taken the day after it, by primary key, in one query.
+    Teams without that snapshot (never materialized, or box scores ingested
+    since the last rebuild) are omitted, so callers can fall back to
+    get_rolling_averages_batch / get_days_rest_batch.
+    
+    Returns:
+        (team_id -> rolling averages, team_id -> days of rest)
+    """
+    latest_games = select(
+        TeamBoxScore.team_id, func.max(Game.date).label('last_game_date')
+    ).join(Game).where(
+        TeamBoxScore.team_id.in_(set(team_ids)),
+        Game.date < game_date,
+        Game.home_score.isnot(None)
+    ).group_by(TeamBoxScore.team_id).subquery()
+    
+    rows = db.execute(select(TeamDailyFeatures).join(latest_games, and_(
+        TeamDailyFeatures.team_id == latest_games.c.team_id,
+        TeamDailyFeatures.date == func.date(latest_games.c.last_game_date, '+1 day'),
+        TeamDailyFeatures.last_game_date == latest_games.c.last_game_date
+    ))).scalars().all()
+    averages = {row.team_id: {key: getattr(row, key) for key in ROLLING_AVERAGE_KEYS} for row in rows}
+    rest = {row.team_id: max(0, (game_date - row.last_game_date).days) for row in rows}
+    return averages, rest
+
+
 if __name__ == "__main__":
     db = get_session()
     try:
         # Calculate ELO ratings first
         calculate_elo_ratings(db)
         
+        # Refresh materialized prediction features
+        materialize_team_daily_features(db)
+        
         # Create feature set
         df = create_feature_set(db)
         print(f"Feature set shape: {df.shape}")
@@ -5,20 +5,50 @@ Generates predictions for upcoming games.
 import numpy as np
 import pandas as pd
 import joblib
+import operator
+from functools import lru_cache
 from pathlib import Path
+from sqlalchemy import func, or_, select, union_all
 from sqlalchemy.orm import Session
+from sklearn.pipeline import Pipeline
 from src.database import get_session, Team, Game
 from src.config import MODEL_ARTIFACTS_DIR
 from src.feature_engineering import (
-    get_rolling_averages, get_h2h_win_pct, get_days_rest,
-    ELO_INITIAL
+    get_rolling_averages_batch, get_h2h_win_pcts_batch, get_days_rest_batch,
+    get_team_daily_features_batch, current_elo_cache, ELO_INITIAL, TTLCache
 )
 from src.training import FEATURE_COLUMNS
 from datetime import datetime, date
+from typing import Dict, Iterable, List, Optional, Tuple
 
+try:
+    import onnxruntime as ort
+except ImportError:  # ONNX inference is optional; fall back to sklearn
+    ort = None
 
+try:
+    import tl2cgen
+except ImportError:  # Compiled tree inference is optional as well
+    tl2cgen = None
+
+# Pulls a feature dict's values out in training column order
+_feature_values = operator.itemgetter(*FEATURE_COLUMNS)
+
+# Predictions served for repeated API requests; kept briefly because data
+# updates and retraining happen in other processes
+PREDICTION_CACHE_TTL_SECONDS = 300
+PREDICTION_CACHE_MAXSIZE = 4096
+prediction_cache = TTLCache(PREDICTION_CACHE_MAXSIZE, PREDICTION_CACHE_TTL_SECONDS)
+
+
+@lru_cache(maxsize=1)
 def load_model_and_scaler():
-    """Load the saved model and scaler."""
+    """
+    Load the separate model and scaler saved by older training runs.
+    
+    Current training runs save only pipeline.joblib and remove these files.
+    Loaded once per process and cached; call reload_model() after retraining.
+    """
     model_path = MODEL_ARTIFACTS_DIR / "best_model.joblib"
     scaler_path = MODEL_ARTIFACTS_DIR / "data_scaler.joblib"
     
@@ -27,12 +57,97 @@ def load_model_and_scaler():
     if not scaler_path.exists():
         raise FileNotFoundError(f"Scaler not found at {scaler_path}. Please train the model first.")
     
+    # The model is stored compressed; the scaler's arrays are memory-mapped so
+    # they are paged in lazily and shared by workers
     model = joblib.load(model_path)
-    scaler = joblib.load(scaler_path)
+    scaler = joblib.load(scaler_path, mmap_mode='r')
     
     return model, scaler
 
 
+@lru_cache(maxsize=1)
+def load_pipeline() -> Pipeline:
+    """
+    Load the fitted scaler + model pipeline.
+    
+    Uses the single pipeline artifact saved by training, falling back to the
+    separate model and scaler artifacts from older training runs. Cached per
+    process like load_model_and_scaler.
+    """
+    pipeline_path = MODEL_ARTIFACTS_DIR / "pipeline.joblib"
+    if pipeline_path.exists():
+        return joblib.load(pipeline_path)
+    
+    model, scaler = load_model_and_scaler()
+    return Pipeline([('scaler', scaler), ('model', model)])
+
+
+@lru_cache(maxsize=1)
+def load_onnx_session() -> Optional["ort.InferenceSession"]:
+    """
+    Load the ONNX export of the prediction pipeline, if available.
+    
+    Returns:
+        An ONNX Runtime session, or None when onnxruntime is not installed
+        or training could not export the model
+    """
+    onnx_path = MODEL_ARTIFACTS_DIR / "model.onnx"
+    if ort is None or not onnx_path.exists():
+        return None
+    return ort.InferenceSession(str(onnx_path), providers=['CPUExecutionProvider'])
+
+
+@lru_cache(maxsize=1)
+def load_compiled_model() -> Optional["tl2cgen.Predictor"]:
+    """
+    Load the Treelite-compiled shared library of the best model, if available.
+    
+    Returns:
+        A tl2cgen predictor, or None when tl2cgen is not installed or the best
+        model is not a compiled tree ensemble
+    """
+    lib_path = MODEL_ARTIFACTS_DIR / "best_model.so"
+    if tl2cgen is None or not lib_path.exists():
+        return None
+    return tl2cgen.Predictor(str(lib_path))
+
+
+def predict_win_probabilities(feature_matrix: np.ndarray) -> np.ndarray:
+    """
+    Score feature rows with the compiled model or ONNX Runtime when
+    available, else with sklearn.
+    
+    Args:
+        feature_matrix: Rows of features in FEATURE_COLUMNS order
+    
+    Returns:
+        (n, 2) array of [loss, win] probabilities
+    """
+    predictor = load_compiled_model()
+    if predictor is not None:
+        dmat = tl2cgen.DMatrix(feature_matrix, dtype='float32')
+        win_proba = predictor.predict(dmat).reshape(len(feature_matrix), -1)[:, -1]
+        return np.column_stack([1.0 - win_proba, win_proba])
+    
+    session = load_onnx_session()
+    if session is not None:
+        inputs = {session.get_inputs()[0].name: feature_matrix.astype(np.float32)}
+        return session.run(None, inputs)[1]
+    return load_pipeline().predict_proba(feature_matrix)
+
+
+def reload_model():
+    """Drop the cached model artifacts and predictions and load the model again from disk."""
+    prediction_cache.clear()
+    load_model_and_scaler.cache_clear()
+    load_pipeline.cache_clear()
+    load_onnx_session.cache_clear()
+    load_compiled_model.cache_clear()
+    load_onnx_session()
+    load_compiled_model()
+    return load_pipeline()
+
+
 def get_team_by_name(db: Session, team_name: str) -> Team:
     """
     Get team by name or abbreviation.
@@ -51,56 +166,103 @@ def get_team_by_name(db: Session, team_name: str) -> Team:
     raise ValueError(f"Team '{team_name}' not found in database.")
 
 
-def get_current_elo(db: Session, team_id: int) -> float:
+def get_teams_by_name(db: Session, team_names: Iterable[str]) -> Dict[str, Team]:
     """
-    Get the current ELO rating for a team (from most recent game).
+    Resolve several team names or abbreviations with one query.
+    Exact name matches take precedence over abbreviation matches.
     """
-    # Get the most recent game for this team
-    recent_game = db.query(Game).filter(
-        (Game.home_team_id == team_id) | (Game.away_team_id == team_id),
-        Game.home_team_pregame_elo.isnot(None)
-    ).order_by(Game.date.desc()).first()
+    team_names = list(team_names)
+    teams = db.query(Team).filter(or_(
+        Team.team_name.in_(team_names),
+        Team.abbreviation.in_([name.upper() for name in team_names])
+    )).all()
+    by_name = {team.team_name: team for team in teams}
+    by_abbreviation = {team.abbreviation: team for team in teams}
     
-    if not recent_game:
-        return ELO_INITIAL
+    resolved = {}
+    for name in team_names:
+        team = by_name.get(name) or by_abbreviation.get(name.upper())
+        if team is None:
+            raise ValueError(f"Team '{name}' not found in database.")
+        resolved[name] = team
+    return resolved
+
+
+def get_current_elos(db: Session, team_ids: Iterable[int]) -> Dict[int, float]:
+    """
+    Current ELO ratings for several teams with one query.
     
-    # Return the ELO from the most recent game (post-game ELO would be higher)
-    # We'll use pre-game ELO and update it based on the result
-    if recent_game.home_team_id == team_id:
-        elo = recent_game.home_team_pregame_elo
-    else:
-        elo = recent_game.away_team_pregame_elo
-    
-    # If the team won, add some ELO points (approximate)
-    if recent_game.home_score is not None and recent_game.away_score is not None:
-        if (recent_game.home_team_id == team_id and recent_game.home_score > recent_game.away_score) or \
-           (recent_game.away_team_id == team_id and recent_game.away_score > recent_game.home_score):
-            # Team won, add approximate ELO gain
-            elo += 15  # Approximate gain
+    A team's rating is its pregame ELO from its most recent rated game,
+    moved 15 points up or down by that game's result when it is final.
+    
+    Ratings are cached per team in current_elo_cache; only uncached teams
+    are queried.
+    """
+    elos = {}
+    missing = []
+    for team_id in set(team_ids):
+        cached = current_elo_cache.get(team_id)
+        if cached is None:
+            missing.append(team_id)
         else:
-            # Team lost, subtract approximate ELO loss
-            elo -= 15  # Approximate loss
+            elos[team_id] = cached
+    if not missing:
+        return elos
+    
+    # One row per team appearance, ranked newest first within each team
+    appearances = union_all(*(
+        select(
+            team_column.label('team_id'), elo_column.label('elo'),
+            Game.date, (team_column == Game.home_team_id).label('is_home'),
+            Game.home_score, Game.away_score
+        ).where(team_column.in_(missing), Game.home_team_pregame_elo.isnot(None))
+        for team_column, elo_column in (
+            (Game.home_team_id, Game.home_team_pregame_elo),
+            (Game.away_team_id, Game.away_team_pregame_elo),
+        )
+    )).subquery()
+    ranked = select(
+        appearances,
+        func.row_number().over(
+            partition_by=appearances.c.team_id, order_by=appearances.c.date.desc()
+        ).label('recency')
+    ).subquery()
     
-    return elo
+    fresh = dict.fromkeys(missing, ELO_INITIAL)
+    rows = db.execute(select(ranked).where(ranked.c.recency == 1)).all()
+    for row in rows:
+        elo = row.elo
+        # Approximate the result of the most recent game: +15 for a win, -15 otherwise
+        if row.home_score is not None and row.away_score is not None:
+            team_score, opponent_score = (
+                (row.home_score, row.away_score) if row.is_home else (row.away_score, row.home_score)
+            )
+            elo += 15 if team_score > opponent_score else -15
+        fresh[row.team_id] = elo
+    for team_id, elo in fresh.items():
+        current_elo_cache.set(team_id, elo)
+    elos.update(fresh)
+    return elos
 
 
-def generate_prediction(
-    home_team_name: str,
-    away_team_name: str,
+def generate_predictions_batch(
+    matchups: List[Tuple[str, str]],
     game_date: date = None,
     db: Session = None
-) -> dict:
+) -> List[dict]:
     """
-    Generate prediction for an upcoming game.
+    Generate predictions for a slate of games at once.
+    
+    Features for every team come from one query per feature type, and all
+    games are scored with a single scaler/model call.
     
     Args:
-        home_team_name: Name or abbreviation of home team
-        away_team_name: Name or abbreviation of away team
-        game_date: Date of the game (defaults to today)
-        db: Database session (if None, creates new one)
+        matchups: (home_team_name, away_team_name) pairs
+        game_date: Date of the games (defaults to today)
+        db: Database session (if None, one is opened from the shared engine and closed)
     
     Returns:
-        Dictionary with prediction results
+        List of prediction dictionaries, in the order of `matchups`
     """
     if db is None:
         db = get_session()
@@ -109,89 +271,111 @@ def generate_prediction(
         close_db = False
     
     try:
+        if not matchups:
+            return []
+        
         if game_date is None:
             game_date = datetime.now().date()
         
-        # Load model and scaler
-        model, scaler = load_model_and_scaler()
-        
         # Get teams
-        home_team = get_team_by_name(db, home_team_name)
-        away_team = get_team_by_name(db, away_team_name)
-        
-        # Get current ELO ratings
-        home_elo = get_current_elo(db, home_team.team_id)
-        away_elo = get_current_elo(db, away_team.team_id)
-        
-        # Get rolling averages
-        home_rolling = get_rolling_averages(db, home_team.team_id, game_date)
-        away_rolling = get_rolling_averages(db, away_team.team_id, game_date)
-        
-        # Get H2H
-        h2h_home = get_h2h_win_pct(db, home_team.team_id, away_team.team_id, game_date)
-        
-        # Get rest days
-        home_rest = get_days_rest(db, home_team.team_id, game_date)
-        away_rest = get_days_rest(db, away_team.team_id, game_date)
-        
-        # Create feature vector (from home team perspective)
-        features = {
-            'is_home': 1,
-            'team_elo': home_elo,
-            'opponent_elo': away_elo,
-            'elo_diff': home_elo - away_elo,
-            'avg_pts_scored_l10': home_rolling['avg_pts_scored'],
-            'avg_pts_allowed_l10': home_rolling['avg_pts_allowed'],
-            'avg_fg_pct_l10': home_rolling['avg_fg_pct'],
-            'avg_tov_l10': home_rolling['avg_tov'],
-            'avg_plus_minus_l10': home_rolling['avg_plus_minus'],
-            'avg_rebounds_l10': home_rolling['avg_rebounds'],
-            'avg_assists_l10': home_rolling['avg_assists'],
-            'opp_avg_pts_scored_l10': away_rolling['avg_pts_scored'],
-            'opp_avg_pts_allowed_l10': away_rolling['avg_pts_allowed'],
-            'opp_avg_fg_pct_l10': away_rolling['avg_fg_pct'],
-            'opp_avg_tov_l10': away_rolling['avg_tov'],
-            'opp_avg_plus_minus_l10': away_rolling['avg_plus_minus'],
-            'h2h_win_pct': h2h_home,
-            'days_since_last_game': home_rest,
-            'opponent_days_since_last_game': away_rest,
-            'rest_advantage': home_rest - away_rest
-        }
+        teams = get_teams_by_name(db, {name for matchup in matchups for name in matchup})
+        games = [(teams[home_name], teams[away_name]) for home_name, away_name in matchups]
+        team_ids = {team.team_id for game in games for team in game}
         
-        # Convert to array in correct order
-        feature_vector = np.array([[features[col] for col in FEATURE_COLUMNS]])
+        # Get ELO ratings, rolling averages, H2H and rest days for every team at once
+        elos = get_current_elos(db, team_ids)
+        h2h = get_h2h_win_pcts_batch(
+            db, [(home.team_id, away.team_id) for home, away in games], game_date
+        )
         
-        # Scale features
-        feature_vector_scaled = scaler.transform(feature_vector)
+        # Rolling averages and rest come from materialized features when present
+        rolling, rest = get_team_daily_features_batch(db, team_ids, game_date)
+        unmaterialized = team_ids - rolling.keys()
+        if unmaterialized:
+            rolling.update(get_rolling_averages_batch(db, unmaterialized, game_date))
+            rest.update(get_days_rest_batch(db, unmaterialized, game_date))
         
-        # Get prediction
-        probabilities = model.predict_proba(feature_vector_scaled)[0]
-        home_win_prob = probabilities[1]
-        away_win_prob = probabilities[0]
+        # Create feature vectors (from home team perspective)
+        all_features = []
+        for home_team, away_team in games:
+            home_id, away_id = home_team.team_id, away_team.team_id
+            home_rolling, away_rolling = rolling[home_id], rolling[away_id]
+            all_features.append({
+                'is_home': 1,
+                'team_elo': elos[home_id],
+                'opponent_elo': elos[away_id],
+                'elo_diff': elos[home_id] - elos[away_id],
+                'avg_pts_scored_l10': home_rolling['avg_pts_scored'],
+                'avg_pts_allowed_l10': home_rolling['avg_pts_allowed'],
+                'avg_fg_pct_l10': home_rolling['avg_fg_pct'],
+                'avg_tov_l10': home_rolling['avg_tov'],
+                'avg_plus_minus_l10': home_rolling['avg_plus_minus'],
+                'avg_rebounds_l10': home_rolling['avg_rebounds'],
+                'avg_assists_l10': home_rolling['avg_assists'],
+                'opp_avg_pts_scored_l10': away_rolling['avg_pts_scored'],
+                'opp_avg_pts_allowed_l10': away_rolling['avg_pts_allowed'],
+                'opp_avg_fg_pct_l10': away_rolling['avg_fg_pct'],
+                'opp_avg_tov_l10': away_rolling['avg_tov'],
+                'opp_avg_plus_minus_l10': away_rolling['avg_plus_minus'],
+                'h2h_win_pct': h2h[(home_id, away_id)],
+                'days_since_last_game': rest[home_id],
+                'opponent_days_since_last_game': rest[away_id],
+                'rest_advantage': rest[home_id] - rest[away_id]
+            })
         
-        # Determine confidence
-        if abs(home_win_prob - 0.5) > 0.2:
-            confidence = "High"
-        elif abs(home_win_prob - 0.5) > 0.1:
-            confidence = "Medium"
-        else:
-            confidence = "Low"
+        # Stack into one matrix in the training column order, then scale and score once
+        feature_matrix = np.array([_feature_values(features) for features in all_features], dtype=np.float64)
+        probabilities = predict_win_probabilities(feature_matrix)
         
-        return {
-            'home_team': home_team.team_name,
-            'away_team': away_team.team_name,
-            'home_win_probability': float(home_win_prob),
-            'away_win_probability': float(away_win_prob),
-            'confidence': confidence,
-            'predicted_winner': home_team.team_name if home_win_prob > 0.5 else away_team.team_name,
-            'features': features  # For debugging
-        }
+        predictions = []
+        for (home_team, away_team), features, (away_win_prob, home_win_prob) in zip(
+            games, all_features, probabilities
+        ):
+            # Determine confidence
+            if abs(home_win_prob - 0.5) > 0.2:
+                confidence = "High"
+            elif abs(home_win_prob - 0.5) > 0.1:
+                confidence = "Medium"
+            else:
+                confidence = "Low"
+            
+            predictions.append({
+                'home_team': home_team.team_name,
+                'away_team': away_team.team_name,
+                'home_win_probability': float(home_win_prob),
+                'away_win_probability': float(away_win_prob),
+                'confidence': confidence,
+                'predicted_winner': home_team.team_name if home_win_prob > 0.5 else away_team.team_name,
+                'features': features  # For debugging
+            })
+        return predictions
         
     finally:
         if close_db:
             db.close()
 
 
+def generate_prediction(
+    home_team_name: str,
+    away_team_name: str,
+    game_date: date = None,
+    db: Session = None
+) -> dict:
+    """
+    Generate prediction for an upcoming game.
+    
+    Args:
+        home_team_name: Name or abbreviation of home team
+        away_team_name: Name or abbreviation of away team
+        game_date: Date of the game (defaults to today)
+        db: Database session (if None, one is opened from the shared engine and closed)
+    
+    Returns:
+        Dictionary with prediction results
+    """
+    return generate_predictions_batch([(home_team_name, away_team_name)], game_date, db)[0]
+
+
 def generate_prediction_with_value(
     home_team_name: str,
     away_team_name: str,
@@ -241,7 +425,7 @@ if __name__ == "__main__":
     # Example usage
     db = get_session()
     try:
-        result = generate_prediction("Lakers", "Warriors")
+        result = generate_prediction("Lakers", "Warriors", db=db)
         print(result)
     finally:
         db.close()
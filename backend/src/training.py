@@ -4,20 +4,52 @@ Handles data splitting, scaling, model training, and evaluation.
 """
 import pandas as pd
 import numpy as np
+import hashlib
 import joblib
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import accuracy_score, log_loss, classification_report
+from sklearn.pipeline import Pipeline
+from sklearn.metrics import classification_report
+from threadpoolctl import threadpool_limits
 import xgboost as xgb
 import lightgbm as lgb
 from src.config import (
-    MODEL_ARTIFACTS_DIR, TRAIN_SEASONS, VAL_SEASON, TEST_SEASON
+    MODEL_ARTIFACTS_DIR, TRAIN_SEASONS, VAL_SEASON, TEST_SEASON, ensure_directories,
+    ELO_INITIAL, ELO_K_FACTOR, ELO_HOME_ADVANTAGE, ROLLING_WINDOW
 )
 from src.feature_engineering import create_feature_set, calculate_elo_ratings
-from src.database import get_session
+from src.database import get_session, Game, TeamBoxScore
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
+try:
+    import lz4  # noqa: F401
+    # Boosted models are opaque byte blobs that cannot be memory-mapped, so
+    # they are stored compressed; LZ4 decompresses fast enough to be free
+    MODEL_COMPRESSION = ('lz4', 3)
+except ImportError:  # lz4 is optional; zlib is always available
+    MODEL_COMPRESSION = ('zlib', 3)
+
+
+# Candidate models are fitted in parallel processes, each limited to an
+# equal share of the physical cores available to this process (hyperthreads
+# and cores outside the CPU affinity/cgroup quota would only oversubscribe)
+MODEL_TRAINING_WORKERS = 4
+MODEL_THREADS = max(1, joblib.cpu_count(only_physical_cores=True) // MODEL_TRAINING_WORKERS)
+
+# Separate model and scaler artifacts written by older training runs;
+# pipeline.joblib replaces both
+LEGACY_ARTIFACT_NAMES = ("best_model.joblib", "data_scaler.joblib")
+
+# Built feature sets are memoized on disk, keyed on settings, feature code and data
+FEATURE_CACHE_DIR = MODEL_ARTIFACTS_DIR / "cache"
 
 # Feature columns (excluding metadata and targets)
 FEATURE_COLUMNS = [
@@ -44,6 +76,66 @@ FEATURE_COLUMNS = [
 ]
 
 
+def _feature_source_hash() -> str:
+    """SHA-1 of the feature engineering source, so code changes miss the cache."""
+    source_path = Path(__file__).with_name("feature_engineering.py")
+    return hashlib.sha1(source_path.read_bytes()).hexdigest()
+
+
+def _data_fingerprint(db: Session) -> tuple:
+    """
+    Cheap aggregates that change whenever games, scores, ELO ratings or box
+    scores change.
+    """
+    games = db.execute(select(
+        func.count(Game.game_id), func.count(Game.home_score), func.max(Game.date),
+        func.sum(Game.home_score), func.sum(Game.away_score),
+        func.sum(Game.home_team_pregame_elo), func.sum(Game.away_team_pregame_elo)
+    )).one()
+    box_scores = db.execute(select(
+        func.count(TeamBoxScore.id), func.max(TeamBoxScore.id), func.sum(TeamBoxScore.pts)
+    )).one()
+    return tuple(str(value) for value in (*games, *box_scores))
+
+
+def _cached_feature_set(db: Session, feature_config: tuple, source_hash: str, data_fingerprint: tuple) -> pd.DataFrame:
+    """Build the feature set; memoized by _feature_memory()."""
+    return create_feature_set(db)
+
+
+@lru_cache(maxsize=1)
+def _feature_memory() -> joblib.Memory:
+    """
+    On-disk cache for built feature sets.
+    
+    Created on first use rather than at import, since joblib.Memory creates
+    its cache directory when constructed.
+    """
+    ensure_directories()
+    return joblib.Memory(FEATURE_CACHE_DIR, verbose=0)
+
+
+def build_feature_set(db: Session) -> pd.DataFrame:
+    """
+    Calculate ELO ratings and create the feature set, reusing a cached build.
+    
+    ELO ratings are always brought up to date in the database. The feature
+    set is cached under FEATURE_CACHE_DIR and reused while the ELO and
+    rolling window settings, the feature engineering source and the game,
+    rating and box score data are unchanged.
+    
+    Args:
+        db: Database session
+    
+    Returns:
+        DataFrame with features and targets
+    """
+    calculate_elo_ratings(db)
+    feature_config = (ELO_INITIAL, ELO_K_FACTOR, ELO_HOME_ADVANTAGE, ROLLING_WINDOW)
+    cached_feature_set = _feature_memory().cache(_cached_feature_set, ignore=['db'])
+    return cached_feature_set(db, feature_config, _feature_source_hash(), _data_fingerprint(db))
+
+
 def split_data_temporally(features_df: pd.DataFrame):
     """
     Split data temporally by season (not randomly).
@@ -53,164 +145,382 @@ def split_data_temporally(features_df: pd.DataFrame):
     """
     print("Splitting data temporally...")
     
-    # Training set: specified seasons
-    train_df = features_df[features_df['season'].isin(TRAIN_SEASONS)].copy()
+    # Project seasons and targets to dense typed arrays once
+    seasons = features_df['season'].to_numpy()
+    y = features_df['target_did_win'].to_numpy(dtype=np.int8)
     
-    # Validation set: validation season
-    val_df = features_df[features_df['season'] == VAL_SEASON].copy()
+    # Feature rows come in date order, so seasons are normally sorted already
+    order = None
+    if not features_df['season'].is_monotonic_increasing:
+        order = np.argsort(seasons, kind='stable')
+        seasons, y = seasons[order], y[order]
     
-    # Test set: test season
-    test_df = features_df[features_df['season'] == TEST_SEASON].copy()
+    def season_rows(first_season: int, last_season: int) -> slice:
+        """Rows of the seasons first_season..last_season, as a view slice."""
+        start, end = np.searchsorted(seasons, [first_season, last_season + 1])
+        return slice(start, end)
     
-    print(f"Train set: {len(train_df)} samples ({TRAIN_SEASONS[0]}-{TRAIN_SEASONS[-1]})")
-    print(f"Validation set: {len(val_df)} samples ({VAL_SEASON})")
-    print(f"Test set: {len(test_df)} samples ({TEST_SEASON})")
+    # Training set: specified seasons (a contiguous range)
+    train_rows = season_rows(min(TRAIN_SEASONS), max(TRAIN_SEASONS))
+    
+    # Validation set: validation season
+    val_rows = season_rows(VAL_SEASON, VAL_SEASON)
     
-    # Extract features and targets
-    X_train = train_df[FEATURE_COLUMNS].values
-    y_train = train_df['target_did_win'].values
+    # Test set: test season
+    test_rows = season_rows(TEST_SEASON, TEST_SEASON)
+    
+    # Gather each feature column straight into column-major float32 buffers,
+    # one per split, so scaling and histogram binning stream unit-stride
+    # columns and no row-major copy of the whole frame is materialized
+    splits = [train_rows, val_rows, test_rows]
+    X_train, X_val, X_test = (
+        np.empty((rows.stop - rows.start, len(FEATURE_COLUMNS)), dtype=np.float32, order='F')
+        for rows in splits
+    )
+    for j, column in enumerate(FEATURE_COLUMNS):
+        values = features_df[column].to_numpy(dtype=np.float32)
+        if order is not None:
+            values = values[order]
+        for X_split, rows in zip((X_train, X_val, X_test), splits):
+            X_split[:, j] = values[rows]
     
-    X_val = val_df[FEATURE_COLUMNS].values
-    y_val = val_df['target_did_win'].values
+    # Extract targets
+    y_train, y_val, y_test = y[train_rows], y[val_rows], y[test_rows]
     
-    X_test = test_df[FEATURE_COLUMNS].values
-    y_test = test_df['target_did_win'].values
+    print(f"Train set: {len(X_train)} samples ({TRAIN_SEASONS[0]}-{TRAIN_SEASONS[-1]})")
+    print(f"Validation set: {len(X_val)} samples ({VAL_SEASON})")
+    print(f"Test set: {len(X_test)} samples ({TEST_SEASON})")
     
     return X_train, y_train, X_val, y_val, X_test, y_test
 
 
-def scale_data(X_train, X_val, X_test):
+def save_artifact(obj, path: Path, compress=0):
     """
-    Scale features using StandardScaler.
-    Fit only on training data, transform all sets.
+    Save a joblib artifact by writing a temporary file and renaming it.
     
-    Returns:
-        X_train_scaled, X_val_scaled, X_test_scaled, scaler
+    Running API and prediction processes may be loading artifacts, so they
+    are replaced atomically rather than truncated in place.
+    
+    Args:
+        obj: Object to save
+        path: Destination path
+        compress: joblib compression setting (0 for none)
     """
-    print("Scaling data...")
+    tmp_path = path.with_name(path.name + ".tmp")
+    joblib.dump(obj, tmp_path, compress=compress, protocol=5)
+    os.replace(tmp_path, path)
+
+
+def export_onnx(pipeline: Pipeline, onnx_path: Path) -> bool:
+    """
+    Export the prediction pipeline to ONNX for faster CPU inference.
     
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_val_scaled = scaler.transform(X_val)
-    X_test_scaled = scaler.transform(X_test)
+    Export is best-effort: skl2onnx is optional and cannot convert every
+    model type, in which case any stale export is removed so prediction
+    falls back to the joblib pipeline.
     
-    # Save scaler
-    scaler_path = MODEL_ARTIFACTS_DIR / "data_scaler.joblib"
-    joblib.dump(scaler, scaler_path)
-    print(f"Scaler saved to {scaler_path}")
+    Returns:
+        True if the model was exported
+    """
+    try:
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+        
+        initial_types = [('X', FloatTensorType([None, len(FEATURE_COLUMNS)]))]
+        onnx_model = convert_sklearn(
+            pipeline,
+            initial_types=initial_types,
+            options={id(pipeline.steps[-1][1]): {'zipmap': False}}
+        )
+    except Exception as e:
+        onnx_path.unlink(missing_ok=True)
+        print(f"ONNX export skipped: {e}")
+        return False
     
-    return X_train_scaled, X_val_scaled, X_test_scaled, scaler
+    onnx_path.write_bytes(onnx_model.SerializeToString())
+    return True
 
 
-def train_models(X_train, y_train, X_val, y_val):
+def export_treelite(model, lib_path: Path) -> bool:
     """
-    Train multiple models and select the best one.
+    Compile a boosted tree model to a shared library with Treelite.
+    
+    The library traverses the exact trees of the trained model in generated
+    C code, avoiding the per-call overhead of the XGBoost/LightGBM predict
+    paths. Export is best-effort like export_onnx: treelite and tl2cgen are
+    optional and only XGBoost/LightGBM models can be compiled, otherwise any
+    stale library is removed.
     
     Returns:
-        best_model, best_model_name, results_dict
+        True if the model was compiled
     """
-    print("Training models...")
-    
-    models = {}
-    results = {}
-    
-    # Model 1: Logistic Regression (Baseline)
-    print("Training Logistic Regression...")
-    lr_model = LogisticRegression(max_iter=1000, random_state=42)
-    lr_model.fit(X_train, y_train)
+    try:
+        import treelite
+        import tl2cgen
+        
+        if isinstance(model, xgb.XGBClassifier):
+            tl_model = treelite.frontend.from_xgboost(model.get_booster())
+        elif isinstance(model, lgb.LGBMClassifier):
+            tl_model = treelite.frontend.from_lightgbm(model.booster_)
+        else:
+            raise TypeError(f"{type(model).__name__} is not a supported tree ensemble")
+        
+        # Prediction may have the current library loaded, so compile next to
+        # it and swap it in atomically
+        tmp_path = lib_path.with_name(lib_path.stem + ".tmp" + lib_path.suffix)
+        tl2cgen.export_lib(
+            tl_model,
+            toolchain='gcc',
+            libpath=str(tmp_path),
+            params={'parallel_comp': os.cpu_count() or 1},
+            verbose=False
+        )
+    except Exception as e:
+        lib_path.unlink(missing_ok=True)
+        print(f"Treelite export skipped: {e}")
+        return False
     
-    lr_val_pred = lr_model.predict(X_val)
-    lr_val_proba = lr_model.predict_proba(X_val)
-    lr_acc = accuracy_score(y_val, lr_val_pred)
-    lr_logloss = log_loss(y_val, lr_val_proba)
+    os.replace(tmp_path, lib_path)
+    return True
+
+
+def _limit_worker_threads():
+    """Cap BLAS/OpenMP threads in a training worker to its share of the cores."""
+    threadpool_limits(MODEL_THREADS)
+
+
+@lru_cache(maxsize=1)
+def _has_cuda() -> bool:
+    """Whether a CUDA GPU is available for XGBoost/LightGBM training."""
+    try:
+        import cupy
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except ImportError:
+        pass
+    except Exception:
+        return False
+    
+    # Without CuPy, ask the driver whether any GPU is present
+    if shutil.which("nvidia-smi") is None:
+        return False
+    try:
+        listing = subprocess.run(
+            ["nvidia-smi", "-L"], capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return listing.returncode == 0 and "GPU" in listing.stdout
+
+
+def _predict_with_proba(model, X):
+    """
+    Class probabilities and predicted classes from a single ensemble pass.
     
-    models['logistic_regression'] = lr_model
-    results['logistic_regression'] = {
-        'accuracy': lr_acc,
-        'log_loss': lr_logloss
-    }
-    print(f"  Accuracy: {lr_acc:.4f}, Log Loss: {lr_logloss:.4f}")
+    The class is the argmax of the probabilities, which is what predict()
+    would recompute with a second traversal. XGBoost's sklearn wrapper
+    already stops at best_iteration after early stopping.
     
-    # Model 2: Random Forest
-    print("Training Random Forest...")
-    rf_model = RandomForestClassifier(
-        n_estimators=100,
-        max_depth=10,
-        random_state=42,
-        n_jobs=-1
-    )
-    rf_model.fit(X_train, y_train)
+    Returns:
+        (y_pred, y_proba)
+    """
+    y_proba = model.predict_proba(X)
+    y_pred = model.classes_[np.argmax(y_proba, axis=1)]
+    return y_pred, y_proba
+
+
+def _binary_log_loss(y_true: np.ndarray, y_proba: np.ndarray) -> float:
+    """
+    Log loss of [loss, win] probabilities against 0/1 targets.
     
-    rf_val_pred = rf_model.predict(X_val)
-    rf_val_proba = rf_model.predict_proba(X_val)
-    rf_acc = accuracy_score(y_val, rf_val_pred)
-    rf_logloss = log_loss(y_val, rf_val_proba)
+    Same result as sklearn's log_loss (clipped at the probabilities' machine
+    epsilon), but only gathers the probability of each observed outcome in
+    one pass instead of binarizing the labels and summing both columns.
+    """
+    eps = np.finfo(y_proba.dtype).eps
+    p_true = np.take_along_axis(y_proba, y_true.astype(np.intp)[:, None], axis=1)
+    return float(-np.log(np.clip(p_true, eps, 1 - eps)).mean())
+
+
+def _binary_class_report(y_true: np.ndarray, y_pred: np.ndarray) -> str:
+    """
+    Per-class precision, recall, F1 and support for 0/1 predictions.
     
-    models['random_forest'] = rf_model
-    results['random_forest'] = {
-        'accuracy': rf_acc,
-        'log_loss': rf_logloss
+    Derived from a 2x2 confusion matrix built with one bincount, instead of
+    sklearn's classification_report machinery.
+    """
+    cm = np.bincount(
+        2 * y_true.astype(np.int64) + y_pred.astype(np.int64), minlength=4
+    ).reshape(2, 2)
+    
+    lines = [f"{'':>12}{'precision':>10}{'recall':>10}{'f1-score':>10}{'support':>10}"]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for cls in (0, 1):
+            tp = cm[cls, cls]
+            precision = np.nan_to_num(tp / cm[:, cls].sum())
+            recall = np.nan_to_num(tp / cm[cls, :].sum())
+            f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+            lines.append(f"{cls:>12}{precision:>10.2f}{recall:>10.2f}{f1:>10.2f}{cm[cls, :].sum():>10}")
+    return "\n".join(lines)
+
+
+def _validation_metrics(model, X_val, y_val) -> dict:
+    """Accuracy and log loss of a fitted model on the validation set."""
+    y_pred, y_proba = _predict_with_proba(model, X_val)
+    return {
+        'accuracy': float(np.mean(y_pred == y_val)),
+        'log_loss': _binary_log_loss(y_val, y_proba)
     }
-    print(f"  Accuracy: {rf_acc:.4f}, Log Loss: {rf_logloss:.4f}")
+
+
+def fit_logistic_regression(X_train, y_train, X_val, y_val):
+    """
+    Fit the logistic regression baseline.
     
-    # Model 3: XGBoost
-    print("Training XGBoost...")
-    xgb_model = xgb.XGBClassifier(
-        n_estimators=200,
+    Only this model needs standardized features (tree models are invariant to
+    per-feature scaling), so the scaler is fitted as part of its pipeline.
+    """
+    model = Pipeline([
+        ('scaler', StandardScaler()),
+        ('model', LogisticRegression(max_iter=1000, random_state=42))
+    ])
+    model.fit(X_train, y_train)
+    return 'logistic_regression', model, {'log_loss': _binary_log_loss(y_val, model.predict_proba(X_val))}
+
+
+def fit_hist_gradient_boosting(X_train, y_train, X_val, y_val):
+    """Fit sklearn's histogram gradient boosting, early-stopped on validation."""
+    model = HistGradientBoostingClassifier(
+        max_iter=200,
         max_depth=6,
         learning_rate=0.1,
-        random_state=42,
-        eval_metric='logloss'
-    )
-    xgb_model.fit(
-        X_train, y_train,
-        eval_set=[(X_val, y_val)],
-        early_stopping_rounds=20,
-        verbose=False
+        early_stopping=True,
+        n_iter_no_change=20,
+        random_state=42
     )
-    
-    xgb_val_pred = xgb_model.predict(X_val)
-    xgb_val_proba = xgb_model.predict_proba(X_val)
-    xgb_acc = accuracy_score(y_val, xgb_val_pred)
-    xgb_logloss = log_loss(y_val, xgb_val_proba)
-    
-    models['xgboost'] = xgb_model
-    results['xgboost'] = {
-        'accuracy': xgb_acc,
-        'log_loss': xgb_logloss
-    }
-    print(f"  Accuracy: {xgb_acc:.4f}, Log Loss: {xgb_logloss:.4f}")
-    
-    # Model 4: LightGBM
-    print("Training LightGBM...")
-    lgb_model = lgb.LGBMClassifier(
+    model.fit(X_train, y_train, X_val=X_val, y_val=y_val)
+    # validation_score_ holds the negated validation loss after each iteration
+    return 'hist_gradient_boosting', model, {'log_loss': -float(model.validation_score_[-1])}
+
+
+def fit_xgboost(X_train, y_train, X_val, y_val):
+    """Fit XGBoost, early-stopped on validation (on the GPU when available)."""
+    use_cuda = _has_cuda() and xgb.build_info().get('USE_CUDA', False)
+    model = xgb.XGBClassifier(
         n_estimators=200,
         max_depth=6,
         learning_rate=0.1,
         random_state=42,
-        verbose=-1
+        eval_metric='logloss',
+        early_stopping_rounds=20,
+        tree_method='hist',
+        device='cuda' if use_cuda else 'cpu',
+        n_jobs=MODEL_THREADS
     )
-    lgb_model.fit(
+    model.fit(
         X_train, y_train,
         eval_set=[(X_val, y_val)],
-        callbacks=[lgb.early_stopping(stopping_rounds=20), lgb.log_evaluation(0)]
+        verbose=False
     )
+    # Log loss recorded by eval_metric at the iteration predictions will use
+    val_logloss = model.evals_result()['validation_0']['logloss'][model.best_iteration]
+    return 'xgboost', model, {'log_loss': float(val_logloss)}
+
+
+def fit_lightgbm(X_train, y_train, X_val, y_val):
+    """Fit LightGBM, early-stopped on validation (on the GPU when available)."""
+    def fit(device: str):
+        model = lgb.LGBMClassifier(
+            n_estimators=200,
+            max_depth=6,
+            learning_rate=0.1,
+            random_state=42,
+            n_jobs=MODEL_THREADS,
+            device=device,
+            gpu_use_dp=False,
+            verbose=-1
+        )
+        model.fit(
+            X_train, y_train,
+            eval_set=[(X_val, y_val)],
+            callbacks=[lgb.early_stopping(stopping_rounds=20), lgb.log_evaluation(0)]
+        )
+        return model
+    
+    if _has_cuda():
+        try:
+            model = fit('gpu')
+        except lgb.basic.LightGBMError as e:
+            # LightGBM builds without GPU support reject device='gpu'
+            print(f"LightGBM GPU training unavailable, using CPU: {e}")
+            model = fit('cpu')
+    else:
+        model = fit('cpu')
+    # Log loss recorded on the validation set at the best iteration
+    return 'lightgbm', model, {'log_loss': float(model.best_score_['valid_0']['binary_logloss'])}
+
+
+# Candidate models, fitted concurrently by train_models
+MODEL_FITTERS = (fit_logistic_regression, fit_xgboost, fit_lightgbm)
+
+# Candidates only fitted when none of MODEL_FITTERS reaches the log-loss floor;
+# sklearn's histogram boosting rarely beats LightGBM, which uses the same method
+SLOW_MODEL_FITTERS = (fit_hist_gradient_boosting,)
+
+# Validation log loss at which the best candidate so far is good enough to
+# skip SLOW_MODEL_FITTERS
+MODEL_LOG_LOSS_FLOOR = 0.65
+
+
+def train_models(X_train, y_train, X_val, y_val):
+    """
+    Train multiple models and select the best one.
     
-    lgb_val_pred = lgb_model.predict(X_val)
-    lgb_val_proba = lgb_model.predict_proba(X_val)
-    lgb_acc = accuracy_score(y_val, lgb_val_pred)
-    lgb_logloss = log_loss(y_val, lgb_val_proba)
+    Each candidate is fitted in its own worker process, with threads split
+    between workers so the concurrent fits don't oversubscribe the CPUs.
+    SLOW_MODEL_FITTERS only run if no other candidate reaches
+    MODEL_LOG_LOSS_FLOOR; skipped candidates are recorded in the results as
+    {'skipped': True}. Every candidate takes unscaled features. Boosted
+    models report the validation log loss recorded during early stopping, so
+    only the selected model is run over the validation set again (for
+    accuracy).
     
-    models['lightgbm'] = lgb_model
-    results['lightgbm'] = {
-        'accuracy': lgb_acc,
-        'log_loss': lgb_logloss
-    }
-    print(f"  Accuracy: {lgb_acc:.4f}, Log Loss: {lgb_logloss:.4f}")
+    Returns:
+        best_model, best_model_name, results_dict
+    """
+    print("Training models...")
+    
+    models = {}
+    results = {}
     
-    # Select best model (lowest log loss)
-    best_model_name = min(results.keys(), key=lambda k: results[k]['log_loss'])
+    with ProcessPoolExecutor(
+        max_workers=MODEL_TRAINING_WORKERS, initializer=_limit_worker_threads
+    ) as executor:
+        best_model_name = None
+        for fitters in (MODEL_FITTERS, SLOW_MODEL_FITTERS):
+            # Skip the slower candidates once a fitted model is good enough
+            if best_model_name is not None and results[best_model_name]['log_loss'] <= MODEL_LOG_LOSS_FLOOR:
+                for fit in fitters:
+                    name = fit.__name__.removeprefix('fit_')
+                    results[name] = {'skipped': True}
+                    print(f"Skipped {name} (best log loss already <= {MODEL_LOG_LOSS_FLOOR})")
+                break
+            
+            futures = [
+                executor.submit(fit, X_train, y_train, X_val, y_val) for fit in fitters
+            ]
+            # Collect fits in order, tracking the lowest validation log loss
+            for future in futures:
+                name, model, metrics = future.result()
+                models[name] = model
+                results[name] = metrics
+                print(f"Trained {name}")
+                print(f"  Log Loss: {metrics['log_loss']:.4f}")
+                if best_model_name is None or metrics['log_loss'] < results[best_model_name]['log_loss']:
+                    best_model_name = name
+    
+    # Only the selected model is run over the validation set for accuracy
     best_model = models[best_model_name]
+    results[best_model_name] = _validation_metrics(best_model, X_val, y_val)
     
     print(f"\nBest model: {best_model_name}")
     print(f"  Validation Accuracy: {results[best_model_name]['accuracy']:.4f}")
@@ -219,22 +529,28 @@ def train_models(X_train, y_train, X_val, y_val):
     return best_model, best_model_name, results
 
 
-def evaluate_model(model, X_test, y_test, model_name: str = "Model"):
+def evaluate_model(model, X_test, y_test, model_name: str = "Model", verbose: bool = False):
     """
     Evaluate model on test set and print metrics.
+    
+    Args:
+        verbose: Print sklearn's full classification report (with averages)
+            instead of the per-class summary
     """
     print(f"\nEvaluating {model_name} on test set...")
     
-    y_pred = model.predict(X_test)
-    y_proba = model.predict_proba(X_test)
+    y_pred, y_proba = _predict_with_proba(model, X_test)
     
-    acc = accuracy_score(y_test, y_pred)
-    logloss = log_loss(y_test, y_proba)
+    acc = float(np.mean(y_pred == y_test))
+    logloss = _binary_log_loss(y_test, y_proba)
     
     print(f"Test Accuracy: {acc:.4f}")
     print(f"Test Log Loss: {logloss:.4f}")
     print("\nClassification Report:")
-    print(classification_report(y_test, y_pred))
+    if verbose:
+        print(classification_report(y_test, y_pred))
+    else:
+        print(_binary_class_report(y_test, y_pred))
     
     return {
         'accuracy': acc,
@@ -247,13 +563,11 @@ def evaluate_model(model, X_test, y_test, model_name: str = "Model"):
 def train_pipeline():
     """
     Complete training pipeline:
-    1. Calculate ELO ratings
-    2. Create feature set
+    1-2. Calculate ELO ratings and create feature set (cached on disk)
     3. Split data temporally
-    4. Scale data
-    5. Train models
-    6. Evaluate best model
-    7. Save best model
+    4. Train models (logistic regression scales its own inputs)
+    5. Evaluate best model
+    6. Save best model and prediction pipeline
     """
     print("=" * 60)
     print("NBA Predictor - Model Training Pipeline")
@@ -261,42 +575,51 @@ def train_pipeline():
     
     db = get_session()
     try:
-        # Step 1: Calculate ELO ratings
-        print("\n[Step 1/6] Calculating ELO ratings...")
-        calculate_elo_ratings(db)
-        
-        # Step 2: Create feature set
-        print("\n[Step 2/6] Creating feature set...")
-        features_df = create_feature_set(db)
+        # Steps 1-2: Calculate ELO ratings and create feature set, reusing a
+        # cached build when neither the data nor the feature code changed
+        print("\n[Step 1-2/5] Calculating ELO ratings and creating feature set...")
+        features_df = build_feature_set(db)
+        print(f"Feature set: {len(features_df)} rows")
         
         # Step 3: Split data
-        print("\n[Step 3/6] Splitting data temporally...")
+        print("\n[Step 3/5] Splitting data temporally...")
         X_train, y_train, X_val, y_val, X_test, y_test = split_data_temporally(features_df)
         
-        # Step 4: Scale data
-        print("\n[Step 4/6] Scaling data...")
-        X_train_scaled, X_val_scaled, X_test_scaled, scaler = scale_data(
-            X_train, X_val, X_test
-        )
-        
-        # Step 5: Train models
-        print("\n[Step 5/6] Training models...")
+        # Step 4: Train models
+        print("\n[Step 4/5] Training models...")
         best_model, best_model_name, results = train_models(
-            X_train_scaled, y_train, X_val_scaled, y_val
+            X_train, y_train, X_val, y_val
         )
         
-        # Step 6: Evaluate and save
-        print("\n[Step 6/6] Evaluating best model and saving...")
-        test_results = evaluate_model(best_model, X_test_scaled, y_test, best_model_name)
+        # Step 5: Evaluate and save
+        print("\n[Step 5/5] Evaluating best model and saving...")
+        test_results = evaluate_model(best_model, X_test, y_test, best_model_name)
+        
+        # Save the best model as one pipeline artifact (any scaling included)
+        ensure_directories()
+        pipeline_path = MODEL_ARTIFACTS_DIR / "pipeline.joblib"
+        pipeline = best_model if isinstance(best_model, Pipeline) else Pipeline([('model', best_model)])
+        save_artifact(pipeline, pipeline_path, compress=MODEL_COMPRESSION)
+        print(f"\nPrediction pipeline saved to {pipeline_path}")
+        
+        # Remove the separate model + scaler artifacts of older training runs
+        # so they can never be paired with this model
+        for legacy_name in LEGACY_ARTIFACT_NAMES:
+            (MODEL_ARTIFACTS_DIR / legacy_name).unlink(missing_ok=True)
+        
+        # Export the pipeline to ONNX when the model type supports it
+        onnx_path = MODEL_ARTIFACTS_DIR / "model.onnx"
+        if export_onnx(pipeline, onnx_path):
+            print(f"ONNX model saved to {onnx_path}")
         
-        # Save best model
-        model_path = MODEL_ARTIFACTS_DIR / "best_model.joblib"
-        joblib.dump(best_model, model_path)
-        print(f"\nBest model saved to {model_path}")
+        # Compile tree ensembles to a native library for inference
+        lib_path = MODEL_ARTIFACTS_DIR / "best_model.so"
+        if export_treelite(best_model, lib_path):
+            print(f"Compiled model saved to {lib_path}")
         
         # Save feature columns for prediction
         feature_cols_path = MODEL_ARTIFACTS_DIR / "feature_columns.joblib"
-        joblib.dump(FEATURE_COLUMNS, feature_cols_path)
+        save_artifact(FEATURE_COLUMNS, feature_cols_path)
         print(f"Feature columns saved to {feature_cols_path}")
         
         print("\n" + "=" * 60)
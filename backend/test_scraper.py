@@ -4,6 +4,7 @@ Test script to check what data we can actually scrape.
 from basketball_reference_scraper.box_scores import get_box_scores
 from basketball_reference_scraper.teams import get_team_stats
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 print("=" * 60)
@@ -11,12 +12,18 @@ print("Testing Basketball Reference Scraper")
 print("=" * 60)
 print()
 
+# Both scrapes are independent HTTP round-trips, so run them concurrently and
+# report the results in order once they arrive
+with ThreadPoolExecutor(max_workers=2) as executor:
+    # Try a recent game date
+    test_date = '2024-01-15'
+    box_score_future = executor.submit(get_box_scores, test_date, 'LAL', 'GSW')
+    team_stats_future = executor.submit(get_team_stats, 'LAL', 2024)
+
 # Test 1: Box Scores
 print("Test 1: Scraping a recent box score...")
 try:
-    # Try a recent game date
-    test_date = '2024-01-15'
-    df = get_box_scores(test_date, 'LAL', 'GSW')
+    df = box_score_future.result()
     if isinstance(df, pd.DataFrame) and not df.empty:
         print(f"✓ Success! Box score shape: {df.shape}")
         print(f"  Columns: {df.columns.tolist()}")
@@ -32,7 +39,7 @@ print()
 # Test 2: Team Stats
 print("Test 2: Scraping team stats...")
 try:
-    stats = get_team_stats('LAL', 2024)
+    stats = team_stats_future.result()
     if stats is not None:
         if isinstance(stats, pd.DataFrame):
             print(f"✓ Success! Stats shape: {stats.shape}")
@@ -49,4 +56,3 @@ except Exception as e:
 
 print()
 print("=" * 60)
-
@@ -0,0 +1,75 @@
+"""
+Shared fixtures: an in-memory SQLite database with a small, deterministic
+league of teams, games and box scores.
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database import Base, Team, Game, TeamBoxScore
+
+NUM_TEAMS = 10
+NUM_DAYS = 90
+GAMES_PER_DAY = 3
+FIRST_GAME_DATE = date(2023, 10, 24)
+
+
+@pytest.fixture
+def session():
+    """Empty in-memory database session."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def league(session):
+    """
+    Session populated with one season of games.
+    
+    Each team plays at most once a day, so "last N games" is unambiguous.
+    A few games are unplayed (no scores), tied, or have no box scores, and
+    the last days fall into the next season.
+    """
+    rng = random.Random(7)
+    for team_id in range(1, NUM_TEAMS + 1):
+        session.add(Team(team_id=team_id, team_name=f"Team {team_id}", abbreviation=f"T{team_id:02d}"))
+    
+    for day in range(NUM_DAYS):
+        game_date = FIRST_GAME_DATE + timedelta(days=day)
+        teams = rng.sample(range(1, NUM_TEAMS + 1), 2 * GAMES_PER_DAY)
+        for slot in range(GAMES_PER_DAY):
+            home_id, away_id = teams[2 * slot], teams[2 * slot + 1]
+            game_id = f"{game_date.isoformat()}-T{home_id:02d}-T{away_id:02d}"
+            
+            played = day < NUM_DAYS - 5 or rng.random() < 0.3
+            home_score = rng.randint(90, 130) if played else None
+            away_score = (home_score if rng.random() < 0.02 else rng.randint(90, 130)) if played else None
+            session.add(Game(
+                game_id=game_id, date=game_date, home_team_id=home_id, away_team_id=away_id,
+                home_score=home_score, away_score=away_score,
+                season=2024 if day < NUM_DAYS - 20 else 2025,
+            ))
+            
+            if not played or rng.random() < 0.05:
+                continue
+            for team_id, is_home, points in ((home_id, True, home_score), (away_id, False, away_score)):
+                session.add(TeamBoxScore(
+                    game_id=game_id, team_id=team_id, is_home=is_home, pts=points,
+                    fg_pct=round(rng.uniform(0.38, 0.56), 3), tov=rng.randint(6, 20),
+                    plus_minus=(home_score - away_score) * (1 if is_home else -1),
+                    trb=rng.randint(35, 55), ast=rng.randint(18, 32),
+                ))
+    session.commit()
+    return session
@@ -0,0 +1,116 @@
+"""
+Regression tests for the vectorized profitability simulation.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import insert
+
+import src.backtesting as backtesting
+from src.backtesting import run_profitability_simulation
+from src.database import Game, Odds
+from src.training import FEATURE_COLUMNS
+
+
+class FixedProbabilityModel:
+    """Stand-in model returning preset win probabilities in row order."""
+    
+    def __init__(self, win_proba):
+        self.win_proba = np.asarray(win_proba, dtype=np.float64)
+    
+    def predict_proba(self, X):
+        assert len(X) == len(self.win_proba)
+        return np.column_stack([1 - self.win_proba, self.win_proba])
+
+
+def reference_simulation(features_df, win_proba, odds, test_season, edge_threshold, bet_amount):
+    """Bets placed by the original row-by-row loop, as (game_id, team_id, profit)."""
+    test_df = features_df[features_df['season'] == test_season]
+    bets = []
+    for (_, row), model_prob in zip(test_df.iterrows(), win_proba):
+        if row['game_id'] not in odds:
+            continue
+        home_ml, away_ml = odds[row['game_id']]
+        moneyline = home_ml if row['is_home'] else away_ml
+        if moneyline is None:
+            continue
+        
+        if moneyline > 0:
+            implied_prob = 100 / (moneyline + 100)
+            payout = bet_amount * (1 + moneyline / 100)
+        else:
+            implied_prob = abs(moneyline) / (abs(moneyline) + 100)
+            payout = bet_amount * (1 + 100 / abs(moneyline))
+        if model_prob - implied_prob > edge_threshold:
+            profit = payout - bet_amount if row['target_did_win'] == 1 else -bet_amount
+            bets.append((row['game_id'], row['team_id'], profit))
+    return bets
+
+
+@pytest.fixture
+def odds_league(session, monkeypatch, tmp_path):
+    """Session with 40 two-row games, moneylines for most of them, and a features frame."""
+    rng = np.random.default_rng(3)
+    rows = []
+    odds_rows = []
+    odds = {}
+    for k in range(40):
+        game_id = f"g{k:03d}"
+        season = 2024 if k < 30 else 2023
+        session.add(Game(game_id=game_id, date=pd.Timestamp("2024-01-01").date(), home_team_id=1,
+                         away_team_id=2, home_score=100, away_score=90, season=season))
+        home_won = int(rng.random() < 0.5)
+        for team_id, is_home, won in ((1, 1, home_won), (2, 0, 1 - home_won)):
+            rows.append({'game_id': game_id, 'team_id': team_id, 'opponent_id': 3 - team_id,
+                         'is_home': is_home, 'target_did_win': won, 'season': season})
+        
+        if k % 7 == 6:
+            continue  # No odds for this game
+        home_ml = int(rng.choice([-250, -150, -110, 105, 140, 220]))
+        away_ml = None if k % 11 == 0 else int(rng.choice([-200, -120, 110, 160, 300]))
+        odds_rows.append({'game_id': game_id, 'bookmaker': "book",
+                          'home_team_moneyline': home_ml, 'away_team_moneyline': away_ml})
+        odds[game_id] = (home_ml, away_ml)
+    session.commit()
+    # Core insert, as ingestion does: the ORM cannot read back fetched_at's
+    # server default (a timestamp) into its Date column on SQLite
+    session.execute(insert(Odds), odds_rows)
+    session.commit()
+    
+    features_df = pd.DataFrame(rows)
+    for column in FEATURE_COLUMNS:
+        features_df[column] = rng.normal(size=len(features_df))
+    
+    monkeypatch.setattr(backtesting, "get_session", lambda: session)
+    monkeypatch.setattr(backtesting, "MODEL_ARTIFACTS_DIR", tmp_path)
+    return features_df, odds
+
+
+def test_run_profitability_simulation_matches_reference(odds_league):
+    features_df, odds = odds_league
+    n_test = int((features_df['season'] == 2024).sum())
+    win_proba = np.random.default_rng(5).uniform(0.2, 0.9, size=n_test)
+    
+    results = run_profitability_simulation(
+        FixedProbabilityModel(win_proba), features_df,
+        test_season=2024, edge_threshold=0.03, bet_amount=100.0
+    )
+    expected = reference_simulation(features_df, win_proba, odds, 2024, 0.03, 100.0)
+    
+    assert expected, "fixture should produce some bets"
+    placed = [(bet['game_id'], bet['team_id'], bet['profit']) for bet in results['bets_placed']]
+    assert [bet[:2] for bet in placed] == [bet[:2] for bet in expected]
+    np.testing.assert_allclose([bet[2] for bet in placed], [bet[2] for bet in expected], rtol=1e-12)
+    
+    total_profit = sum(bet[2] for bet in expected)
+    total_won = sum(1 for bet in expected if bet[2] > 0)
+    assert results['total_bets'] == len(expected)
+    assert results['total_won'] == total_won
+    assert results['total_lost'] == len(expected) - total_won
+    assert results['total_profit'] == pytest.approx(total_profit)
+    assert results['roi'] == pytest.approx(total_profit / (len(expected) * 100.0) * 100)
+
+
+def test_run_profitability_simulation_without_test_rows(odds_league):
+    features_df, _ = odds_league
+    assert run_profitability_simulation(FixedProbabilityModel([]), features_df, test_season=1999) is None
@@ -0,0 +1,82 @@
+"""
+Regression tests for the bulk odds upsert.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+import src.data_ingestion as data_ingestion
+from src.data_ingestion import DataIngestor
+from src.database import Game, Odds
+
+
+@pytest.fixture
+def ingestor(session):
+    """DataIngestor bound to the test session, without HTTP or team setup."""
+    for k in range(3):
+        session.add(Game(game_id=f"g{k}", date=date(2024, 1, 1), home_team_id=1,
+                         away_team_id=2, season=2024))
+    session.commit()
+    
+    ingestor = DataIngestor.__new__(DataIngestor)
+    ingestor.session = session
+    return ingestor
+
+
+def _odds_row(game_id, bookmaker, home_ml, away_ml, total=None):
+    return {
+        'game_id': game_id, 'bookmaker': bookmaker,
+        'home_team_moneyline': home_ml, 'away_team_moneyline': away_ml,
+        'over_under_total': total,
+    }
+
+
+def _stored_odds(session):
+    rows = session.execute(select(
+        Odds.game_id, Odds.bookmaker, Odds.home_team_moneyline,
+        Odds.away_team_moneyline, Odds.over_under_total
+    )).all()
+    return {(game_id, bookmaker): tuple(values) for game_id, bookmaker, *values in rows}
+
+
+def test_upsert_odds_inserts_and_updates_on_conflict(ingestor):
+    ingestor._upsert_odds([
+        _odds_row("g0", "book_a", -150, 130, 220.5),
+        _odds_row("g0", "book_b", -140, 120, 221.0),
+        _odds_row("g1", "book_a", 110, -130, 215.0),
+    ])
+    ingestor.session.commit()
+    
+    # Same (game, bookmaker) keys update in place; new keys insert
+    ingestor._upsert_odds([
+        _odds_row("g0", "book_a", -160, 140, None),
+        _odds_row("g2", "book_a", -105, -115, 230.0),
+    ])
+    ingestor.session.commit()
+    
+    assert _stored_odds(ingestor.session) == {
+        ("g0", "book_a"): (-160, 140, None),
+        ("g0", "book_b"): (-140, 120, 221.0),
+        ("g1", "book_a"): (110, -130, 215.0),
+        ("g2", "book_a"): (-105, -115, 230.0),
+    }
+    assert ingestor.session.query(Odds.id).count() == 4
+
+
+def test_upsert_odds_spans_multiple_statements(ingestor, monkeypatch):
+    # Force several INSERT chunks; later rows for a key must win
+    monkeypatch.setattr(data_ingestion, "SQLITE_MAX_VARIABLES", 10)
+    rows = [_odds_row(f"g{k % 3}", f"book_{k % 4}", -100 - k, 100 + k) for k in range(24)]
+    ingestor._upsert_odds(rows)
+    ingestor.session.commit()
+    
+    expected = {}
+    for row in rows:
+        expected[(row['game_id'], row['bookmaker'])] = (row['home_team_moneyline'], row['away_team_moneyline'], None)
+    assert _stored_odds(ingestor.session) == expected
+
+
+def test_upsert_odds_ignores_empty_batch(ingestor):
+    ingestor._upsert_odds([])
+    assert ingestor.session.query(Odds.id).count() == 0
@@ -0,0 +1,210 @@
+"""
+Regression tests for the vectorized ELO and feature set builders.
+
+The reference helpers below are the original per-game queries the
+vectorized code replaced; the fast paths must keep producing their results.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import select
+
+from src.config import ELO_INITIAL, ELO_K_FACTOR, ELO_HOME_ADVANTAGE, ROLLING_WINDOW
+from src.database import Game, Team, TeamBoxScore
+from src.feature_engineering import (
+    calculate_elo_ratings, create_feature_set, get_rolling_averages_batch,
+    get_h2h_win_pcts_batch, get_days_rest_batch, clear_feature_caches
+)
+from src.training import FEATURE_COLUMNS
+
+
+def reference_elo_ratings(db):
+    """Pre-game ELO ratings from the original per-game loop, keyed by game_id."""
+    elo_ratings = {team.team_id: ELO_INITIAL for team in db.query(Team).all()}
+    pregame = {}
+    for game in db.query(Game).order_by(Game.date, Game.game_id).all():
+        home_elo = elo_ratings[game.home_team_id]
+        away_elo = elo_ratings[game.away_team_id]
+        pregame[game.game_id] = (home_elo, away_elo)
+        
+        expected_home_win = 1 / (1 + 10 ** ((away_elo - (home_elo + ELO_HOME_ADVANTAGE)) / 400))
+        if game.home_score is not None and game.away_score is not None:
+            if game.home_score > game.away_score:
+                actual_home_score = 1.0
+            elif game.home_score < game.away_score:
+                actual_home_score = 0.0
+            else:
+                actual_home_score = 0.5
+            elo_ratings[game.home_team_id] = home_elo + ELO_K_FACTOR * (actual_home_score - expected_home_win)
+            elo_ratings[game.away_team_id] = away_elo + ELO_K_FACTOR * ((1 - actual_home_score) - (1 - expected_home_win))
+    return pregame
+
+
+def reference_rolling_averages(db, team_id, game_date, window=ROLLING_WINDOW):
+    """Rolling averages over a team's last `window` completed box scores."""
+    box_scores = db.query(TeamBoxScore).join(Game).filter(
+        TeamBoxScore.team_id == team_id,
+        Game.date < game_date,
+        Game.home_score.isnot(None)
+    ).order_by(Game.date.desc()).limit(window).all()
+    
+    keys = ('avg_pts_scored', 'avg_pts_allowed', 'avg_fg_pct', 'avg_tov',
+            'avg_plus_minus', 'avg_rebounds', 'avg_assists')
+    if not box_scores:
+        return dict.fromkeys(keys, 0.0)
+    
+    n = len(box_scores)
+    pts_allowed = sum(
+        (bs.game.away_score if bs.is_home else bs.game.home_score) or 0 for bs in box_scores
+    )
+    return dict(zip(keys, (
+        sum(bs.pts for bs in box_scores) / n,
+        pts_allowed / n,
+        sum(bs.fg_pct for bs in box_scores) / n,
+        sum(bs.tov for bs in box_scores) / n,
+        sum(bs.plus_minus for bs in box_scores) / n,
+        sum(bs.trb for bs in box_scores) / n,
+        sum(bs.ast for bs in box_scores) / n,
+    )))
+
+
+def reference_h2h_win_pct(db, team_id, opponent_id, game_date):
+    """Share of earlier completed meetings that team_id won (0.5 if none)."""
+    games = db.query(Game).filter(
+        ((Game.home_team_id == team_id) & (Game.away_team_id == opponent_id)) |
+        ((Game.home_team_id == opponent_id) & (Game.away_team_id == team_id)),
+        Game.date < game_date,
+        Game.home_score.isnot(None)
+    ).all()
+    if not games:
+        return 0.5
+    wins = sum(
+        1 for game in games
+        if (game.home_team_id == team_id and game.home_score > game.away_score)
+        or (game.away_team_id == team_id and game.away_score > game.home_score)
+    )
+    return wins / len(games)
+
+
+def reference_days_rest(db, team_id, game_date):
+    """Days since the team's previous completed game with a box score (3 if none)."""
+    last_game = db.query(Game).join(TeamBoxScore).filter(
+        TeamBoxScore.team_id == team_id,
+        Game.date < game_date,
+        Game.home_score.isnot(None)
+    ).order_by(Game.date.desc()).first()
+    if not last_game:
+        return 3
+    return max(0, (game_date - last_game.date).days)
+
+
+def reference_feature_rows(db, game):
+    """Home and away feature rows for one game, built with the per-game helpers."""
+    home_won = 1 if game.home_score > game.away_score else 0
+    home_elo = game.home_team_pregame_elo or ELO_INITIAL
+    away_elo = game.away_team_pregame_elo or ELO_INITIAL
+    rolling = {
+        team_id: reference_rolling_averages(db, team_id, game.date)
+        for team_id in (game.home_team_id, game.away_team_id)
+    }
+    rest = {
+        team_id: reference_days_rest(db, team_id, game.date)
+        for team_id in (game.home_team_id, game.away_team_id)
+    }
+    
+    rows = []
+    for team_id, opponent_id, is_home, team_elo, opponent_elo in (
+        (game.home_team_id, game.away_team_id, 1, home_elo, away_elo),
+        (game.away_team_id, game.home_team_id, 0, away_elo, home_elo),
+    ):
+        row = {
+            'game_id': game.game_id,
+            'team_id': team_id,
+            'opponent_id': opponent_id,
+            'is_home': is_home,
+            'target_did_win': home_won if is_home else 1 - home_won,
+            'team_elo': team_elo,
+            'opponent_elo': opponent_elo,
+            'elo_diff': team_elo - opponent_elo,
+            'h2h_win_pct': reference_h2h_win_pct(db, team_id, opponent_id, game.date),
+            'days_since_last_game': rest[team_id],
+            'opponent_days_since_last_game': rest[opponent_id],
+            'rest_advantage': rest[team_id] - rest[opponent_id],
+            'season': game.season,
+        }
+        for key, value in rolling[team_id].items():
+            row[f'{key}_l10'] = value
+        for key in ('avg_pts_scored', 'avg_pts_allowed', 'avg_fg_pct', 'avg_tov', 'avg_plus_minus'):
+            row[f'opp_{key}_l10'] = rolling[opponent_id][key]
+        rows.append(row)
+    return rows
+
+
+def test_calculate_elo_ratings_matches_reference(league):
+    expected = reference_elo_ratings(league)
+    
+    calculate_elo_ratings(league)
+    stored = league.execute(select(
+        Game.game_id, Game.home_team_pregame_elo, Game.away_team_pregame_elo
+    )).all()
+    
+    assert len(stored) == len(expected)
+    for game_id, home_elo, away_elo in stored:
+        assert home_elo == pytest.approx(expected[game_id][0], rel=1e-12)
+        assert away_elo == pytest.approx(expected[game_id][1], rel=1e-12)
+
+
+def test_calculate_elo_ratings_rerun_is_stable(league):
+    calculate_elo_ratings(league)
+    first = league.execute(select(Game.game_id, Game.home_team_pregame_elo)).all()
+    
+    calculate_elo_ratings(league)
+    assert league.execute(select(Game.game_id, Game.home_team_pregame_elo)).all() == first
+
+
+@pytest.mark.parametrize("season_filter", [None, 2025])
+def test_create_feature_set_matches_per_game_helpers(league, season_filter):
+    calculate_elo_ratings(league)
+    features = create_feature_set(league, season_filter)
+    
+    query = league.query(Game).filter(Game.home_score.isnot(None), Game.away_score.isnot(None))
+    if season_filter:
+        query = query.filter(Game.season == season_filter)
+    games = query.order_by(Game.date, Game.game_id).all()
+    expected = pd.DataFrame([row for game in games for row in reference_feature_rows(league, game)])
+    
+    assert set(FEATURE_COLUMNS) <= set(features.columns)
+    assert len(features) == len(expected)
+    
+    # Both builders emit games in date order; align rows within a day by key
+    keys = ['game_id', 'team_id']
+    features = features.sort_values(keys, kind='stable').reset_index(drop=True)
+    expected = expected.sort_values(keys, kind='stable').reset_index(drop=True)
+    assert features['game_id'].tolist() == expected['game_id'].tolist()
+    
+    for column in expected.columns.drop('game_id'):
+        np.testing.assert_allclose(
+            features[column].to_numpy(dtype=np.float64),
+            expected[column].to_numpy(dtype=np.float64),
+            rtol=1e-6, err_msg=column
+        )
+
+
+def test_prediction_batches_match_per_game_helpers(league):
+    game_date = league.query(Game.date).order_by(Game.date.desc()).first().date
+    team_ids = [team_id for (team_id,) in league.query(Team.team_id).all()]
+    clear_feature_caches()
+    
+    averages = get_rolling_averages_batch(league, team_ids, game_date)
+    rest = get_days_rest_batch(league, team_ids, game_date)
+    pairs = [(team_ids[0], opponent_id) for opponent_id in team_ids[1:]]
+    h2h = get_h2h_win_pcts_batch(league, pairs, game_date)
+    
+    for team_id in team_ids:
+        expected = reference_rolling_averages(league, team_id, game_date)
+        assert averages[team_id] == pytest.approx(expected, rel=1e-9)
+        assert rest[team_id] == reference_days_rest(league, team_id, game_date)
+    for team_id, opponent_id in pairs:
+        assert h2h[(team_id, opponent_id)] == pytest.approx(
+            reference_h2h_win_pct(league, team_id, opponent_id, game_date)
+        )
@@ -0,0 +1,47 @@
+"""
+Regression tests for the hand-rolled binary metrics used during training.
+"""
+import numpy as np
+import pytest
+from sklearn.metrics import log_loss, precision_recall_fscore_support
+
+from src.training import _binary_log_loss, _binary_class_report
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_binary_log_loss_matches_sklearn(dtype):
+    rng = np.random.default_rng(11)
+    y_true = rng.integers(0, 2, size=500)
+    win_proba = rng.uniform(0, 1, size=500)
+    # Include probabilities that need clipping
+    win_proba[:4] = [0.0, 1.0, 0.0, 1.0]
+    y_proba = np.column_stack([1 - win_proba, win_proba]).astype(dtype)
+    
+    assert _binary_log_loss(y_true, y_proba) == pytest.approx(log_loss(y_true, y_proba), rel=1e-6)
+
+
+def _report_rows(report: str) -> dict:
+    """Parse the per-class rows of a classification report into floats."""
+    rows = {}
+    for line in report.splitlines()[1:]:
+        label, *values = line.split()
+        rows[int(label)] = [float(value) for value in values]
+    return rows
+
+
+@pytest.mark.parametrize("y_pred_kind", ["random", "all_ones"])
+def test_binary_class_report_matches_sklearn(y_pred_kind):
+    rng = np.random.default_rng(13)
+    y_true = rng.integers(0, 2, size=300)
+    y_pred = rng.integers(0, 2, size=300) if y_pred_kind == "random" else np.ones(300, dtype=np.int64)
+    
+    precision, recall, f1, support = precision_recall_fscore_support(
+        y_true, y_pred, labels=[0, 1], zero_division=0
+    )
+    rows = _report_rows(_binary_class_report(y_true, y_pred))
+    
+    for cls in (0, 1):
+        assert rows[cls][:3] == pytest.approx(
+            [round(precision[cls], 2), round(recall[cls], 2), round(f1[cls], 2)], abs=1e-9
+        )
+        assert rows[cls][3] == support[cls]
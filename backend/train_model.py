@@ -0,0 +1,11 @@
+"""
+Train the sample prediction model and save it for model.py to load.
+Run this whenever the training data in model.py changes.
+"""
+import joblib
+from model import MODEL_PATH, train_model
+
+
+if __name__ == "__main__":
+    joblib.dump(train_model(), MODEL_PATH)
+    print(f"Model saved to {MODEL_PATH}")